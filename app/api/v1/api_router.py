@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import ticket_routes, kb_routes, slack_routes, metrics_routes, user_routes
+from app.api.v1 import ticket_routes, kb_routes, slack_routes, metrics_routes, user_routes, export_routes, realtime_routes
 
 api_router = APIRouter()
 
@@ -9,5 +9,7 @@ api_router.include_router(user_routes.router)
 api_router.include_router(kb_routes.router)
 api_router.include_router(slack_routes.router)
 api_router.include_router(metrics_routes.router)
+api_router.include_router(export_routes.router)
+api_router.include_router(realtime_routes.router)
 
 
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+from app.schemas.export import ExportEntity, ExportFormat
+from app.services.export_service import ExportService, MEDIA_TYPES
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/{entity}")
+def export_entity(
+    entity: ExportEntity,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    since: Optional[datetime] = None,
+    after_id: Optional[int] = Query(None, ge=0),
+    batch_size: int = Query(1000, ge=100, le=10000)
+):
+    """
+    Stream every row of an entity for BI/bulk loading
+    
+    - **entity**: tickets, activities, users or kb
+    - **format**: csv, ndjson or parquet (parquet needs pyarrow installed)
+    - **since**: Only rows created or updated at/after this time
+    - **after_id**: Resume an interrupted export after the last id received
+    - **batch_size**: Rows fetched per server-side cursor batch
+    
+    Rows are streamed in id order with constant memory. The
+    `X-Export-Checkpoint` header holds the export start time; pass it as
+    `since` on the next run to fetch only what changed.
+    """
+    if format == ExportFormat.PARQUET and not ExportService.parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires the pyarrow package"
+        )
+    
+    checkpoint = datetime.now().isoformat()
+    extension = "ndjson" if format == ExportFormat.NDJSON else format.value
+    
+    return StreamingResponse(
+        ExportService.stream_export(entity, format, since, after_id, batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{entity.value}.{extension}"',
+            "X-Export-Checkpoint": checkpoint
+        }
+    )
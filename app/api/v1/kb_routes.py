@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, UploadFile, File, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database.session import get_db
 from app.schemas.kb import (
     KBCreate, KBUpdate, KBResponse, KBListResponse,
-    KBSearchRequest, KBSearchResponse
+    KBSearchRequest, KBSearchResponse, KBSuggestResponse,
+    KBKeywordStatsResponse, KBBulkFormat, KBImportJob
 )
+from app.schemas.export import ExportEntity, ExportFormat
 from app.schemas.ticket import TicketCategory
 from app.services.kb_service import KBService
+from app.services.kb_cache import kb_article_cache, kb_collection_cache
+from app.services.kb_import_service import KBImportService
+from app.services.export_service import ExportService, MEDIA_TYPES
 
 router = APIRouter(prefix="/kb", tags=["Knowledge Base"])
 
@@ -47,6 +54,12 @@ def list_articles(
     - **page**: Page number
     - **page_size**: Items per page
     """
+    cache_key = ("list", category, is_featured, page, page_size)
+    cached = kb_collection_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    generation = kb_collection_cache.generation
+    
     skip = (page - 1) * page_size
     
     articles, total = KBService.list_articles(
@@ -57,12 +70,15 @@ def list_articles(
         limit=page_size
     )
     
-    return KBListResponse(
+    payload = KBListResponse(
         articles=articles,
         total=total,
         page=page,
         page_size=page_size
-    )
+    ).model_dump_json()
+    kb_collection_cache.set(cache_key, payload, generation=generation)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/search", response_model=KBSearchResponse)
@@ -79,6 +95,12 @@ def search_articles(
     - **category**: Filter by category
     - **limit**: Maximum results to return
     """
+    cache_key = ("search", q.strip().lower(), category, limit)
+    cached = kb_collection_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    generation = kb_collection_cache.generation
+    
     results = KBService.search_articles(
         db=db,
         query_text=q,
@@ -86,9 +108,157 @@ def search_articles(
         limit=limit
     )
     
-    return KBSearchResponse(
+    payload = KBSearchResponse(
         results=results,
         total=len(results)
+    ).model_dump_json()
+    kb_collection_cache.set(cache_key, payload, generation=generation)
+    
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/suggest", response_model=KBSuggestResponse)
+def suggest_articles(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    category: Optional[TicketCategory] = None,
+    limit: int = Query(8, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """
+    Search-as-you-type completions over article titles and keywords
+    
+    - **prefix**: What the user has typed so far
+    - **category**: Filter by category
+    - **limit**: Maximum suggestions to return (most viewed/helpful first)
+    """
+    suggestions = KBService.suggest_articles(
+        db=db,
+        prefix=prefix,
+        category=category,
+        limit=limit
+    )
+    
+    return KBSuggestResponse(prefix=prefix, suggestions=suggestions)
+
+
+@router.get("/keywords", response_model=KBKeywordStatsResponse)
+def keyword_stats(
+    prefix: Optional[str] = Query(None, max_length=100),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Keyword usage across active articles
+    
+    - **prefix**: Only keywords starting with this text
+    - **limit**: Maximum keywords to return (most used first)
+    """
+    keywords = KBService.keyword_stats(db=db, prefix=prefix, limit=limit)
+    
+    return KBKeywordStatsResponse(keywords=keywords)
+
+
+@router.get("/keywords/articles", response_model=KBListResponse)
+def find_articles_by_keywords(
+    keywords: str = Query(..., min_length=1, max_length=500),
+    match: str = Query("all", pattern="^(all|any)$"),
+    category: Optional[TicketCategory] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Find articles by exact keyword
+    
+    - **keywords**: Comma-separated keywords
+    - **match**: all (article has every keyword) or any (at least one)
+    - **category**: Filter by category
+    - **page**: Page number
+    - **page_size**: Items per page
+    """
+    skip = (page - 1) * page_size
+    
+    articles, total = KBService.find_by_keywords(
+        db=db,
+        keywords=keywords,
+        match_all=match == "all",
+        category=category,
+        skip=skip,
+        limit=page_size
+    )
+    
+    return KBListResponse(
+        articles=articles,
+        total=total,
+        page=page,
+        page_size=page_size
+    )
+
+
+@router.post("/import", response_model=KBImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def import_articles(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[KBBulkFormat] = None
+):
+    """
+    Bulk import knowledge base articles from a JSONL or CSV file (Admin only)
+    
+    - **file**: One article per line/row with title, question, answer, category,
+      and optionally keywords, is_active, is_featured
+    - **format**: jsonl or csv (defaults to the file extension)
+    
+    Articles are upserted by title in batches. Poll `GET /kb/import/{job_id}` for progress
+    """
+    # TODO: Add admin role check
+    if format is None:
+        name = (file.filename or "").lower()
+        format = KBBulkFormat.CSV if name.endswith(".csv") else KBBulkFormat.JSONL
+    
+    content = await file.read()
+    try:
+        rows, parse_errors = KBImportService.parse(content, format)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read {format.value} file: {e}"
+        )
+    
+    job = KBImportService.create_job(format, rows, parse_errors)
+    background_tasks.add_task(KBImportService.run_import, job.job_id, rows)
+    
+    return job
+
+
+@router.get("/import/{job_id}", response_model=KBImportJob)
+def get_import_job(job_id: str):
+    """
+    Get progress of a bulk import job
+    """
+    job = KBImportService.get_job(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
+        )
+    
+    return job
+
+
+@router.get("/export")
+def export_articles(format: KBBulkFormat = Query(KBBulkFormat.JSONL)):
+    """
+    Export all knowledge base articles as JSONL or CSV
+    
+    The output can be re-imported with `POST /kb/import`
+    """
+    export_format = ExportFormat.CSV if format == KBBulkFormat.CSV else ExportFormat.NDJSON
+    
+    return StreamingResponse(
+        ExportService.stream_export(ExportEntity.KB, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="kb.{format.value}"'}
     )
 
 
@@ -100,8 +270,14 @@ def get_article(
     """
     Get a specific knowledge base article
     
-    This automatically increments the view count
+    This counts a view; counts are written to the database in periodic batches
     """
+    cached = kb_article_cache.get(article_id)
+    if cached is not None:
+        KBService.record_view(article_id)
+        return Response(content=cached, media_type="application/json")
+    generation = kb_article_cache.generation
+    
     article = KBService.get_article(db, article_id)
     
     if not article:
@@ -110,7 +286,10 @@ def get_article(
             detail=f"Article with ID {article_id} not found"
         )
     
-    return article
+    payload = KBResponse.model_validate(article).model_dump_json()
+    kb_article_cache.set(article_id, payload, generation=generation)
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @router.patch("/{article_id}", response_model=KBResponse)
@@ -187,6 +366,12 @@ def get_featured_articles(
     """
     Get all featured knowledge base articles
     """
+    cache_key = ("featured", page, page_size)
+    cached = kb_collection_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    generation = kb_collection_cache.generation
+    
     skip = (page - 1) * page_size
     
     articles, total = KBService.list_articles(
@@ -196,9 +381,12 @@ def get_featured_articles(
         limit=page_size
     )
     
-    return KBListResponse(
+    payload = KBListResponse(
         articles=articles,
         total=total,
         page=page,
         page_size=page_size
-    )
+    ).model_dump_json()
+    kb_collection_cache.set(cache_key, payload, generation=generation)
+    
+    return Response(content=payload, media_type="application/json")
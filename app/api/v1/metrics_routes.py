@@ -2,10 +2,19 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.database.session import get_db
 from app.models.ticket import Ticket, TicketStatus, TicketPriority, TicketCategory
 from app.schemas.ticket import DashboardStats
+from app.schemas.metrics import AnalyticsQuery, AnalyticsResult
+from app.services.analytics_service import ticket_analytics
+from app.services.trend_service import ticket_trends
+from app.services.top_issues_service import top_issues
+from app.services.http_transport import http_transport
+from app.services.slack_outbox import slack_outbox
+from app.services.slack_notifier import slack_notifier
+from app.utils.cache import cache_stats
+from app.utils.metrics import latency_stats
 
 router = APIRouter(prefix="/metrics", tags=["Metrics & Analytics"])
 
@@ -143,28 +152,39 @@ def get_ticket_trends(
     
     - **days**: Number of days to include (1-365)
     
-    Returns list of {date, count}
+    Returns list of {date, count} with one entry per day (missing days are 0)
     """
-    start_date = datetime.now() - timedelta(days=days)
-    
-    results = db.query(
-        func.date(Ticket.created_at).label('date'),
-        func.count(Ticket.id).label('count')
-    ).filter(
-        Ticket.created_at >= start_date
-    ).group_by(
-        func.date(Ticket.created_at)
-    ).order_by('date').all()
+    trends = ticket_trends.series(db, granularity="day", days=days)
     
     return [
         {
-            "date": str(date),
+            "date": bucket[:10],
             "count": count
         }
-        for date, count in results
+        for bucket, count in zip(trends["buckets"], trends["total"])
     ]
 
 
+@router.get("/ticket-trends/series")
+def get_ticket_trend_series(
+    granularity: str = Query("day", pattern="^(hour|day|week|month)$"),
+    days: int = Query(30, ge=1, le=365),
+    group_by: Optional[str] = Query(None, pattern="^(status|category|priority)$"),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get gap-filled ticket creation series, ready to plot
+    
+    - **granularity**: Bucket size (hour, day, week, month)
+    - **days**: Number of days to include (1-365)
+    - **group_by**: Optional split by status, category or priority
+    
+    Returns {granularity, buckets, total, series}; every array in `series`
+    is aligned with `buckets`
+    """
+    return ticket_trends.series(db, granularity=granularity, days=days, group_by=group_by)
+
+
 @router.get("/resolution-time-by-priority")
 def get_resolution_time_by_priority(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
     """
@@ -239,13 +259,32 @@ def get_sla_compliance(db: Session = Depends(get_db)) -> Dict[str, Any]:
 
 @router.get("/top-issues")
 def get_top_issues(
+    window: str = Query("hour", pattern="^(hour|day)$"),
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ) -> List[Dict[str, Any]]:
     """
-    Get most common issues/keywords from ticket titles
+    Get the most common issue phrases from recent ticket titles and descriptions
+    
+    - **window**: Sliding window to rank over (hour, day)
+    - **limit**: Maximum phrases to return
     
-    Returns top issues by category
+    Returns list of {phrase, count, day_count, spike_ratio}. Counts are
+    approximate (Count-Min estimates) and, with several worker processes,
+    include other workers' tickets only as of the last periodic resync
+    """
+    return top_issues.top(db, window=window, limit=limit)
+
+
+@router.get("/top-categories")
+def get_top_categories(
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """
+    Get the most common ticket categories over the last 30 days
+    
+    Returns list of {category, count}
     """
     results = db.query(
         Ticket.category,
@@ -312,3 +351,81 @@ def get_agent_performance(db: Session = Depends(get_db)) -> List[Dict[str, Any]]
         })
     
     return sorted(results, key=lambda x: x['resolved_count'], reverse=True)
+
+
+@router.post("/query", response_model=AnalyticsResult)
+def query_ticket_analytics(
+    query: AnalyticsQuery,
+    db: Session = Depends(get_db)
+):
+    """
+    Slice ticket history from the in-memory columnar snapshot
+    
+    - **group_by**: Dimensions to group by (status, category, priority,
+      department, agent, user, hour_of_day, day_of_week)
+    - **filters**: Map of dimension to allowed values, e.g. {"category": ["email"]}
+    - **since** / **until**: Restrict by creation time
+    - **limit**: Maximum groups to return (largest first)
+    
+    Each row holds the group values plus count, resolved and avg_resolution_hours
+    """
+    return ticket_analytics.query(
+        db,
+        group_by=query.group_by,
+        filters=query.filters,
+        since=query.since,
+        until=query.until,
+        limit=query.limit
+    )
+
+
+@router.get("/caches")
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get hit/miss/eviction statistics for every in-process cache
+    
+    Returns {cache_name: {size, hits, misses, hit_rate, evictions, ...}}
+    """
+    return cache_stats()
+
+
+@router.get("/latency")
+def get_latency_stats() -> Dict[str, Any]:
+    """
+    Get latency histograms (e.g. Slack acknowledgement and completion times)
+    
+    Returns {histogram_name: {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms, buckets}}
+    """
+    return latency_stats()
+
+
+@router.get("/slack-outbox")
+def get_slack_outbox_stats() -> Dict[str, Any]:
+    """
+    Get outbound Slack queue depth and delivery counters
+    
+    Delivery latency is the "slack.outbound.delivery" histogram in /metrics/latency
+    """
+    return slack_outbox.stats()
+
+
+@router.get("/notifications")
+def get_notification_stats() -> Dict[str, Any]:
+    """
+    Get Slack notification coalescing statistics
+    
+    Returns notifications received, messages sent, how many were merged
+    into digests and how many are still waiting for their window to close
+    """
+    return slack_notifier.stats()
+
+
+@router.get("/http")
+def get_http_transport_stats() -> Dict[str, Any]:
+    """
+    Get outbound HTTP statistics per integration host
+    
+    Returns requests, errors and new vs reused connections per host;
+    per-host latency is the "http.<host>" histogram in /metrics/latency
+    """
+    return http_transport.stats()
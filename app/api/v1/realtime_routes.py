@@ -0,0 +1,76 @@
+import asyncio
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any
+from app.core.config import settings
+from app.services.realtime_service import realtime_broker
+
+router = APIRouter(prefix="/realtime", tags=["Realtime"])
+
+
+@router.get("/events")
+async def stream_events(request: Request):
+    """
+    Server-Sent Events stream of ticket and metric changes
+    
+    Event types: ticket.created, ticket.updated, ticket.status_changed,
+    ticket.commented, and resync (the client fell behind and should refetch).
+    `metrics` carries deltas to apply to dashboard counters.
+    """
+    subscriber = realtime_broker.subscribe()
+    if subscriber is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many realtime clients, fall back to polling"
+        )
+    
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                message = await subscriber.next_message(settings.REALTIME_HEARTBEAT_SECONDS)
+                yield f"data: {message}\n\n" if message else ": keepalive\n\n"
+        finally:
+            realtime_broker.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket):
+    """
+    WebSocket stream of the same events as /realtime/events
+    """
+    await websocket.accept()
+    subscriber = realtime_broker.subscribe()
+    if subscriber is None:
+        await websocket.close(code=1013, reason="Too many realtime clients")
+        return
+    
+    async def sender():
+        while True:
+            message = await subscriber.next_message(settings.REALTIME_HEARTBEAT_SECONDS)
+            await websocket.send_text(message or '{"type": "keepalive"}')
+    
+    send_task = asyncio.create_task(sender())
+    try:
+        # Incoming messages are ignored; receiving only detects disconnects
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        send_task.cancel()
+        realtime_broker.unsubscribe(subscriber)
+
+
+@router.get("/stats")
+def realtime_stats() -> Dict[str, Any]:
+    """
+    Get connected client count and delivery counters
+    """
+    return realtime_broker.stats()
@@ -3,15 +3,27 @@ from sqlalchemy.orm import Session
 from fastapi import Depends
 import hmac
 import hashlib
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional, Union
 from app.database.session import get_db
 from app.services.ticket_service import TicketService
-from app.services.user_service import UserService
+from app.services.slack_identity_cache import slack_identities
+from app.services.kb_service import KBService
+from app.services.slack_dispatcher import slack_dispatcher, slack_handler_threads
+from app.services.slack_event_dedup import slack_event_dedup
+from app.services.slack_service import SlackService
+from app.services.slack_ticket_cards import slack_ticket_cards
+from app.services.user_ticket_summary import user_ticket_summaries
+from app.models.ticket import Ticket
 from app.schemas.ticket import TicketCreate
 from app.core.config import settings
 
 router = APIRouter(prefix="/slack", tags=["Slack Integration"])
 
+# The routes below are async (they read the raw body/form), so every call
+# into the synchronous Session goes through slack_handler_threads rather
+# than running on the event loop.
+
 
 def verify_slack_signature(request: Request, body: bytes) -> bool:
     """Verify that request came from Slack"""
@@ -32,6 +44,202 @@ def verify_slack_signature(request: Request, body: bytes) -> bool:
     return hmac.compare_digest(my_signature, slack_signature)
 
 
+def _mention_ticket_message(
+    db: Session,
+    slack_user_id: str,
+    ticket_text: str,
+    event_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Create a ticket from an @mention and build the confirmation"""
+    # Idempotent on the Slack event: never create a second ticket for it
+    if event_id and slack_event_dedup.ticket_for(db, event_id):
+        return None
+    
+    try:
+        # Find or create user
+        identity = slack_identities.get_or_create(db, slack_user_id)
+        
+        # Create ticket
+        ticket_data = TicketCreate(
+            title=ticket_text[:100],  # Use first 100 chars as title
+            description=ticket_text,
+            category="other"
+        )
+        ticket = TicketService.create_ticket(db, ticket_data, identity.user_id)
+    except Exception:
+        if event_id:
+            # The event was already acked, so Slack won't retry because of
+            # this failure; releasing only lets a later redelivery (a slow
+            # ack) create the ticket instead of being dropped
+            slack_event_dedup.release(db, event_id)
+        raise
+    
+    if event_id:
+        slack_event_dedup.record_ticket(db, event_id, ticket.id)
+    
+    text = f"✅ Ticket {ticket.ticket_number} created for <@{slack_user_id}>"
+    if ticket.duplicate_of:
+        text += f" (looks like *{ticket.duplicate_of['ticket_number']}*, which is already being worked on)"
+    return {"text": text}
+
+
+def _create_ticket_message(db: Session, slack_user_id: str, text: str) -> Dict[str, Any]:
+    """/ticket: create the ticket and build the Block Kit reply"""
+    # Find or create user
+    identity = slack_identities.get_or_create(db, slack_user_id)
+    
+    # Create ticket
+    ticket_data = TicketCreate(
+        title=text[:100],
+        description=text,
+        category="other"
+    )
+    ticket = TicketService.create_ticket(db, ticket_data, identity.user_id)
+    
+    blocks = [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"✅ *Ticket Created*\n\n*Ticket Number:* {ticket.ticket_number}\n*Priority:* {ticket.priority.value.upper()}\n*Status:* {ticket.status.value.replace('_', ' ').title()}"
+            }
+        }
+    ]
+    
+    duplicate = ticket.duplicate_of
+    if duplicate:
+        note = "has been linked to it" if duplicate["linked"] else "may be related"
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"🔁 This looks like *{duplicate['ticket_number']}*, which is already being worked on; your ticket {note}."
+            }
+        })
+    
+    # Point the user at KB articles that may solve it before an agent picks it up
+    matches = KBService.match_ticket(db, ticket.title, ticket.description)
+    if matches:
+        articles = "\n".join(f"• *{match['title']}* (KB-{match['id']})" for match in matches)
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"📚 *These articles may already answer your question:*\n{articles}"
+            }
+        })
+    
+    return {
+        "response_type": "in_channel",
+        "text": f"Ticket {ticket.ticket_number} created",
+        "blocks": blocks
+    }
+
+
+def _status_card(ticket: Ticket) -> Dict[str, Any]:
+    return {
+        "response_type": "ephemeral",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*Ticket:* {ticket.ticket_number}\n*Title:* {ticket.title}\n*Status:* {ticket.status.value.replace('_', ' ').title()}\n*Priority:* {ticket.priority.value.upper()}\n*Created:* {ticket.created_at.strftime('%Y-%m-%d %H:%M')}"
+                }
+            }
+        ]
+    }
+
+
+def _detail_card(ticket: Ticket) -> Dict[str, Any]:
+    return {
+        "text": f"*Ticket: {ticket.ticket_number}*\n\n*Title:* {ticket.title}\n*Description:* {ticket.description}\n*Status:* {ticket.status.value}\n*Priority:* {ticket.priority.value}"
+    }
+
+
+def _ticket_status_message(db: Session, slack_user_id: str, text: str) -> Union[Dict[str, Any], bytes]:
+    """/status: look up one ticket by number (served from the ticket card cache)"""
+    card = slack_ticket_cards.get(db, text.strip(), "status", _status_card)
+    
+    if card is None:
+        return {
+            "response_type": "ephemeral",
+            "text": f"Ticket {text} not found"
+        }
+    
+    return card
+
+
+def _reply(message: Union[Dict[str, Any], bytes]) -> Any:
+    """Return a handler's reply from a route; cached cards are already serialized"""
+    if isinstance(message, bytes):
+        return Response(content=message, media_type="application/json")
+    return message
+
+
+def _my_tickets_message(db: Session, slack_user_id: str, text: str) -> Dict[str, Any]:
+    """/mytickets: the user's ticket counts and five most recent tickets"""
+    identity = slack_identities.get(db, slack_user_id)
+    
+    if not identity:
+        return {
+            "response_type": "ephemeral",
+            "text": "No tickets found. Create one with /ticket"
+        }
+    
+    summary = user_ticket_summaries.get(db, identity.user_id)
+    
+    if not summary["total"]:
+        return {
+            "response_type": "ephemeral",
+            "text": "You have no tickets"
+        }
+    
+    blocks = [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Your Recent Tickets* (Total: {summary['total']} | Open: {summary['open']} | Waiting on you: {summary['waiting']})"
+            }
+        }
+    ]
+    
+    for ticket in summary["recent"]:
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"• *{ticket['ticket_number']}* - {ticket['title']}\n  Status: {ticket['status'].replace('_', ' ').title()} | Priority: {ticket['priority'].upper()}"
+            }
+        })
+    
+    return {
+        "response_type": "ephemeral",
+        "blocks": blocks
+    }
+
+
+# command -> (handler, usage shown when text is required but missing, acknowledgement)
+COMMANDS = {
+    "/ticket": (
+        _create_ticket_message,
+        "Please provide a description: /ticket My laptop won't start",
+        "⏳ Creating your ticket..."
+    ),
+    "/status": (
+        _ticket_status_message,
+        "Please provide a ticket number: /status TKT-2026-0001",
+        "⏳ Looking up your ticket..."
+    ),
+    "/mytickets": (
+        _my_tickets_message,
+        None,
+        "⏳ Fetching your tickets..."
+    ),
+}
+
+
 @router.post("/events")
 async def slack_events(
     request: Request,
@@ -39,7 +247,14 @@ async def slack_events(
 ):
     """
     Handle Slack events (messages, mentions, etc.)
+    
+    Events are acknowledged immediately; tickets from mentions are created
+    in the background and confirmed in the channel. Only mentions with
+    text create work, so only they are claimed; other events are acked
+    without touching the database. A redelivery of a claimed event (same
+    event_id, sent when Slack's ack timed out) is dropped.
     """
+    started = time.perf_counter()
     body = await request.body()
     
     # Verify signature
@@ -57,44 +272,35 @@ async def slack_events(
     
     # Handle events
     event = data.get("event", {})
-    event_type = event.get("type")
+    event_id = data.get("event_id")
     
-    if event_type == "app_mention":
-        # Handle @mention
-        text = event.get("text", "")
-        user_id = event.get("user")
-        channel = event.get("channel")
-        
-        # Create ticket from mention
-        # Extract text after mention
-        ticket_text = text.split(">", 1)[-1].strip()
-        
-        if ticket_text:
-            # Find or create user
-            user = UserService.get_user_by_slack_id(db, user_id)
-            if not user:
-                # Auto-create user (in production, get details from Slack API)
-                from app.schemas.user import UserCreate
-                user = UserService.create_user(db, UserCreate(
-                    email=f"{user_id}@slack.local",
-                    full_name=f"Slack User {user_id}",
-                    teams_user_id=user_id
-                ))
-            
-            # Create ticket
-            ticket_data = TicketCreate(
-                title=ticket_text[:100],  # Use first 100 chars as title
-                description=ticket_text,
-                category="other"
-            )
-            ticket = TicketService.create_ticket(db, ticket_data, user.id)
-            
-            return {
-                "status": "success",
-                "ticket_number": ticket.ticket_number
-            }
+    # Only @mentions create tickets; everything else is just acknowledged
+    if event.get("type") != "app_mention":
+        return {"status": "ok"}
     
-    return {"status": "ok"}
+    text = event.get("text", "")
+    user_id = event.get("user")
+    channel = event.get("channel")
+    
+    # Extract text after mention
+    ticket_text = text.split(">", 1)[-1].strip()
+    if not ticket_text:
+        return {"status": "ok"}
+    
+    # Slack redelivers events whose ack was slow with the same event_id; accept each once
+    if event_id and not await slack_handler_threads.run(slack_event_dedup.claim, db, event_id, "app_mention"):
+        slack_dispatcher.record_ack("duplicate_event", started)
+        return {"status": "duplicate"}
+    
+    # Create ticket from mention
+    slack_dispatcher.submit(
+        "app_mention",
+        lambda session: _mention_ticket_message(session, user_id, ticket_text, event_id),
+        lambda message: SlackService.send_message(channel, message["text"], message.get("blocks")),
+        started
+    )
+    slack_dispatcher.record_ack("app_mention", started)
+    return {"status": "accepted"}
 
 
 @router.post("/commands")
@@ -109,127 +315,48 @@ async def slack_commands(
     - /ticket [description] - Create a ticket
     - /status [ticket_number] - Check ticket status
     - /mytickets - List my tickets
+    
+    Commands are acknowledged at once and answered through the request's
+    response_url when the work is done. Without a response_url the reply
+    is returned inline.
     """
+    started = time.perf_counter()
     form_data = await request.form()
     
     command = form_data.get("command")
     text = form_data.get("text", "")
     user_id = form_data.get("user_id")
+    response_url = form_data.get("response_url")
     
-    if command == "/ticket":
-        # Create ticket
-        if not text:
-            return {
-                "response_type": "ephemeral",
-                "text": "Please provide a description: /ticket My laptop won't start"
-            }
-        
-        # Find or create user
-        user = UserService.get_user_by_slack_id(db, user_id)
-        if not user:
-            from app.schemas.user import UserCreate
-            user = UserService.create_user(db, UserCreate(
-                email=f"{user_id}@slack.local",
-                full_name=f"Slack User {user_id}",
-                teams_user_id=user_id
-            ))
-        
-        # Create ticket
-        ticket_data = TicketCreate(
-            title=text[:100],
-            description=text,
-            category="other"
-        )
-        ticket = TicketService.create_ticket(db, ticket_data, user.id)
-        
+    if command not in COMMANDS:
         return {
-            "response_type": "in_channel",
-            "blocks": [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"✅ *Ticket Created*\n\n*Ticket Number:* {ticket.ticket_number}\n*Priority:* {ticket.priority.value.upper()}\n*Status:* {ticket.status.value.replace('_', ' ').title()}"
-                    }
-                }
-            ]
+            "response_type": "ephemeral",
+            "text": f"Unknown command: {command}"
         }
     
-    elif command == "/status":
-        # Check ticket status
-        if not text:
-            return {
-                "response_type": "ephemeral",
-                "text": "Please provide a ticket number: /status TKT-2026-0001"
-            }
-        
-        ticket = TicketService.get_ticket_by_number(db, text.strip())
-        
-        if not ticket:
-            return {
-                "response_type": "ephemeral",
-                "text": f"Ticket {text} not found"
-            }
-        
-        return {
+    handler, usage, acknowledgement = COMMANDS[command]
+    
+    if usage and not text:
+        message = {
             "response_type": "ephemeral",
-            "blocks": [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*Ticket:* {ticket.ticket_number}\n*Title:* {ticket.title}\n*Status:* {ticket.status.value.replace('_', ' ').title()}\n*Priority:* {ticket.priority.value.upper()}\n*Created:* {ticket.created_at.strftime('%Y-%m-%d %H:%M')}"
-                    }
-                }
-            ]
+            "text": usage
         }
-    
-    elif command == "/mytickets":
-        # List user's tickets
-        user = UserService.get_user_by_slack_id(db, user_id)
-        
-        if not user:
-            return {
-                "response_type": "ephemeral",
-                "text": "No tickets found. Create one with /ticket"
-            }
-        
-        tickets, total = TicketService.list_tickets(db, user_id=user.id, limit=5)
-        
-        if not tickets:
-            return {
-                "response_type": "ephemeral",
-                "text": "You have no tickets"
-            }
-        
-        blocks = [
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Your Recent Tickets* (Total: {total})"
-                }
-            }
-        ]
-        
-        for ticket in tickets:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"• *{ticket.ticket_number}* - {ticket.title}\n  Status: {ticket.status.value.replace('_', ' ').title()} | Priority: {ticket.priority.value.upper()}"
-                }
-            })
-        
-        return {
+    elif response_url:
+        slack_dispatcher.submit(
+            command,
+            lambda session: handler(session, user_id, text),
+            lambda reply: SlackService.post_response(response_url, reply),
+            started
+        )
+        message = {
             "response_type": "ephemeral",
-            "blocks": blocks
+            "text": acknowledgement
         }
+    else:
+        message = await slack_handler_threads.run(handler, db, user_id, text)
     
-    return {
-        "response_type": "ephemeral",
-        "text": f"Unknown command: {command}"
-    }
+    slack_dispatcher.record_ack(command, started)
+    return _reply(message)
 
 
 @router.post("/interactions")
@@ -254,17 +381,48 @@ async def slack_interactions(
             action_id = action.get("action_id")
             
             if action_id == "view_ticket":
-                ticket_number = action.get("value")
-                ticket = TicketService.get_ticket_by_number(db, ticket_number)
+                ticket_number = action.get("value") or ""
+                card = await slack_handler_threads.run(
+                    slack_ticket_cards.get, db, ticket_number, "detail", _detail_card
+                )
                 
-                if ticket:
-                    return {
-                        "text": f"*Ticket: {ticket.ticket_number}*\n\n*Title:* {ticket.title}\n*Description:* {ticket.description}\n*Status:* {ticket.status.value}\n*Priority:* {ticket.priority.value}"
-                    }
+                if card is not None:
+                    return _reply(card)
     
     return {"status": "ok"}
 
 
+def _apply_classification(db: Session, ticket_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Store an n8n classification; the response body, or None if it couldn't be applied"""
+    from app.services.n8n_service import N8nService
+    
+    parsed = N8nService.parse_classification_result(data)
+    
+    if not parsed:
+        return None
+    
+    ticket = TicketService.update_ai_classification(
+        db,
+        ticket_id,
+        parsed["category"],
+        parsed["priority"],
+        parsed["confidence"]
+    )
+    
+    if not ticket:
+        return None
+    
+    return {
+        "status": "success",
+        "ticket_number": ticket.ticket_number,
+        "classification": {
+            "category": ticket.category.value,
+            "priority": ticket.priority.value,
+            "confidence": ticket.ai_confidence
+        }
+    }
+
+
 @router.post("/webhook/classification")
 async def receive_classification(
     data: Dict[str, Any],
@@ -284,7 +442,6 @@ async def receive_classification(
     }
     """
     ticket_id = data.get("ticket_id")
-    classification = data.get("classification", {})
     
     if not ticket_id:
         raise HTTPException(
@@ -292,29 +449,10 @@ async def receive_classification(
             detail="ticket_id is required"
         )
     
-    from app.services.n8n_service import N8nService
-    
-    parsed = N8nService.parse_classification_result(data)
+    result = await slack_handler_threads.run(_apply_classification, db, ticket_id, data)
     
-    if parsed:
-        ticket = TicketService.update_ai_classification(
-            db,
-            ticket_id,
-            parsed["category"],
-            parsed["priority"],
-            parsed["confidence"]
-        )
-        
-        if ticket:
-            return {
-                "status": "success",
-                "ticket_number": ticket.ticket_number,
-                "classification": {
-                    "category": ticket.category.value,
-                    "priority": ticket.priority.value,
-                    "confidence": ticket.ai_confidence
-                }
-            }
+    if result:
+        return result
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
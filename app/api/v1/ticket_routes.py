@@ -5,15 +5,19 @@ from app.database.session import get_db
 from app.schemas.ticket import (
     TicketCreate, TicketUpdate, TicketResponse, TicketListResponse,
     TicketStatusUpdate, TicketAssignment, CommentCreate,
-    TicketStatus, TicketPriority, TicketCategory, TicketActivityResponse
+    TicketStatus, TicketPriority, TicketCategory, TicketActivityResponse,
+    TicketChangeFeed, TicketCreateResponse, KBArticleMatch,
+    SimilarTicket, SimilarTicketsResponse, DuplicateMatch,
+    TicketMerge, TicketMergeResult
 )
 from app.services.ticket_service import TicketService
+from app.services.kb_service import KBService
 from app.services.n8n_service import N8nService
 
 router = APIRouter(prefix="/tickets", tags=["Tickets"])
 
 
-@router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=TicketCreateResponse, status_code=status.HTTP_201_CREATED)
 def create_ticket(
     ticket_data: TicketCreate,
     db: Session = Depends(get_db)
@@ -24,6 +28,9 @@ def create_ticket(
     - **title**: Brief description of the issue (5-500 characters)
     - **description**: Detailed description (minimum 10 characters)
     - **category**: Issue category (hardware, software, network, etc.)
+    
+    The response lists KB articles that may already answer the issue
+    (kb_suggestions) and a likely original if this is a duplicate (duplicate_of)
     """
     # TODO: Get user_id from authentication context
     # For now, using a default user_id or from request
@@ -32,30 +39,52 @@ def create_ticket(
     # Create ticket
     ticket = TicketService.create_ticket(db, ticket_data, user_id)
     
+    duplicate = ticket.duplicate_of
+    original = TicketService.get_ticket(db, duplicate["id"]) if duplicate and duplicate["linked"] else None
+    
     # Send to n8n for AI classification (async in production)
     try:
-        classification_result = N8nService.send_for_classification(
-            ticket_id=ticket.id,
-            title=ticket.title,
-            description=ticket.description
-        )
-        
-        if classification_result.get("success") and classification_result.get("data"):
-            parsed = N8nService.parse_classification_result(classification_result["data"])
-            if parsed:
-                TicketService.update_ai_classification(
-                    db,
-                    ticket.id,
-                    parsed["category"],
-                    parsed["priority"],
-                    parsed["confidence"]
-                )
-                db.refresh(ticket)
+        if original is not None and original.ai_classification:
+            # A linked duplicate gets the original's classification without another AI call
+            TicketService.update_ai_classification(
+                db,
+                ticket.id,
+                original.category,
+                original.priority,
+                original.ai_confidence
+            )
+            db.refresh(ticket)
+        else:
+            classification_result = N8nService.send_for_classification(
+                ticket_id=ticket.id,
+                title=ticket.title,
+                description=ticket.description
+            )
+            
+            if classification_result.get("success") and classification_result.get("data"):
+                parsed = N8nService.parse_classification_result(classification_result["data"])
+                if parsed:
+                    TicketService.update_ai_classification(
+                        db,
+                        ticket.id,
+                        parsed["category"],
+                        parsed["priority"],
+                        parsed["confidence"]
+                    )
+                    db.refresh(ticket)
     except Exception as e:
         # Log error but don't fail ticket creation
         print(f"AI classification failed: {e}")
     
-    return ticket
+    response = TicketCreateResponse.model_validate(ticket)
+    response.kb_suggestions = [
+        KBArticleMatch(**match)
+        for match in KBService.match_ticket(db, ticket.title, ticket.description)
+    ]
+    if duplicate:
+        response.duplicate_of = DuplicateMatch(**duplicate)
+    
+    return response
 
 
 @router.get("/", response_model=TicketListResponse)
@@ -104,6 +133,23 @@ def list_tickets(
     )
 
 
+@router.get("/changes", response_model=TicketChangeFeed)
+def get_ticket_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Get tickets and activities changed since a sync cursor
+    
+    - **since**: Cursor returned by the previous call (0 for a full sync)
+    - **limit**: Maximum change-log entries to consume in one call
+    
+    Returns compact rows plus the next cursor; repeat while has_more is true
+    """
+    return TicketService.get_changes(db, since=since, limit=limit)
+
+
 @router.get("/{ticket_id}", response_model=TicketResponse)
 def get_ticket(
     ticket_id: int,
@@ -123,6 +169,79 @@ def get_ticket(
     return ticket
 
 
+@router.get("/{ticket_id}/similar", response_model=SimilarTicketsResponse)
+def get_similar_tickets(
+    ticket_id: int,
+    limit: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """
+    Find resolved tickets similar to this one
+    
+    - **limit**: Maximum similar tickets to return
+    
+    Compares title, description and comments; best match first
+    """
+    ticket = TicketService.get_ticket(db, ticket_id)
+    
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ticket with ID {ticket_id} not found"
+        )
+    
+    matches = TicketService.find_similar(db, ticket, limit=limit)
+    
+    return SimilarTicketsResponse(
+        ticket_id=ticket_id,
+        similar=[
+            SimilarTicket(
+                id=match.id,
+                ticket_number=match.ticket_number,
+                title=match.title,
+                status=match.status,
+                category=match.category,
+                resolved_at=match.resolved_at,
+                score=score
+            )
+            for match, score in matches
+        ]
+    )
+
+
+@router.post("/{ticket_id}/merge", response_model=TicketMergeResult)
+def merge_tickets(
+    ticket_id: int,
+    merge: TicketMerge,
+    db: Session = Depends(get_db)
+):
+    """
+    Merge duplicate tickets into this one
+    
+    - **duplicate_ids**: Tickets to merge; their activities move here and they are closed
+    
+    Runs as a single transaction
+    """
+    # TODO: Get user_id from auth
+    user_id = 1
+    
+    try:
+        result = TicketService.merge_tickets(db, ticket_id, merge.duplicate_ids, user_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ticket with ID {ticket_id} not found"
+        )
+    
+    return result
+
+
 @router.get("/number/{ticket_number}", response_model=TicketResponse)
 def get_ticket_by_number(
     ticket_number: str,
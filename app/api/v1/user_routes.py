@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 from app.database.session import get_db
-from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserListResponse, UserRole
+from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserListResponse, UserRole, UserTicketSummary
 from app.services.user_service import UserService
+from app.services.user_ticket_summary import user_ticket_summaries
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -99,6 +100,27 @@ def get_user(
     return user
 
 
+@router.get("/{user_id}/ticket-summary", response_model=UserTicketSummary)
+def get_user_ticket_summary(
+    user_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a user's ticket counts (total, open, waiting on user) and recent tickets
+    
+    Served from a cache kept up to date on ticket writes
+    """
+    user = UserService.get_user(db, user_id)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with ID {user_id} not found"
+        )
+    
+    return user_ticket_summaries.get(db, user_id)
+
+
 @router.get("/email/{email}", response_model=UserResponse)
 def get_user_by_email(
     email: str,
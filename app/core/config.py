@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -18,6 +18,31 @@ class Settings(BaseSettings):
     # Slack Configuration
     SLACK_BOT_TOKEN: Optional[str] = None
     SLACK_SIGNING_SECRET: Optional[str] = None
+    SLACK_IDENTITY_CACHE_SIZE: int = 10000
+    SLACK_IDENTITY_CACHE_TTL_SECONDS: int = 3600
+    SLACK_WORKER_THREADS: int = 8
+    SLACK_HANDLER_THREADS: int = 8
+    SLACK_EVENT_DEDUP_SIZE: int = 10000
+    SLACK_EVENT_RECEIPT_RETENTION_HOURS: int = 24
+    SLACK_TICKET_CARD_CACHE_SIZE: int = 2000
+    SLACK_TICKET_CARD_CACHE_TTL_SECONDS: int = 300
+    
+    # Outbound Slack queue (rate limited per method tier and per channel)
+    SLACK_OUTBOX_MAX_SIZE: int = 10000
+    SLACK_OUTBOX_CONCURRENCY: int = 4
+    SLACK_OUTBOX_MAX_RETRIES: int = 5
+    SLACK_CHANNEL_RATE_PER_SECOND: float = 1.0
+    SLACK_CHANNEL_BURST: int = 3
+    SLACK_NOTIFY_COALESCE_SECONDS: float = 60
+    SLACK_STATUS_DMS_ENABLED: bool = False  # DM requesters/assignees on status changes and assignments
+    
+    # Outbound HTTP (shared pooled client for Slack, n8n)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5
+    HTTP_TIMEOUT_SECONDS: float = 30
     
     # Gemini AI
     GEMINI_API_KEY: Optional[str] = None
@@ -27,6 +52,81 @@ class Settings(BaseSettings):
     N8N_SOLUTION_WEBHOOK_URL: Optional[str] = None
     N8N_API_KEY: Optional[str] = None
 
+    # Ticket trend rollups (must cover the longest trend window plus a partial month)
+    TREND_ROLLUP_DAYS: int = 400
+    TREND_ROLLUP_REFRESH_SECONDS: int = 300
+
+    # Top issues heavy-hitter sketches
+    TOP_ISSUES_BUCKET_MINUTES: int = 5
+    TOP_ISSUES_SKETCH_WIDTH: int = 2048
+    TOP_ISSUES_SKETCH_DEPTH: int = 4
+    TOP_ISSUES_CANDIDATES: int = 64
+    TOP_ISSUES_MIN_COUNT: int = 2
+    # Rescan of the last day of tickets (picks up tickets created by other worker processes)
+    TOP_ISSUES_RESYNC_SECONDS: int = 300
+
+    # Ticket change feed (superseded change_log entries are compacted after the retention window)
+    CHANGE_LOG_RETENTION_HOURS: int = 168
+    CHANGE_LOG_COMPACT_SECONDS: int = 3600
+
+    # Columnar analytics snapshot
+    ANALYTICS_REFRESH_SECONDS: int = 30
+    ANALYTICS_FULL_REBUILD_SECONDS: int = 3600
+
+    # Realtime dashboard push (SSE / WebSocket)
+    REALTIME_QUEUE_SIZE: int = 100
+    REALTIME_MAX_CLIENTS: int = 5000
+    REALTIME_HEARTBEAT_SECONDS: int = 15
+
+    # Knowledge base search index
+    KB_INDEX_REFRESH_SECONDS: int = 300
+    KB_COUNTER_FLUSH_SECONDS: int = 5
+    KB_CACHE_TTL_SECONDS: int = 60
+    KB_CACHE_MAX_ARTICLES: int = 5000
+    KB_CACHE_MAX_COLLECTIONS: int = 1000
+
+    # KB bulk import
+    KB_IMPORT_BATCH_SIZE: int = 500
+
+    # KB query expansion (typo correction and synonyms)
+    KB_SPELL_MAX_EDIT_DISTANCE: int = 2
+    KB_SYNONYMS: Dict[str, List[str]] = {
+        "pwd": ["password"],
+        "pw": ["password"],
+        "passwd": ["password"],
+        "wifi": ["wireless", "wi fi"],
+        "wlan": ["wireless"],
+        "mfa": ["authenticator", "2fa"],
+        "2fa": ["authenticator", "mfa"],
+        "laptop": ["notebook"],
+        "pc": ["computer"],
+        "mail": ["email"],
+        "login": ["sign in"],
+        "signin": ["sign in", "login"],
+    }
+
+    # KB suggestions attached to newly created tickets
+    KB_DEFLECTION_DIM: int = 4096
+    KB_DEFLECTION_TOP_K: int = 3
+    KB_DEFLECTION_MIN_SCORE: float = 0.15
+
+    # Similar resolved tickets (MinHash/LSH candidates, cosine re-rank)
+    SIMILAR_TICKETS_NUM_PERM: int = 64
+    SIMILAR_TICKETS_BANDS: int = 32
+    SIMILAR_TICKETS_MAX_CANDIDATES: int = 500
+    SIMILAR_TICKETS_MIN_SCORE: float = 0.1
+
+    # Near-duplicate detection on ticket create
+    TICKET_DUPLICATE_NUM_PERM: int = 64
+    TICKET_DUPLICATE_BANDS: int = 16
+    TICKET_DUPLICATE_WINDOW_HOURS: int = 24
+    TICKET_DUPLICATE_FLAG_THRESHOLD: float = 0.5
+    TICKET_DUPLICATE_LINK_THRESHOLD: float = 0.8
+
+    # Per-user ticket summaries (/mytickets, user profile)
+    USER_TICKET_SUMMARY_CACHE_SIZE: int = 10000
+    USER_TICKET_SUMMARY_TTL_SECONDS: int = 600
+
     class Config:
         env_file = ".env"
 
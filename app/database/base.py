@@ -7,5 +7,9 @@ from app.models.user import User
 from app.models.ticket import Ticket
 from app.models.ticket_activity import TicketActivity
 from app.models.knowledge_base import KnowledgeBase
+from app.models.kb_keyword import KBKeyword, KBArticleKeyword
 from app.models.attachment import Attachment
 from app.models.sla_policy import SLAPolicy
+from app.models.change_log import ChangeLog
+from app.models.ticket_link import TicketLink
+from app.models.slack_event_receipt import SlackEventReceipt
@@ -1,9 +1,26 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.database.base import Base
-from app.database.session import engine
+from app.database.session import engine, SessionLocal
 from app.api.v1.api_router import api_router
 from app.core.config import settings
+from app.services.analytics_service import ticket_analytics
+from app.services.kb_counter_buffer import kb_counter_buffer
+from app.services.change_log_compactor import change_log_compactor
+from app.services.kb_deflection import kb_deflection_index
+from app.services.kb_keyword_service import KBKeywordService
+from app.services.kb_search_index import kb_search_index
+from app.services.kb_suggest_index import kb_suggest_index
+from app.services.duplicate_detector import duplicate_detector
+from app.services.similar_ticket_index import similar_tickets
+from app.services.top_issues_service import top_issues
+from app.services.trend_service import ticket_trends
+from app.services.slack_identity_cache import slack_identities
+from app.services.slack_dispatcher import slack_dispatcher
+from app.services.http_transport import http_transport
+from app.services.slack_outbox import slack_outbox
+from app.services.slack_notifier import slack_notifier
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -32,10 +49,53 @@ def startup():
     """Create database tables on startup"""
     Base.metadata.create_all(bind=engine)
     print("✅ Database tables created successfully")
+    db = SessionLocal()
+    try:
+        linked = KBKeywordService.backfill(db)
+        slack_identities.warm(db)
+        duplicate_detector.rebuild(db)
+        kb_search_index.rebuild(db)
+        kb_suggest_index.rebuild(db)
+        similar_tickets.rebuild(db)
+        kb_deflection_index.rebuild(db)
+        ticket_trends.rebuild(db)
+        ticket_analytics.rebuild(db)
+        top_issues.rebuild(db)
+    finally:
+        db.close()
+    if linked:
+        print(f"🔑 Indexed keywords for {linked} KB articles")
+    kb_counter_buffer.start()
+    change_log_compactor.start()
+    slack_notifier.start()
     print(f"📚 API Documentation: http://localhost:8000/docs")
     print(f"🚀 {settings.PROJECT_NAME} is running!")
 
 
+@app.on_event("startup")
+async def start_outbound_queues():
+    """Open the shared HTTP client and start the outbound Slack worker on the server's event loop"""
+    await http_transport.start()
+    await slack_outbox.start()
+
+
+@app.on_event("shutdown")
+async def stop_outbound_queues():
+    """Finish Slack work, send pending digests and queued messages, then close the HTTP client"""
+    # Dispatcher jobs post replies through the transport's loop, so wait for them off the loop
+    await asyncio.to_thread(slack_dispatcher.shutdown)
+    slack_notifier.stop()
+    await slack_outbox.stop()
+    await http_transport.stop()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    """Flush buffered writes before the process exits"""
+    kb_counter_buffer.stop()
+    change_log_compactor.stop()
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
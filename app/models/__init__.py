@@ -2,8 +2,12 @@ from app.models.user import User, UserRole
 from app.models.ticket import Ticket, TicketStatus, TicketPriority, TicketCategory
 from app.models.ticket_activity import TicketActivity, ActivityType
 from app.models.knowledge_base import KnowledgeBase, KBCategory
+from app.models.kb_keyword import KBKeyword, KBArticleKeyword
 from app.models.attachment import Attachment
 from app.models.sla_policy import SLAPolicy
+from app.models.change_log import ChangeLog
+from app.models.ticket_link import TicketLink, TicketLinkType
+from app.models.slack_event_receipt import SlackEventReceipt
 
 __all__ = [
     "User",
@@ -16,6 +20,12 @@ __all__ = [
     "ActivityType",
     "KnowledgeBase",
     "KBCategory",
+    "KBKeyword",
+    "KBArticleKeyword",
     "Attachment",
     "SLAPolicy",
+    "ChangeLog",
+    "TicketLink",
+    "TicketLinkType",
+    "SlackEventReceipt",
 ]
@@ -0,0 +1,78 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index, event, text
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql import func
+from app.database.base import Base
+from app.models.ticket import Ticket
+from app.models.ticket_activity import TicketActivity
+
+# Session.info key for changes flushed in the current transaction but not yet logged
+_PENDING = "change_log_pending"
+
+# Transaction-level advisory lock that orders change-log writers (PostgreSQL)
+CHANGE_LOG_LOCK_KEY = 0x43484C47
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity", "entity_id"),
+    )
+
+    # Monotonic change sequence; clients sync with "give me everything after seq N"
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(20), nullable=False)  # "ticket" or "activity"
+    entity_id = Column(Integer, nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def _pending(session: Session) -> list:
+    return session.info.setdefault(_PENDING, [])
+
+
+def record_bulk_changes(db, entity: str, entity_ids) -> None:
+    """Log rows changed by set-based UPDATEs, which bypass the mapper events below"""
+    _pending(db).extend((entity, entity_id) for entity_id in entity_ids)
+
+
+def _record_change(entity: str):
+    def listener(mapper, connection, target):
+        _pending(object_session(target)).append((entity, target.id))
+    return listener
+
+
+# Every flushed insert/update of a ticket or activity is logged in the same
+# transaction, whichever code path made the change.
+for _model, _entity in ((Ticket, "ticket"), (TicketActivity, "activity")):
+    event.listen(_model, "after_insert", _record_change(_entity))
+    event.listen(_model, "after_update", _record_change(_entity))
+
+
+@event.listens_for(Session, "before_commit")
+def _write_change_log(session: Session) -> None:
+    """
+    Assign sequence numbers at commit, in commit order
+
+    A seq taken at flush time could become visible after a higher one
+    committed by a shorter transaction, and a client whose cursor had
+    already passed it would never see that change. Entries are instead
+    written as the last statement of the transaction, and on PostgreSQL
+    under a transaction-level advisory lock that is held until the commit
+    completes, so a seq can only be allocated once every lower seq is
+    committed (or rolled back). SQLite already serializes writers.
+    """
+    session.flush()
+    entries = session.info.pop(_PENDING, None)
+    if not entries:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY})
+    connection.execute(
+        ChangeLog.__table__.insert(),
+        [{"entity": entity, "entity_id": entity_id} for entity, entity_id in dict.fromkeys(entries)]
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_change_log(session: Session) -> None:
+    session.info.pop(_PENDING, None)
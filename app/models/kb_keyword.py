@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class KBKeyword(Base):
+    __tablename__ = "kb_keywords"
+
+    id = Column(Integer, primary_key=True, index=True)
+    keyword = Column(String(100), nullable=False, unique=True, index=True)  # Normalized: lowercase, single spaces
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class KBArticleKeyword(Base):
+    __tablename__ = "kb_article_keywords"
+    # Primary key leads with keyword_id so each keyword is one index range;
+    # the article_id index serves "keywords of an article"
+    __table_args__ = (Index("ix_kb_article_keywords_article_id", "article_id"),)
+
+    keyword_id = Column(Integer, ForeignKey("kb_keywords.id", ondelete="CASCADE"), primary_key=True)
+    article_id = Column(Integer, ForeignKey("knowledge_base.id", ondelete="CASCADE"), primary_key=True)
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
 import enum
@@ -25,7 +26,7 @@ class KnowledgeBase(Base):
     category = Column(SQLEnum(KBCategory), nullable=False)
     
     # Search optimization
-    keywords = Column(Text)  # Comma-separated keywords for better search
+    keywords = Column(Text)  # Comma-separated keywords for better search (display copy of keyword_entries)
     
     # Usage tracking
     view_count = Column(Integer, default=0)
@@ -39,3 +40,6 @@ class KnowledgeBase(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    keyword_entries = relationship("KBKeyword", secondary="kb_article_keywords", order_by="KBKeyword.keyword")
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+
+class SlackEventReceipt(Base):
+    __tablename__ = "slack_event_receipts"
+
+    # Slack's event_id; the primary key makes claiming an event atomic across workers
+    event_id = Column(String(64), primary_key=True)
+    event_type = Column(String(50))
+    ticket_id = Column(Integer, ForeignKey("tickets.id"))  # Ticket created for the event, once done
+    
+    received_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -65,3 +65,6 @@ class Ticket(Base):
     # Relationships
     user = relationship("User", foreign_keys=[user_id], backref="tickets")
     assigned_to = relationship("User", foreign_keys=[assigned_to_id], backref="assigned_tickets")
+    
+    # Not stored: set by TicketService.create_ticket to its near-duplicate match (or None)
+    duplicate_of = None
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database.base import Base
+import enum
+
+
+class TicketLinkType(str, enum.Enum):
+    DUPLICATE = "duplicate"  # ticket_id duplicates linked_ticket_id
+    MERGED = "merged"  # ticket_id was merged into linked_ticket_id
+
+
+class TicketLink(Base):
+    __tablename__ = "ticket_links"
+    __table_args__ = (UniqueConstraint("ticket_id", "linked_ticket_id", name="uq_ticket_link"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False, index=True)
+    linked_ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False, index=True)
+    link_type = Column(SQLEnum(TicketLinkType), nullable=False)
+    score = Column(Float)  # Estimated similarity for detected duplicates
+    created_by_id = Column(Integer, ForeignKey("users.id"))  # None when linked automatically
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    ticket = relationship("Ticket", foreign_keys=[ticket_id])
+    linked_ticket = relationship("Ticket", foreign_keys=[linked_ticket_id])
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class ExportEntity(str, Enum):
+    TICKETS = "tickets"
+    ACTIVITIES = "activities"
+    USERS = "users"
+    KB = "kb"
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
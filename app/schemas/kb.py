@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
+from enum import Enum
 from app.schemas.ticket import TicketCategory
 
 
@@ -10,6 +11,13 @@ class KBBase(BaseModel):
     answer: str = Field(..., min_length=20)
     category: TicketCategory
     keywords: Optional[str] = Field(None, max_length=500)
+    
+    @validator('keywords', pre=True)
+    def join_keywords(cls, v):
+        # Keywords may also be sent as a list
+        if isinstance(v, list):
+            return ", ".join(str(keyword) for keyword in v)
+        return v
 
 
 class KBCreate(KBBase):
@@ -25,6 +33,12 @@ class KBUpdate(BaseModel):
     keywords: Optional[str] = Field(None, max_length=500)
     is_active: Optional[bool] = None
     is_featured: Optional[bool] = None
+    
+    @validator('keywords', pre=True)
+    def join_keywords(cls, v):
+        if isinstance(v, list):
+            return ", ".join(str(keyword) for keyword in v)
+        return v
 
 
 class KBResponse(KBBase):
@@ -56,3 +70,51 @@ class KBSearchRequest(BaseModel):
 class KBSearchResponse(BaseModel):
     results: List[KBResponse]
     total: int
+
+
+class KBSuggestion(BaseModel):
+    id: int
+    title: str
+    category: TicketCategory
+    matched: str
+
+
+class KBSuggestResponse(BaseModel):
+    prefix: str
+    suggestions: List[KBSuggestion]
+
+
+class KBKeywordStat(BaseModel):
+    keyword: str
+    article_count: int
+    view_count: int
+    helpful_count: int
+    not_helpful_count: int
+
+
+class KBKeywordStatsResponse(BaseModel):
+    keywords: List[KBKeywordStat]
+
+
+class KBBulkFormat(str, Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+class KBImportError(BaseModel):
+    row: int
+    error: str
+
+
+class KBImportJob(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed, failed
+    format: KBBulkFormat
+    total_rows: int
+    processed_rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[KBImportError] = []
+    queued_at: datetime
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Dict, Any, Literal
+from datetime import datetime
+
+AnalyticsDimension = Literal[
+    "status", "category", "priority", "department",
+    "agent", "user", "hour_of_day", "day_of_week"
+]
+
+# Dimensions filtered by number (ids, hour, weekday); the others by name
+NUMERIC_DIMENSIONS = {"agent", "user", "hour_of_day", "day_of_week"}
+
+
+class AnalyticsQuery(BaseModel):
+    group_by: List[AnalyticsDimension] = Field(default_factory=list, max_length=4)
+    filters: Dict[AnalyticsDimension, List[Any]] = Field(default_factory=dict)
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    limit: int = Field(100, ge=1, le=1000)
+    
+    @validator('filters')
+    def check_filter_values(cls, filters):
+        # Numeric dimensions take integers (or numeric strings); agent also takes null for unassigned
+        checked = {}
+        for dimension, values in filters.items():
+            if dimension not in NUMERIC_DIMENSIONS:
+                if not all(isinstance(value, str) for value in values):
+                    raise ValueError(f"{dimension} filter values must be strings")
+                checked[dimension] = values
+                continue
+            numbers = []
+            for value in values:
+                if value is None and dimension == "agent":
+                    numbers.append(None)
+                    continue
+                try:
+                    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                        raise ValueError
+                    numbers.append(int(value))
+                except (TypeError, ValueError):
+                    raise ValueError(f"{dimension} filter values must be integers, got {value!r}")
+            checked[dimension] = numbers
+        return checked
+
+
+class AnalyticsResult(BaseModel):
+    rows: List[Dict[str, Any]]
+    matched: int
+    snapshot_rows: int
+    snapshot_age_seconds: float
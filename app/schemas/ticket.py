@@ -110,6 +110,35 @@ class TicketResponse(TicketBase):
         from_attributes = True
 
 
+class KBArticleMatch(BaseModel):
+    id: int
+    title: str
+    category: TicketCategory
+    score: float
+
+
+class DuplicateMatch(BaseModel):
+    id: int
+    ticket_number: str
+    score: float
+    linked: bool  # True when the new ticket was linked to it automatically
+
+
+class TicketCreateResponse(TicketResponse):
+    kb_suggestions: List[KBArticleMatch] = []
+    duplicate_of: Optional[DuplicateMatch] = None
+
+
+class TicketMerge(BaseModel):
+    duplicate_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class TicketMergeResult(BaseModel):
+    ticket: TicketResponse
+    merged_ids: List[int]
+    moved_activities: int
+
+
 class TicketListResponse(BaseModel):
     tickets: List[TicketResponse]
     total: int
@@ -117,6 +146,48 @@ class TicketListResponse(BaseModel):
     page_size: int
 
 
+class TicketChange(BaseModel):
+    id: int
+    ticket_number: str
+    title: str
+    status: TicketStatus
+    priority: Optional[TicketPriority] = None
+    category: TicketCategory
+    assigned_to_id: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+
+class ActivityChange(BaseModel):
+    id: int
+    ticket_id: int
+    user_id: Optional[int] = None
+    activity_type: str
+    description: Optional[str] = None
+    created_at: datetime
+
+
+class TicketChangeFeed(BaseModel):
+    cursor: int
+    has_more: bool
+    tickets: List[TicketChange]
+    activities: List[ActivityChange]
+
+
+class SimilarTicket(BaseModel):
+    id: int
+    ticket_number: str
+    title: str
+    status: TicketStatus
+    category: TicketCategory
+    resolved_at: Optional[datetime] = None
+    score: float
+
+
+class SimilarTicketsResponse(BaseModel):
+    ticket_id: int
+    similar: List[SimilarTicket]
+
+
 class DashboardStats(BaseModel):
     total_tickets: int
     open_tickets: int
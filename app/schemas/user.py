@@ -61,3 +61,20 @@ class UserListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class RecentTicket(BaseModel):
+    id: int
+    ticket_number: str
+    title: str
+    status: str
+    priority: str
+    created_at: Optional[datetime] = None
+
+
+class UserTicketSummary(BaseModel):
+    user_id: int
+    total: int
+    open: int
+    waiting: int
+    recent: list[RecentTicket]
@@ -0,0 +1,298 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.models.user import User
+from app.services.trend_service import DIMENSIONS
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import to_naive_local, enum_value
+
+# Queryable dimensions and the snapshot column each one reads
+GROUP_DIMENSIONS = {
+    "status": "status",
+    "category": "category",
+    "priority": "priority",
+    "department": "department",
+    "agent": "agent",
+    "user": "user",
+    "hour_of_day": "hour",
+    "day_of_week": "dow",
+}
+
+_DTYPES = {
+    "id": np.int64,
+    "status": np.int8,
+    "category": np.int8,
+    "priority": np.int8,
+    "department": np.int16,
+    "agent": np.int32,
+    "user": np.int32,
+    "hour": np.int8,
+    "dow": np.int8,
+    "created": np.int64,
+    "resolved": np.int64,
+}
+
+
+def _epoch(value: Optional[datetime]) -> int:
+    value = to_naive_local(value)
+    return int(value.timestamp()) if value else -1
+
+
+class TicketAnalyticsSnapshot:
+    """
+    Columnar, in-process copy of the tickets table for ad hoc slicing
+
+    Enums are stored as int8 codes, timestamps as int64 epoch seconds and
+    departments as int16 codes into a dictionary, so a million tickets
+    take roughly 40 MB. The snapshot refreshes incrementally (new ids plus
+    rows whose updated_at moved past the watermark) and is fully rebuilt
+    every ANALYTICS_FULL_REBUILD_SECONDS to pick up user department edits.
+    Both run in the background, loading into new arrays that are swapped
+    in at the end, so queries never wait for the database. Group-by/filter
+    queries are evaluated with NumPy masks and bincount.
+    """
+
+    def __init__(self, refresh_seconds: int, full_rebuild_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self.full_rebuild_seconds = full_rebuild_seconds
+        # Readers and swaps take _lock; loads run outside it, one at a time under _write_lock
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._refresher = BackgroundRebuild("analytics-refresh", self._refresh_due)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._departments: List[Optional[str]] = []
+        self._department_codes: Dict[Optional[str], int] = {}
+        self._max_id = 0
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(
+        self,
+        db: Session,
+        incremental: bool,
+        departments: List[Optional[str]],
+        department_codes: Dict[Optional[str], int]
+    ) -> Tuple[Dict[str, np.ndarray], Optional[datetime]]:
+        """
+        Read tickets into columns, and the newest updated_at seen
+
+        New departments are appended to `departments`/`department_codes`,
+        which the caller swaps in with the columns.
+        """
+        query = db.query(
+            Ticket.id,
+            Ticket.status,
+            Ticket.category,
+            Ticket.priority,
+            User.department,
+            Ticket.assigned_to_id,
+            Ticket.user_id,
+            Ticket.created_at,
+            Ticket.resolved_at,
+            Ticket.updated_at
+        ).outerjoin(User, User.id == Ticket.user_id)
+
+        watermark = self._watermark if incremental else None
+        if incremental:
+            conditions = [Ticket.id > self._max_id]
+            if watermark is not None:
+                # Overlap by a second: re-reading a row is harmless, missing one is not
+                conditions.append(Ticket.updated_at >= watermark - timedelta(seconds=1))
+            query = query.filter(or_(*conditions))
+
+        def department_code(department: Optional[str]) -> int:
+            code = department_codes.get(department)
+            if code is None:
+                code = department_codes[department] = len(departments)
+                departments.append(department)
+            return code
+
+        lookups = {name: {v: i for i, v in enumerate(values)} for name, values in DIMENSIONS.items()}
+        rows = {name: [] for name in _DTYPES}
+        for (ticket_id, status, category, priority, department,
+             agent, user, created_at, resolved_at, updated_at) in query.order_by(Ticket.id).yield_per(10000):
+            created_local = to_naive_local(created_at)
+            rows["id"].append(ticket_id)
+            rows["status"].append(lookups["status"].get(enum_value(status), 0))
+            rows["category"].append(lookups["category"].get(enum_value(category), 0))
+            rows["priority"].append(lookups["priority"].get(enum_value(priority), 0))
+            rows["department"].append(department_code(department))
+            rows["agent"].append(agent if agent is not None else -1)
+            rows["user"].append(user)
+            rows["hour"].append(created_local.hour if created_local else 0)
+            rows["dow"].append(created_local.weekday() if created_local else 0)
+            rows["created"].append(_epoch(created_at))
+            rows["resolved"].append(_epoch(resolved_at))
+
+            updated_at = to_naive_local(updated_at)
+            if updated_at and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+
+        columns = {name: np.asarray(values, dtype=_DTYPES[name]) for name, values in rows.items()}
+        return columns, watermark
+
+    def rebuild(self, db: Session) -> None:
+        """Reload every ticket into a fresh snapshot, then swap it in"""
+        with self._write_lock:
+            departments, department_codes = [], {}
+            columns, watermark = self._load(db, False, departments, department_codes)
+            with self._lock:
+                self._columns = columns
+                self._departments, self._department_codes = departments, department_codes
+                self._watermark = watermark
+                self._max_id = int(columns["id"][-1]) if len(columns["id"]) else 0
+                self._rebuilt_at = self._refreshed_at = time.monotonic()
+
+    def refresh(self, db: Session) -> None:
+        """Merge tickets created or updated since the last refresh"""
+        with self._write_lock:
+            # Only writers (serialized by _write_lock) replace these, so they can be read unlocked
+            departments, department_codes = list(self._departments), dict(self._department_codes)
+            delta, watermark = self._load(db, True, departments, department_codes)
+            ids = self._columns["id"]
+            positions = np.searchsorted(ids, delta["id"])
+            existing = (positions < len(ids)) & (ids[np.minimum(positions, len(ids) - 1)] == delta["id"]) \
+                if len(ids) else np.zeros(len(delta["id"]), dtype=bool)
+
+            with self._lock:
+                # Vectorized merge; the slow part (the load) is already done
+                columns = self._columns
+                for name, column in columns.items():
+                    column[positions[existing]] = delta[name][existing]
+                if (~existing).any():
+                    # New ids are all above _max_id, so appending keeps "id" sorted
+                    columns = {
+                        name: np.concatenate([column, delta[name][~existing]])
+                        for name, column in columns.items()
+                    }
+                    self._max_id = int(columns["id"][-1])
+                self._columns = columns
+                self._departments, self._department_codes = departments, department_codes
+                self._watermark = watermark
+                self._refreshed_at = time.monotonic()
+
+    def _refresh_due(self, db: Session) -> None:
+        if time.monotonic() - self._rebuilt_at > self.full_rebuild_seconds:
+            self.rebuild(db)
+        else:
+            self.refresh(db)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """
+        Build the snapshot if it was never built; otherwise start a
+        background refresh (full or incremental) when one is due
+        """
+        now = time.monotonic()
+        if not self._columns:
+            with self._write_lock:
+                if not self._columns:  # Concurrent first queries build it once
+                    self.rebuild(db)
+        elif now - self._rebuilt_at > self.full_rebuild_seconds or now - self._refreshed_at > self.refresh_seconds:
+            self._refresher.trigger()
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _encode_filter(self, dimension: str, values: List[Any]) -> np.ndarray:
+        if dimension in DIMENSIONS:
+            codes = [DIMENSIONS[dimension].index(v) for v in values if v in DIMENSIONS[dimension]]
+        elif dimension == "department":
+            codes = [self._department_codes[v] for v in values if v in self._department_codes]
+        else:
+            # Validated by AnalyticsQuery; None is an unassigned agent
+            codes = [-1 if v is None else int(v) for v in values]
+        return np.asarray(codes, dtype=np.int64)
+
+    def _decode(self, dimension: str, code: int) -> Any:
+        if dimension in DIMENSIONS:
+            return DIMENSIONS[dimension][code]
+        if dimension == "department":
+            return self._departments[code]
+        if dimension == "agent" and code == -1:
+            return None
+        return int(code)
+
+    def query(
+        self,
+        db: Session,
+        group_by: List[str],
+        filters: Dict[str, List[Any]],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Count tickets and resolution time grouped by the given dimensions
+
+        Returns {rows, matched, snapshot_rows, snapshot_age_seconds}; each
+        row holds the group values plus count, resolved and
+        avg_resolution_hours, ordered by count descending.
+        """
+        self.ensure_fresh(db)
+
+        with self._lock:
+            columns = self._columns
+            age = time.monotonic() - self._refreshed_at
+            mask = np.ones(len(columns["id"]), dtype=bool)
+
+            for dimension, values in filters.items():
+                column = columns[GROUP_DIMENSIONS[dimension]]
+                mask &= np.isin(column, self._encode_filter(dimension, values))
+            if since is not None:
+                mask &= columns["created"] >= _epoch(since)
+            if until is not None:
+                mask &= columns["created"] < _epoch(until)
+
+            resolved = columns["resolved"][mask]
+            created = columns["created"][mask]
+            is_resolved = resolved >= 0
+            hours = np.where(is_resolved, (resolved - created) / 3600.0, 0.0)
+
+            if group_by:
+                keys = np.stack([columns[GROUP_DIMENSIONS[d]][mask].astype(np.int64) for d in group_by], axis=1)
+                groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+                inverse = inverse.reshape(-1)
+            else:
+                groups = np.zeros((1, 0), dtype=np.int64)
+                inverse = np.zeros(len(created), dtype=np.int64)
+
+            n_groups = len(groups) if len(created) else 0
+            counts = np.bincount(inverse, minlength=n_groups)
+            resolved_counts = np.bincount(inverse, weights=is_resolved, minlength=n_groups)
+            hour_sums = np.bincount(inverse, weights=hours, minlength=n_groups)
+
+            order = np.argsort(-counts, kind="stable")[:limit]
+            rows = []
+            for g in order:
+                row = {d: self._decode(d, groups[g][i]) for i, d in enumerate(group_by)}
+                row["count"] = int(counts[g])
+                row["resolved"] = int(resolved_counts[g])
+                row["avg_resolution_hours"] = round(
+                    float(hour_sums[g] / resolved_counts[g]), 2
+                ) if resolved_counts[g] else 0.0
+                rows.append(row)
+
+            return {
+                "rows": rows,
+                "matched": int(mask.sum()),
+                "snapshot_rows": int(len(columns["id"])),
+                "snapshot_age_seconds": round(age, 1)
+            }
+
+
+ticket_analytics = TicketAnalyticsSnapshot(
+    refresh_seconds=settings.ANALYTICS_REFRESH_SECONDS,
+    full_rebuild_seconds=settings.ANALYTICS_FULL_REBUILD_SECONDS
+)
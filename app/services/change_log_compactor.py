@@ -0,0 +1,74 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, exists
+from sqlalchemy.orm import aliased
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.change_log import ChangeLog
+from app.utils.logger import logger
+
+
+class ChangeLogCompactor:
+    """
+    Keeps change_log from growing without bound
+
+    The change feed returns each row's current state, so an entry is only
+    needed until a newer one exists for the same ticket or activity: a
+    client whose cursor is behind the old entry is also behind the new
+    one. A background thread deletes superseded entries older than
+    CHANGE_LOG_RETENTION_HOURS every CHANGE_LOG_COMPACT_SECONDS. The
+    latest entry of every row is kept, so a full sync (since=0) still
+    returns everything.
+    """
+
+    def __init__(self, interval_seconds: float, retention_hours: int):
+        self.interval_seconds = interval_seconds
+        self.retention = timedelta(hours=retention_hours)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def compact(self) -> int:
+        """Delete superseded entries past the retention window; returns the number deleted"""
+        newer = aliased(ChangeLog)
+        db = SessionLocal()
+        try:
+            deleted = db.query(ChangeLog).filter(
+                ChangeLog.changed_at < datetime.now() - self.retention,
+                exists().where(and_(
+                    newer.entity == ChangeLog.entity,
+                    newer.entity_id == ChangeLog.entity_id,
+                    newer.seq > ChangeLog.seq
+                ))
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Compacting the change log failed")
+            return 0
+        finally:
+            db.close()
+        return deleted
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.compact()
+
+    def start(self) -> None:
+        """Start the periodic compaction thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-log-compact", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+change_log_compactor = ChangeLogCompactor(
+    interval_seconds=settings.CHANGE_LOG_COMPACT_SECONDS,
+    retention_hours=settings.CHANGE_LOG_RETENTION_HOURS
+)
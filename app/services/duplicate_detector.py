@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket, TicketStatus
+from app.services.events import event_bus
+from app.utils.helpers import to_naive_local, enum_value
+from app.utils.minhash import MinHasher, LSHIndex, shingles, jaccard
+
+# Only tickets still waiting on IT can absorb a new duplicate
+ACTIVE_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING_ON_USER)
+_ACTIVE_VALUES = {status.value for status in ACTIVE_STATUSES}
+
+
+class DuplicateDetector:
+    """
+    Near-duplicate detection for newly created tickets
+
+    Recent active tickets (created within TICKET_DUPLICATE_WINDOW_HOURS)
+    are held as MinHash signatures of 3-word shingles in a 16x4 LSH
+    index, which surfaces pairs above roughly 0.5 Jaccard. A new ticket is
+    compared against its LSH candidates by estimated Jaccard and then
+    added itself, so a flood of identical outage reports all point at
+    the first one. Tickets leave the index when they age out of the
+    window or stop being active. Text without any shingles (only
+    stopwords, or empty) has no meaningful signature: it is neither
+    indexed nor matched.
+    """
+
+    def __init__(self, num_perm: int, bands: int, window_hours: int):
+        self.window = timedelta(hours=window_hours)
+        self._hasher = MinHasher(num_perm=num_perm, seed=2)
+        self._lsh = LSHIndex(bands=bands, rows=num_perm // bands)
+        # ticket id -> (created_at, signature), oldest first
+        self._recent: "OrderedDict[int, Tuple[datetime, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._built = False
+
+    def _signature(self, title: str, description: str) -> Optional[np.ndarray]:
+        """MinHash signature of a ticket's text; None when it has no shingles"""
+        hashes = shingles(f"{title} {description}")
+        if not len(hashes):
+            return None
+        return self._hasher.signature(hashes)
+
+    def _add(self, ticket_id: int, created_at: Optional[datetime], signature: np.ndarray) -> None:
+        self._lsh.add(ticket_id, signature)
+        self._recent[ticket_id] = (to_naive_local(created_at) or datetime.now(), signature)
+
+    def _remove(self, ticket_id: int) -> None:
+        if self._recent.pop(ticket_id, None) is not None:
+            self._lsh.remove(ticket_id)
+
+    def _expire(self) -> None:
+        cutoff = datetime.now() - self.window
+        while self._recent:
+            ticket_id, (created_at, _) = next(iter(self._recent.items()))
+            if created_at >= cutoff:
+                break
+            self._remove(ticket_id)
+
+    def rebuild(self, db: Session) -> None:
+        """Load active tickets created within the window"""
+        rows = db.query(Ticket.id, Ticket.title, Ticket.description, Ticket.created_at).filter(
+            Ticket.status.in_(ACTIVE_STATUSES),
+            Ticket.created_at >= datetime.now() - self.window
+        ).order_by(Ticket.id).all()
+
+        with self._lock:
+            self._lsh = LSHIndex(bands=self._lsh.bands, rows=self._lsh.rows)
+            self._recent = OrderedDict()
+            for ticket_id, title, description, created_at in rows:
+                signature = self._signature(title, description)
+                if signature is not None:
+                    self._add(ticket_id, created_at, signature)
+            self._built = True
+
+    def check(self, db: Session, ticket: Ticket) -> Optional[Tuple[int, float]]:
+        """
+        Find the best earlier duplicate of a new ticket, then index the ticket
+
+        Returns (ticket_id, estimated Jaccard) of the oldest best match at
+        or above TICKET_DUPLICATE_FLAG_THRESHOLD, or None.
+        """
+        if not self._built:
+            self.rebuild(db)
+
+        signature = self._signature(ticket.title, ticket.description)
+        if signature is None:
+            return None
+
+        with self._lock:
+            self._expire()
+            best: Optional[Tuple[int, float]] = None
+            for candidate in self._lsh.candidates(signature):
+                if candidate == ticket.id:
+                    continue
+                score = jaccard(signature, self._recent[candidate][1])
+                # Ties go to the older ticket, which is the one being worked on
+                if best is None or score > best[1] or (score == best[1] and candidate < best[0]):
+                    best = (candidate, score)
+            self._add(ticket.id, ticket.created_at, signature)
+
+        if best is None or best[1] < settings.TICKET_DUPLICATE_FLAG_THRESHOLD:
+            return None
+        return best[0], round(best[1], 3)
+
+    def discard(self, ticket_ids: Iterable[int]) -> None:
+        with self._lock:
+            for ticket_id in ticket_ids:
+                self._remove(ticket_id)
+
+    def on_ticket_updated(self, ticket: Ticket, changes: Dict[str, tuple], **_) -> None:
+        if "status" in changes and enum_value(ticket.status) not in _ACTIVE_VALUES:
+            self.discard([ticket.id])
+        elif "title" in changes or "description" in changes:
+            with self._lock:
+                entry = self._recent.get(ticket.id)
+                if entry is not None:
+                    signature = self._signature(ticket.title, ticket.description)
+                    if signature is None:
+                        self._remove(ticket.id)
+                    else:
+                        self._add(ticket.id, entry[0], signature)
+
+
+duplicate_detector = DuplicateDetector(
+    num_perm=settings.TICKET_DUPLICATE_NUM_PERM,
+    bands=settings.TICKET_DUPLICATE_BANDS,
+    window_hours=settings.TICKET_DUPLICATE_WINDOW_HOURS
+)
+
+event_bus.subscribe("ticket.updated", duplicate_detector.on_ticket_updated)
@@ -0,0 +1,46 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+from app.utils.logger import logger
+
+
+class EventBus:
+    """
+    In-process publish/subscribe hub for domain events
+
+    Services publish after their changes are committed
+    (e.g. "ticket.created"). Handlers run synchronously in the publishing
+    thread, so they must be cheap; heavier work belongs in a background
+    worker. A failing handler is logged and never breaks the publisher.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, handler: Callable) -> Callable:
+        """Register a handler for a topic (usable as a decorator)"""
+        with self._lock:
+            if handler not in self._handlers[topic]:
+                self._handlers[topic].append(handler)
+        return handler
+
+    def unsubscribe(self, topic: str, handler: Callable) -> None:
+        """Remove a previously registered handler"""
+        with self._lock:
+            if handler in self._handlers.get(topic, []):
+                self._handlers[topic].remove(handler)
+
+    def publish(self, topic: str, **payload) -> None:
+        """Deliver an event to every handler subscribed to the topic"""
+        with self._lock:
+            handlers = list(self._handlers.get(topic, []))
+
+        for handler in handlers:
+            try:
+                handler(**payload)
+            except Exception:
+                logger.exception(f"Event handler {handler.__qualname__} failed for {topic}")
+
+
+event_bus = EventBus()
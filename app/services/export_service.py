@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+from datetime import datetime, date
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import func, Integer, Boolean
+from app.database.session import SessionLocal
+from app.models.ticket import Ticket
+from app.models.ticket_activity import TicketActivity
+from app.models.user import User
+from app.models.knowledge_base import KnowledgeBase
+from app.schemas.export import ExportEntity, ExportFormat
+from app.utils.helpers import enum_value
+
+EXPORT_MODELS = {
+    ExportEntity.TICKETS: Ticket,
+    ExportEntity.ACTIVITIES: TicketActivity,
+    ExportEntity.USERS: User,
+    ExportEntity.KB: KnowledgeBase,
+}
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Convert a column value to something CSV/JSON/Arrow can hold"""
+    value = enum_value(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands buffered bytes back to a generator"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+
+    @staticmethod
+    def column_names(entity: ExportEntity) -> List[str]:
+        """Columns exported for an entity, in table order"""
+        return [column.name for column in EXPORT_MODELS[entity].__table__.columns]
+
+    @staticmethod
+    def iter_rows(
+        entity: ExportEntity,
+        since: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream rows in id order as batches of plain dicts
+
+        Uses its own session and a server-side cursor (yield_per), so memory
+        stays bounded by one batch whatever the table size.
+
+        - **since**: Only rows created or updated at/after this time
+        - **after_id**: Resume after the last id received by a previous run
+        """
+        model = EXPORT_MODELS[entity]
+        columns = list(model.__table__.columns)
+        names = [column.name for column in columns]
+
+        db = SessionLocal()
+        try:
+            query = db.query(*columns)
+            if since is not None:
+                if "updated_at" in names:
+                    changed_at = func.coalesce(model.updated_at, model.created_at)
+                else:
+                    changed_at = model.created_at
+                query = query.filter(changed_at >= since)
+            if after_id is not None:
+                query = query.filter(model.id > after_id)
+
+            batch = []
+            for row in query.order_by(model.id).yield_per(batch_size):
+                batch.append({name: _plain(value) for name, value in zip(names, row)})
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            db.close()
+
+    @staticmethod
+    def stream_export(
+        entity: ExportEntity,
+        export_format: ExportFormat,
+        since: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> Iterator[bytes]:
+        """Encode an export as a stream of byte chunks, one per batch"""
+        batches = ExportService.iter_rows(entity, since, after_id, batch_size)
+        names = ExportService.column_names(entity)
+
+        if export_format == ExportFormat.NDJSON:
+            for batch in batches:
+                yield "".join(json.dumps(row) + "\n" for row in batch).encode()
+
+        elif export_format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=names)
+            writer.writeheader()
+            for batch in batches:
+                writer.writerows(batch)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+
+        elif export_format == ExportFormat.PARQUET:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pa.schema([
+                (column.name, pa.int64() if isinstance(column.type, Integer)
+                 else pa.bool_() if isinstance(column.type, Boolean)
+                 else pa.string())
+                for column in EXPORT_MODELS[entity].__table__.columns
+            ])
+            text_columns = [field.name for field in schema if field.type == pa.string()]
+            sink = _ChunkSink()
+            writer = pq.ParquetWriter(sink, schema)
+            for batch in batches:
+                for row in batch:
+                    for name in text_columns:
+                        if row[name] is not None:
+                            row[name] = str(row[name])
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                yield sink.drain()
+            writer.close()
+            yield sink.drain()
+
+    @staticmethod
+    def parquet_available() -> bool:
+        """Parquet output needs the optional pyarrow package"""
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            return False
+        return True
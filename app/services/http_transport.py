@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+import httpx
+from app.core.config import settings
+from app.utils.metrics import histogram
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _HostStats:
+    __slots__ = ("requests", "errors", "new_connections", "http2", "in_flight")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.new_connections = 0
+        self.http2 = 0
+        self.in_flight = 0
+
+
+class HTTPTransport:
+    """
+    Shared outbound HTTP client for integrations (Slack, n8n)
+
+    One httpx.AsyncClient, created at startup on the application's event
+    loop, keeps connections alive across calls, so repeated calls to the
+    same host skip TCP and TLS setup; HTTP/2 is negotiated when the h2
+    package is installed. Concurrency per host is capped by a semaphore
+    (HTTP_MAX_CONNECTIONS_PER_HOST) so one slow integration can't take the
+    whole pool.
+
+    Coroutines await `request`; synchronous code (sync routes, worker
+    threads) calls `request_sync`, which runs the request on the
+    transport's loop. Before startup (scripts, benchmarks) `request_sync`
+    falls back to a one-off client.
+
+    Per host it counts requests, errors, new vs reused connections and
+    HTTP/2 responses (stats()); latency is the "http.<host>" histogram.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        per_host_limit: int,
+        connect_timeout: float,
+        timeout: float
+    ):
+        self.per_host_limit = per_host_limit
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._hosts: Dict[str, _HostStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def _host_stats(self, host: str) -> _HostStats:
+        with self._stats_lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = _HostStats()
+            return stats
+
+    async def start(self) -> None:
+        """Create the shared client on the running event loop (idempotent)"""
+        if self._client is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._host_slots = {}
+        self._client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=self.limits, timeout=self.timeout)
+
+    async def stop(self) -> None:
+        """Close pooled connections"""
+        client, self._client = self._client, None
+        self._loop = None
+        if client is not None:
+            await client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared client (event loop only)"""
+        if self._client is None:
+            raise RuntimeError("HTTP transport is not started")
+
+        host = httpx.URL(url).host
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        stats = self._host_stats(host)
+
+        new_connection = False
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal new_connection
+            if event == "connection.connect_tcp.started":
+                new_connection = True
+
+        async with slots:
+            stats.in_flight += 1
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(method, url, extensions={"trace": trace}, **kwargs)
+            except httpx.HTTPError:
+                stats.errors += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+                histogram(f"http.{host}").observe(time.perf_counter() - started)
+
+        stats.requests += 1
+        stats.new_connections += new_connection
+        stats.http2 += response.http_version == "HTTP/2"
+        return response
+
+    def request_sync(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request from synchronous code, blocking until it completes"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # Not started (e.g. a script); a pooled client isn't available
+            with httpx.Client(timeout=self.timeout) as client:
+                return client.request(method, url, **kwargs)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("request_sync() would block the event loop; await request() instead")
+
+        return asyncio.run_coroutine_threadsafe(self.request(method, url, **kwargs), loop).result()
+
+    def stats(self) -> Dict[str, Any]:
+        hosts = {}
+        with self._stats_lock:
+            items = list(self._hosts.items())
+        for host, stats in items:
+            reused = stats.requests - stats.new_connections
+            hosts[host] = {
+                "requests": stats.requests,
+                "errors": stats.errors,
+                "in_flight": stats.in_flight,
+                "new_connections": stats.new_connections,
+                "reused_connections": reused,
+                "reuse_rate": round(reused / stats.requests, 4) if stats.requests else 0.0,
+                "http2_responses": stats.http2
+            }
+        return {
+            "started": self._client is not None,
+            "http2_enabled": HTTP2_AVAILABLE,
+            "per_host_limit": self.per_host_limit,
+            "hosts": hosts
+        }
+
+
+http_transport = HTTPTransport(
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    per_host_limit=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+    connect_timeout=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+    timeout=settings.HTTP_TIMEOUT_SECONDS
+)
@@ -0,0 +1,43 @@
+from typing import List
+from app.core.config import settings
+from app.models.knowledge_base import KnowledgeBase
+from app.services.events import event_bus
+from app.utils.cache import TTLCache
+
+# Serialized KBResponse payloads keyed by article id
+kb_article_cache = TTLCache(
+    "kb_articles",
+    maxsize=settings.KB_CACHE_MAX_ARTICLES,
+    ttl_seconds=settings.KB_CACHE_TTL_SECONDS
+)
+
+# Serialized list/featured/search responses keyed by their query parameters
+kb_collection_cache = TTLCache(
+    "kb_collections",
+    maxsize=settings.KB_CACHE_MAX_COLLECTIONS,
+    ttl_seconds=settings.KB_CACHE_TTL_SECONDS
+)
+
+
+def _on_kb_upserted(articles: List[KnowledgeBase], **_) -> None:
+    for article in articles:
+        kb_article_cache.delete(article.id)
+    # Any edit can change membership or order of a list/search result
+    kb_collection_cache.clear()
+
+
+def _on_kb_deleted(article_ids: List[int], **_) -> None:
+    for article_id in article_ids:
+        kb_article_cache.delete(article_id)
+    kb_collection_cache.clear()
+
+
+def _on_kb_counters_changed(article_ids: List[int], **_) -> None:
+    # Counters show on the article itself; lists are left to the TTL
+    for article_id in article_ids:
+        kb_article_cache.delete(article_id)
+
+
+event_bus.subscribe("kb.upserted", _on_kb_upserted)
+event_bus.subscribe("kb.deleted", _on_kb_deleted)
+event_bus.subscribe("kb.counters_changed", _on_kb_counters_changed)
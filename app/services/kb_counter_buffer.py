@@ -0,0 +1,124 @@
+import threading
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, func
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.knowledge_base import KnowledgeBase
+from app.services.events import event_bus
+from app.utils.logger import logger
+
+# Delta slots per article
+VIEWS, HELPFUL, NOT_HELPFUL = 0, 1, 2
+
+
+class KBCounterBuffer:
+    """
+    Write-behind buffer for KB view and feedback counters
+
+    Reads and votes only bump an in-memory delta; a background thread
+    flushes all pending deltas every KB_COUNTER_FLUSH_SECONDS as a single
+    executemany of atomic "SET x = x + delta" updates. Increments are never
+    lost to read-modify-write races and hot articles no longer take a row
+    lock per view. Deltas from a failed flush are merged back and retried.
+    A successful flush publishes "kb.counters_changed" for the articles it
+    wrote, so cached responses pick up the new counts.
+    """
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[int, List[int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _bump(self, article_id: int, slot: int) -> None:
+        with self._lock:
+            deltas = self._pending.get(article_id)
+            if deltas is None:
+                deltas = self._pending[article_id] = [0, 0, 0]
+            deltas[slot] += 1
+
+    def record_view(self, article_id: int) -> None:
+        self._bump(article_id, VIEWS)
+
+    def record_feedback(self, article_id: int, helpful: bool) -> None:
+        self._bump(article_id, HELPFUL if helpful else NOT_HELPFUL)
+
+    def pending(self, article_id: int) -> List[int]:
+        """Unflushed [views, helpful, not_helpful] deltas for an article"""
+        with self._lock:
+            return list(self._pending.get(article_id, (0, 0, 0)))
+
+    def apply_pending(self, article: KnowledgeBase) -> KnowledgeBase:
+        """
+        Add unflushed deltas to a loaded article for display
+
+        The caller must have detached the article from its session, so
+        the adjusted values can never be written back.
+        """
+        views, helpful, not_helpful = self.pending(article.id)
+        article.view_count = (article.view_count or 0) + views
+        article.helpful_count = (article.helpful_count or 0) + helpful
+        article.not_helpful_count = (article.not_helpful_count or 0) + not_helpful
+        return article
+
+    def flush(self) -> int:
+        """Write all pending deltas in one batch; returns the number of articles"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        table = KnowledgeBase.__table__
+        statement = table.update().where(
+            table.c.id == bindparam("b_id")
+        ).values(
+            view_count=func.coalesce(table.c.view_count, 0) + bindparam("b_views"),
+            helpful_count=func.coalesce(table.c.helpful_count, 0) + bindparam("b_helpful"),
+            not_helpful_count=func.coalesce(table.c.not_helpful_count, 0) + bindparam("b_not_helpful"),
+            updated_at=table.c.updated_at  # Counter bumps are not content edits
+        )
+        params = [
+            {"b_id": article_id, "b_views": d[VIEWS], "b_helpful": d[HELPFUL], "b_not_helpful": d[NOT_HELPFUL]}
+            for article_id, d in batch.items()
+        ]
+
+        db = SessionLocal()
+        try:
+            db.execute(statement, params)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("KB counter flush failed; keeping deltas for the next attempt")
+            with self._lock:
+                for article_id, deltas in batch.items():
+                    merged = self._pending.setdefault(article_id, [0, 0, 0])
+                    for slot in (VIEWS, HELPFUL, NOT_HELPFUL):
+                        merged[slot] += deltas[slot]
+            return 0
+        finally:
+            db.close()
+        event_bus.publish("kb.counters_changed", article_ids=list(batch))
+        return len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flusher thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kb-counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write whatever is still pending"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_seconds + 5)
+        self.flush()
+
+
+kb_counter_buffer = KBCounterBuffer(flush_seconds=settings.KB_COUNTER_FLUSH_SECONDS)
@@ -0,0 +1,130 @@
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.knowledge_base import KnowledgeBase
+from app.services.events import event_bus
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import tokenize, stem, enum_value
+
+
+class KBDeflectionIndex:
+    """
+    Hashed TF-IDF vectors of active KB articles for ticket deflection
+
+    Each article's title, question and answer are reduced to stemmed
+    unigrams and bigrams, hashed into `dim` buckets (crc32, stable across
+    processes) and weighted with sublinear tf times idf. Rows are
+    L2-normalized and stacked in one float32 matrix, so ranking every
+    article against a new ticket is a single matrix-vector product of
+    cosine similarities, restricted to the buckets the ticket hits. Any KB
+    event rebuilds the matrix, since idf depends on the whole corpus; the
+    rebuild runs on a background thread (one at a time, events during it
+    queue one more) and lookups keep using the previous matrix until the
+    new one is swapped in. The matrix is first built at startup.
+    """
+
+    def __init__(self, dim: int, refresh_seconds: int):
+        self.dim = dim
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._idf = np.ones(dim, dtype=np.float32)
+        self._ids: List[int] = []
+        self._meta: Dict[int, Dict] = {}
+        self._built_at: Optional[float] = None
+        self._refresher = BackgroundRebuild("kb-deflection-rebuild", self.rebuild)
+
+    def _counts(self, text: str) -> Counter:
+        tokens = [stem(token) for token in tokenize(text)]
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return Counter(zlib.crc32(feature.encode()) % self.dim for feature in features)
+
+    @staticmethod
+    def _sublinear(tf: np.ndarray) -> np.ndarray:
+        out = np.zeros_like(tf)
+        np.log(tf, out=out, where=tf > 0)
+        out[tf > 0] += 1.0
+        return out
+
+    def rebuild(self, db: Session) -> None:
+        """Re-vectorize every active article"""
+        articles = db.query(KnowledgeBase).filter(
+            KnowledgeBase.is_active == True
+        ).all()
+
+        tf = np.zeros((len(articles), self.dim), dtype=np.float32)
+        for row, article in enumerate(articles):
+            counts = self._counts(" ".join(
+                part for part in (article.title, article.question, article.answer) if part
+            ))
+            if counts:
+                tf[row, list(counts)] = list(counts.values())
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = (np.log((1.0 + len(articles)) / (1.0 + df)) + 1.0).astype(np.float32)
+        matrix = self._sublinear(tf) * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+
+        with self._lock:
+            self._matrix = matrix
+            self._idf = idf
+            self._ids = [article.id for article in articles]
+            self._meta = {
+                article.id: {"title": article.title, "category": enum_value(article.category)}
+                for article in articles
+            }
+            self._built_at = time.monotonic()
+
+    def ensure_built(self, db: Session) -> None:
+        if self._built_at is None:
+            self.rebuild(db)
+        elif time.monotonic() - self._built_at > self.refresh_seconds:
+            self._refresher.trigger()
+
+    def invalidate(self, **_) -> None:
+        if self._built_at is not None:
+            self._refresher.trigger(rerun=True)
+
+    def match(self, db: Session, text: str, limit: int, min_score: float) -> List[Dict]:
+        """
+        Top articles for a piece of ticket text, best first
+
+        Returns [{id, title, category, score}] with cosine score >= min_score.
+        """
+        self.ensure_built(db)
+
+        counts = self._counts(text)
+        with self._lock:
+            if not counts or not self._ids:
+                return []
+            # The query touches a handful of buckets, so only those columns take part
+            columns = np.fromiter(counts, dtype=np.int64, count=len(counts))
+            weights = self._sublinear(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            weights *= self._idf[columns]
+            norm = np.linalg.norm(weights)
+            if not norm:
+                return []
+
+            scores = self._matrix[:, columns] @ (weights / norm)
+            top = np.argpartition(-scores, min(limit, len(scores)) - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {"id": self._ids[i], **self._meta[self._ids[i]], "score": round(float(scores[i]), 3)}
+                for i in top
+                if scores[i] >= min_score
+            ]
+
+
+kb_deflection_index = KBDeflectionIndex(
+    dim=settings.KB_DEFLECTION_DIM,
+    refresh_seconds=settings.KB_INDEX_REFRESH_SECONDS
+)
+
+event_bus.subscribe("kb.upserted", kb_deflection_index.invalidate)
+event_bus.subscribe("kb.deleted", kb_deflection_index.invalidate)
@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import selectinload
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.knowledge_base import KnowledgeBase, KBCategory
+from app.schemas.kb import KBCreate, KBBulkFormat, KBImportJob, KBImportError
+from app.services.events import event_bus
+from app.services.kb_keyword_service import KBKeywordService
+from app.utils.logger import logger
+
+# Finished jobs kept for progress polling; the oldest are dropped first
+MAX_JOBS = 50
+
+# Per-job cap on reported row errors
+MAX_ERRORS = 100
+
+_KB_CATEGORIES = {category.value for category in KBCategory}
+
+_jobs: "OrderedDict[str, KBImportJob]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+Row = Tuple[int, Dict[str, Any]]
+
+
+class KBImportService:
+
+    @staticmethod
+    def parse(content: bytes, bulk_format: KBBulkFormat) -> Tuple[List[Row], List[KBImportError]]:
+        """Split an upload into (row number, fields) pairs plus unparseable rows"""
+        text = content.decode("utf-8-sig")
+        rows: List[Row] = []
+        errors: List[KBImportError] = []
+
+        if bulk_format == KBBulkFormat.CSV:
+            # Row 1 is the header
+            for number, record in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+                rows.append((number, record))
+        else:
+            for number, line in enumerate(text.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    errors.append(KBImportError(row=number, error=f"Invalid JSON: {e.msg}"))
+                    continue
+                if not isinstance(record, dict):
+                    errors.append(KBImportError(row=number, error="Expected a JSON object"))
+                    continue
+                rows.append((number, record))
+
+        return rows, errors
+
+    @staticmethod
+    def create_job(
+        bulk_format: KBBulkFormat,
+        rows: List[Row],
+        parse_errors: List[KBImportError]
+    ) -> KBImportJob:
+        """Register a job for parsed rows; unparseable rows count as failed up front"""
+        job = KBImportJob(
+            job_id=uuid.uuid4().hex,
+            status="queued",
+            format=bulk_format,
+            total_rows=len(rows) + len(parse_errors),
+            processed_rows=len(parse_errors),
+            failed=len(parse_errors),
+            errors=parse_errors[:MAX_ERRORS],
+            queued_at=datetime.now()
+        )
+        with _jobs_lock:
+            _jobs[job.job_id] = job
+            while len(_jobs) > MAX_JOBS:
+                _jobs.popitem(last=False)
+        return job
+
+    @staticmethod
+    def get_job(job_id: str) -> Optional[KBImportJob]:
+        return _jobs.get(job_id)
+
+    @staticmethod
+    def _record_error(job: KBImportJob, row: int, error: str) -> None:
+        job.failed += 1
+        if len(job.errors) < MAX_ERRORS:
+            job.errors.append(KBImportError(row=row, error=error))
+
+    @staticmethod
+    def _validate(job: KBImportJob, batch: List[Row]) -> Dict[str, Tuple[int, KBCreate]]:
+        """Validated rows keyed by title; a later row with the same title wins"""
+        valid: Dict[str, Tuple[int, KBCreate]] = {}
+        for number, record in batch:
+            # Empty CSV cells mean "use the default", not an empty value
+            fields = {key: value for key, value in record.items() if key and value not in ("", None)}
+            try:
+                data = KBCreate(**fields)
+            except ValidationError as e:
+                first = e.errors()[0]
+                location = ".".join(str(part) for part in first["loc"])
+                KBImportService._record_error(job, number, f"{location}: {first['msg']}")
+                continue
+            if data.category.value not in _KB_CATEGORIES:
+                KBImportService._record_error(job, number, f"category: '{data.category.value}' is not a KB category")
+                continue
+            valid[data.title] = (number, data)
+        return valid
+
+    @staticmethod
+    def import_batch(db, job: KBImportJob, batch: List[Row]) -> None:
+        """
+        Upsert one batch by title in a single transaction
+
+        Existing articles (matched by exact title) are updated in place;
+        view and feedback counters are kept. One "kb.upserted" event per
+        batch lets the search, suggest and cache layers patch themselves
+        once instead of once per article.
+        """
+        valid = KBImportService._validate(job, batch)
+        job.processed_rows += len(batch) - len(valid)
+        if not valid:
+            return
+
+        existing = {
+            article.title: article
+            for article in db.query(KnowledgeBase).options(
+                selectinload(KnowledgeBase.keyword_entries)
+            ).filter(KnowledgeBase.title.in_(list(valid)))
+        }
+
+        articles, keywords, created, updated = [], [], 0, 0
+        for title, (_, data) in valid.items():
+            fields = data.model_dump(exclude={"keywords"})
+            article = existing.get(title)
+            if article is None:
+                article = KnowledgeBase(
+                    **fields,
+                    view_count=0,
+                    helpful_count=0,
+                    not_helpful_count=0
+                )
+                db.add(article)
+                created += 1
+            else:
+                for field, value in fields.items():
+                    setattr(article, field, value)
+                updated += 1
+            articles.append(article)
+            keywords.append((article, data.keywords))
+
+        KBKeywordService.assign(db, keywords)
+
+        try:
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"KB import {job.job_id}: batch failed")
+            for number, _ in valid.values():
+                KBImportService._record_error(job, number, f"Batch failed: {e.__class__.__name__}")
+            job.processed_rows += len(valid)
+            return
+
+        job.created += created
+        job.updated += updated
+        job.processed_rows += len(valid)
+        event_bus.publish("kb.upserted", articles=articles)
+
+    @staticmethod
+    def run_import(job_id: str, rows: List[Row]) -> None:
+        """Process a queued job in batches of KB_IMPORT_BATCH_SIZE (runs in the background)"""
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+
+        job.status = "running"
+        batch_size = settings.KB_IMPORT_BATCH_SIZE
+        db = SessionLocal()
+        # Keep batch objects loaded after commit so event handlers don't lazy-load each row
+        db.expire_on_commit = False
+        try:
+            for start in range(0, len(rows), batch_size):
+                KBImportService.import_batch(db, job, rows[start:start + batch_size])
+                db.expunge_all()
+            job.status = "completed"
+        except Exception:
+            logger.exception(f"KB import {job_id} failed")
+            job.status = "failed"
+        finally:
+            db.close()
+            job.finished_at = datetime.now()
+
+        logger.info(
+            f"KB import {job_id} {job.status}: {job.created} created, "
+            f"{job.updated} updated, {job.failed} failed"
+        )
@@ -0,0 +1,208 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from sqlalchemy import func, intersect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.kb_keyword import KBKeyword, KBArticleKeyword
+from app.models.knowledge_base import KnowledgeBase
+from app.schemas.ticket import TicketCategory
+from app.services.events import event_bus
+from app.utils.helpers import tokenize
+
+MAX_KEYWORD_LENGTH = 100
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def normalize_keywords(keywords: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    Split comma-separated keywords into normalized, de-duplicated entries
+
+    "VPN,  Remote Access, vpn" -> ["vpn", "remote access"]
+    """
+    if not keywords:
+        return []
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+
+    names: List[str] = []
+    for keyword in keywords:
+        name = " ".join(tokenize(keyword, drop_stopwords=False))[:MAX_KEYWORD_LENGTH].strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class KBKeywordService:
+    """
+    Normalized KB keywords
+
+    Keywords live in `kb_keywords` (one row per distinct keyword) and the
+    `kb_article_keywords` join table, keyed (keyword_id, article_id) so a
+    keyword lookup is a single index range. `KnowledgeBase.keywords` keeps
+    the normalized comma-separated text as a display copy for the schemas
+    and the search indexes; it is only ever written through `assign`.
+    """
+
+    @staticmethod
+    def _resolve(db: Session, names: Iterable[str]) -> Dict[str, KBKeyword]:
+        """Keyword rows by name, creating missing ones"""
+        names = set(names)
+        if not names:
+            return {}
+        resolved = {
+            keyword.keyword: keyword
+            for keyword in db.query(KBKeyword).filter(KBKeyword.keyword.in_(names))
+        }
+        missing = names - resolved.keys()
+        if missing:
+            # Another writer may add the same keyword between the SELECT and
+            # the insert, so insert conflict-free and read the rows back
+            KBKeywordService._insert_missing(db, sorted(missing))
+            resolved.update(
+                (keyword.keyword, keyword)
+                for keyword in db.query(KBKeyword).filter(KBKeyword.keyword.in_(missing))
+            )
+        return resolved
+
+    @staticmethod
+    def _insert_missing(db: Session, names: List[str]) -> None:
+        """INSERT ... ON CONFLICT DO NOTHING, or a savepoint per keyword where that isn't available"""
+        rows = [{"keyword": name} for name in names]
+        dialect = db.get_bind().dialect.name
+        if dialect in _UPSERT_INSERTS:
+            db.execute(_UPSERT_INSERTS[dialect](KBKeyword).values(rows).on_conflict_do_nothing(
+                index_elements=[KBKeyword.keyword]
+            ))
+            return
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(KBKeyword.__table__.insert().values(**row))
+            except IntegrityError:
+                pass  # Added concurrently; the caller reads it back
+
+    @staticmethod
+    def assign(db: Session, assignments: Sequence[Tuple[KnowledgeBase, Optional[str]]]) -> None:
+        """
+        Set the keywords of one or more articles (not committed)
+
+        Takes (article, comma-separated keywords) pairs so a batch resolves
+        all of its keywords with one query.
+        """
+        normalized = [(article, normalize_keywords(keywords)) for article, keywords in assignments]
+        resolved = KBKeywordService._resolve(db, (name for _, names in normalized for name in names))
+        for article, names in normalized:
+            article.keyword_entries = [resolved[name] for name in names]
+            article.keywords = ", ".join(names) or None
+
+    @staticmethod
+    def find_articles(
+        db: Session,
+        keywords: Union[str, Iterable[str]],
+        match_all: bool = True,
+        category: Optional[TicketCategory] = None,
+        is_active: bool = True,
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[KnowledgeBase], int]:
+        """
+        Articles tagged with all (AND) or any (OR) of the given keywords
+
+        AND intersects the per-keyword article id ranges of the join table
+        in the database; OR takes their union.
+        """
+        names = normalize_keywords(keywords)
+        keyword_ids = [
+            keyword_id
+            for (keyword_id,) in db.query(KBKeyword.id).filter(KBKeyword.keyword.in_(names))
+        ] if names else []
+
+        # An unknown keyword can't match anything under AND
+        if not keyword_ids or (match_all and len(keyword_ids) < len(names)):
+            return [], 0
+
+        if match_all and len(keyword_ids) > 1:
+            article_ids = intersect(*(
+                select(KBArticleKeyword.article_id).where(KBArticleKeyword.keyword_id == keyword_id)
+                for keyword_id in keyword_ids
+            ))
+        else:
+            article_ids = select(KBArticleKeyword.article_id).where(
+                KBArticleKeyword.keyword_id.in_(keyword_ids)
+            )
+
+        query = db.query(KnowledgeBase).filter(KnowledgeBase.id.in_(article_ids))
+
+        if is_active is not None:
+            query = query.filter(KnowledgeBase.is_active == is_active)
+        if category:
+            query = query.filter(KnowledgeBase.category == category)
+
+        total = query.count()
+        articles = query.order_by(
+            KnowledgeBase.is_featured.desc(),
+            KnowledgeBase.view_count.desc()
+        ).offset(skip).limit(limit).all()
+
+        return articles, total
+
+    @staticmethod
+    def keyword_stats(db: Session, prefix: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """Keywords by number of active articles, with their combined views and feedback"""
+        article_count = func.count(KBArticleKeyword.article_id)
+        query = db.query(
+            KBKeyword.keyword,
+            article_count.label("article_count"),
+            func.coalesce(func.sum(KnowledgeBase.view_count), 0).label("view_count"),
+            func.coalesce(func.sum(KnowledgeBase.helpful_count), 0).label("helpful_count"),
+            func.coalesce(func.sum(KnowledgeBase.not_helpful_count), 0).label("not_helpful_count")
+        ).join(
+            KBArticleKeyword, KBArticleKeyword.keyword_id == KBKeyword.id
+        ).join(
+            KnowledgeBase, KnowledgeBase.id == KBArticleKeyword.article_id
+        ).filter(
+            KnowledgeBase.is_active == True
+        )
+
+        if prefix:
+            normalized = " ".join(tokenize(prefix, drop_stopwords=False))
+            if normalized:
+                query = query.filter(KBKeyword.keyword.startswith(normalized, autoescape=True))
+
+        rows = query.group_by(KBKeyword.id, KBKeyword.keyword).order_by(
+            article_count.desc(),
+            KBKeyword.keyword
+        ).limit(limit).all()
+
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 500) -> int:
+        """
+        Link articles whose keywords text has no join table rows yet
+
+        Runs at startup so articles written before the keyword tables
+        existed become searchable by keyword. Returns the number of
+        articles processed.
+        """
+        linked = select(KBArticleKeyword.article_id)
+        query = db.query(KnowledgeBase).filter(
+            KnowledgeBase.keywords.isnot(None),
+            KnowledgeBase.keywords != "",
+            ~KnowledgeBase.id.in_(linked)
+        ).order_by(KnowledgeBase.id)
+
+        processed = 0
+        while True:
+            # Each pass either links an article or clears keywords that
+            # normalize to nothing, so the query shrinks every time
+            articles = query.limit(batch_size).all()
+            if not articles:
+                return processed
+            KBKeywordService.assign(db, [(article, article.keywords) for article in articles])
+            db.commit()
+            event_bus.publish("kb.upserted", articles=articles)
+            processed += len(articles)
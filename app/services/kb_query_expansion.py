@@ -0,0 +1,170 @@
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.kb_search_index import kb_search_index, KBSearchIndex
+from app.utils.helpers import tokenize
+
+# Only the first characters of a word feed the delete dictionary; this
+# bounds its size and is enough to tell typos of ordinary words apart
+PREFIX_LENGTH = 7
+
+# Query weight of an expansion term relative to the typed term
+SYNONYM_WEIGHT = 0.8
+CORRECTION_WEIGHTS = {1: 0.7, 2: 0.5}
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - results
+        results |= frontier
+    return results
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 when above the limit"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class KBQueryExpander:
+    """
+    Typo and synonym expansion of KB search queries
+
+    Spelling uses a symmetric-delete dictionary: every vocabulary word
+    (from the BM25 index) is stored under each string obtained by deleting
+    up to KB_SPELL_MAX_EDIT_DISTANCE characters from its prefix. A typed
+    word is corrected by looking up its own deletes, so the cost per term
+    depends on the word length, not the vocabulary size. Candidates are
+    verified with a real edit distance and the closest, most frequent
+    word wins. Synonyms come from the KB_SYNONYMS setting.
+
+    When the search index version changes, the dictionary is patched with
+    just the words that entered or left the index vocabulary since the
+    last query (see KBSearchIndex.take_vocabulary_changes), so a KB edit
+    costs a few words' deletes rather than a rebuild of the dictionary.
+    """
+
+    def __init__(self, index: KBSearchIndex, max_distance: int, synonyms: Dict[str, List[str]]):
+        self.index = index
+        self.max_distance = max_distance
+        self.synonyms = {
+            word.lower(): [alt for alt in alternatives if alt.lower() != word.lower()]
+            for word, alternatives in synonyms.items()
+        }
+        self._lock = threading.Lock()
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+        self._vocabulary: Dict[str, int] = {}
+        self._version: Optional[int] = None
+
+    def _distance_for(self, word: str) -> int:
+        # Short words have too many neighbours to correct safely
+        if len(word) <= 3:
+            return 0
+        if len(word) <= 5:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def _ensure_current(self) -> None:
+        if self._version == self.index.version:
+            return
+        with self._lock:
+            if self._version == self.index.version:
+                return
+            version, complete, changes = self.index.take_vocabulary_changes()
+            if complete:
+                # After a full index rebuild: compare against everything we know
+                changes.update((word, 0) for word in self._vocabulary.keys() - changes.keys())
+            for word, frequency in changes.items():
+                known = word in self._vocabulary
+                if frequency and not known:
+                    for variant in _deletes(word[:PREFIX_LENGTH], self._distance_for(word)):
+                        self._deletes[variant].add(word)
+                elif not frequency and known:
+                    for variant in _deletes(word[:PREFIX_LENGTH], self._distance_for(word)):
+                        words = self._deletes.get(variant)
+                        if words is not None:
+                            words.discard(word)
+                            if not words:
+                                del self._deletes[variant]
+                if frequency:
+                    self._vocabulary[word] = frequency
+                else:
+                    self._vocabulary.pop(word, None)
+            self._version = version
+
+    def correct(self, word: str) -> Optional[tuple]:
+        """Closest known word as (word, distance), or None"""
+        max_distance = self._distance_for(word)
+        if not max_distance:
+            return None
+
+        candidates: Set[str] = set()
+        with self._lock:
+            for variant in _deletes(word[:PREFIX_LENGTH], max_distance):
+                candidates.update(self._deletes.get(variant, ()))
+
+        best = None
+        for candidate in candidates:
+            distance = _edit_distance(word, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            key = (distance, -self._vocabulary.get(candidate, 0), candidate)
+            if best is None or key < best:
+                best = key
+        return (best[2], best[0]) if best else None
+
+    def expand(self, db: Session, query_text: str) -> Dict[str, float]:
+        """
+        Rewrite a query into weighted, stemmed index terms
+
+        Typed terms weigh 1.0; synonyms SYNONYM_WEIGHT; spelling
+        corrections (only for words the KB never uses) 0.7 at distance
+        1 and 0.5 at distance 2.
+        """
+        self.index.ensure_built(db)
+        self._ensure_current()
+
+        weights: Dict[str, float] = {}
+
+        def add(text: str, weight: float) -> None:
+            for term in self.index.analyze(text):
+                weights[term] = max(weights.get(term, 0.0), weight)
+
+        for word in tokenize(query_text):
+            add(word, 1.0)
+            for synonym in self.synonyms.get(word, ()):
+                add(synonym, SYNONYM_WEIGHT)
+            if word not in self._vocabulary:
+                correction = self.correct(word)
+                if correction:
+                    corrected, distance = correction
+                    add(corrected, CORRECTION_WEIGHTS.get(distance, 0.5))
+                    for synonym in self.synonyms.get(corrected, ()):
+                        add(synonym, SYNONYM_WEIGHT * CORRECTION_WEIGHTS.get(distance, 0.5))
+
+        return weights
+
+
+kb_query_expander = KBQueryExpander(
+    kb_search_index,
+    max_distance=settings.KB_SPELL_MAX_EDIT_DISTANCE,
+    synonyms=settings.KB_SYNONYMS
+)
@@ -0,0 +1,317 @@
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.knowledge_base import KnowledgeBase
+from app.services.events import event_bus
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import tokenize, stem, enum_value
+
+# Term weight per field: a match in the title counts three times a match in the answer
+FIELD_WEIGHTS = (("title", 3.0), ("keywords", 2.0), ("question", 1.5), ("answer", 1.0))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class _Doc:
+    __slots__ = ("slot", "terms", "words", "length", "category", "boost")
+
+
+class KBSearchIndex:
+    """
+    In-memory BM25 inverted index over active KB articles
+
+    Articles are tokenized per field and stemmed. Each posting stores the
+    document's saturated BM25 term weight already multiplied by a mild
+    popularity boost (helpful and view counts), so a query only sums
+    idf-scaled postings of its own terms.
+
+    Every indexed article occupies a slot (freed slots are reused). A
+    term's postings are kept as a {slot: weight} dict for cheap patching
+    and materialized on first use into a pair of NumPy arrays, dropped
+    again when the term changes. A query adds each term's weights into
+    one score vector with np.add.at and picks the top hits with
+    argpartition, so its cost is a few array operations per term rather
+    than a Python loop over every posting (see benchmarks/kb_search.py).
+
+    Length normalization uses the
+    average document length at build time and the index rebuilds itself
+    once that drifts by more than 20%. The index is built at startup (or
+    on first use), patched from "kb.upserted" and "kb.deleted" events,
+    and rebuilt every KB_INDEX_REFRESH_SECONDS to pick up edits made by
+    other workers.
+
+    Refreshes run on a background thread, one at a time, while searches
+    keep using the current index. Articles changed by events during a
+    refresh are re-read from the database right after the swap, so the
+    refresh can't undo them.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)  # term -> {slot: weight}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # term -> (slots, weights)
+        self._docs: Dict[int, _Doc] = {}
+        self._slot_ids = np.full(0, -1, dtype=np.int64)  # slot -> article id, -1 when free
+        self._slot_categories = np.full(0, -1, dtype=np.int16)  # slot -> category code
+        self._category_codes: Dict[Optional[str], int] = {}
+        self._free_slots: List[int] = []
+        self._n_slots = 0
+        self._total_length = 0.0
+        self._avg_length = 1.0  # Basis used for the stored postings
+        self.vocabulary: Counter = Counter()  # Unstemmed words -> document frequency
+        self.version = 0  # Bumped on every change, so derived structures know to refresh
+        self._vocabulary_changes: Optional[Set[str]] = None  # Since the last take; None: everything
+        self._built_at: Optional[float] = None
+        self._changed_during_rebuild: Optional[Set[int]] = None
+        self._refresher = BackgroundRebuild("kb-search-rebuild", self.rebuild)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def analyze(text: Optional[str]) -> List[str]:
+        """Tokenize and stem text the same way for documents and queries"""
+        return [stem(token) for token in tokenize(text)]
+
+    def ensure_built(self, db: Session) -> None:
+        if self._built_at is None:
+            self.rebuild(db)
+        elif time.monotonic() - self._built_at > self.refresh_seconds:
+            self._refresher.trigger()
+        elif self._docs:
+            drift = abs(self._total_length / len(self._docs) - self._avg_length) / self._avg_length
+            if drift > 0.2:
+                self._refresher.trigger()
+
+    def rebuild(self, db: Session) -> None:
+        """Re-index every active article, then swap the new index in"""
+        with self._lock:
+            self._changed_during_rebuild = set()
+        try:
+            articles = db.query(KnowledgeBase).filter(
+                KnowledgeBase.is_active == True
+            ).all()
+            docs = [(article, self._analyze_article(article)) for article in articles]
+        except Exception:
+            with self._lock:
+                self._changed_during_rebuild = None
+            raise
+
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._arrays = {}
+            self._docs = {}
+            self._slot_ids = np.full(len(docs), -1, dtype=np.int64)
+            self._slot_categories = np.full(len(docs), -1, dtype=np.int16)
+            self._free_slots = []
+            self._n_slots = 0
+            self._total_length = 0.0
+            self.vocabulary = Counter()
+            lengths = [sum(terms.values()) for _, (terms, _) in docs]
+            self._avg_length = (sum(lengths) / len(lengths)) if lengths and sum(lengths) else 1.0
+            for article, analyzed in docs:
+                self._add(article, analyzed)
+
+            # Events that arrived while loading may be newer than what was loaded
+            changed, self._changed_during_rebuild = self._changed_during_rebuild, None
+            if changed:
+                for article_id in changed:
+                    self._remove(article_id)
+                for article in db.query(KnowledgeBase).populate_existing().filter(
+                    KnowledgeBase.id.in_(changed),
+                    KnowledgeBase.is_active == True
+                ):
+                    self._add(article)
+            self._built_at = time.monotonic()
+            self._vocabulary_changes = None
+            self.version += 1
+
+    @staticmethod
+    def _analyze_article(article: KnowledgeBase) -> Tuple[Dict[str, float], set]:
+        terms: Dict[str, float] = defaultdict(float)
+        words = set()
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(getattr(article, field)):
+                words.add(token)
+                terms[stem(token)] += weight
+        return terms, words
+
+    def _add(self, article: KnowledgeBase, analyzed: Optional[Tuple[Dict[str, float], set]] = None) -> None:
+        terms, words = analyzed or self._analyze_article(article)
+
+        doc = _Doc()
+        doc.slot = self._take_slot()
+        doc.terms = tuple(terms)
+        doc.words = tuple(words)  # Unstemmed, so removal can undo the vocabulary update
+        doc.length = sum(terms.values())
+        doc.category = enum_value(article.category)
+        helpful = (article.helpful_count or 0) - (article.not_helpful_count or 0)
+        doc.boost = 1.0 + 0.1 * math.log1p(max(helpful, 0)) + 0.05 * math.log1p(article.view_count or 0)
+
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc.length / self._avg_length)
+        for term, tf in terms.items():
+            self._postings[term][doc.slot] = doc.boost * tf * (BM25_K1 + 1) / (tf + norm)
+            self._arrays.pop(term, None)
+        self._slot_ids[doc.slot] = article.id
+        self._slot_categories[doc.slot] = self._category_codes.setdefault(doc.category, len(self._category_codes))
+        self._docs[article.id] = doc
+        self._total_length += doc.length
+        self.vocabulary.update(words)
+        if self._vocabulary_changes is not None:
+            self._vocabulary_changes.update(words)
+
+    def _remove(self, article_id: int) -> None:
+        doc = self._docs.pop(article_id, None)
+        if doc is None:
+            return
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc.slot, None)
+                if not postings:
+                    del self._postings[term]
+            self._arrays.pop(term, None)
+        self._slot_ids[doc.slot] = -1
+        self._slot_categories[doc.slot] = -1
+        self._free_slots.append(doc.slot)
+        self._total_length -= doc.length
+        self.vocabulary.subtract(doc.words)
+        for word in doc.words:
+            if self.vocabulary[word] <= 0:
+                del self.vocabulary[word]
+        if self._vocabulary_changes is not None:
+            self._vocabulary_changes.update(doc.words)
+
+    def _take_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        slot = self._n_slots
+        if slot == len(self._slot_ids):
+            grow = max(64, slot)
+            self._slot_ids = np.concatenate([self._slot_ids, np.full(grow, -1, dtype=np.int64)])
+            self._slot_categories = np.concatenate([self._slot_categories, np.full(grow, -1, dtype=np.int16)])
+        self._n_slots += 1
+        return slot
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if not postings:
+                return None
+            arrays = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            )
+            self._arrays[term] = arrays
+        return arrays
+
+    def take_vocabulary_changes(self) -> Tuple[int, bool, Dict[str, int]]:
+        """
+        Vocabulary words whose document frequency changed since the last call
+
+        Returns (version, complete, {word: frequency}), 0 meaning the word
+        is gone. After a full rebuild `complete` is True and the mapping is
+        the whole vocabulary. There is one consumer: kb_query_expander.
+        """
+        with self._lock:
+            changed, self._vocabulary_changes = self._vocabulary_changes, set()
+            if changed is None:
+                return self.version, True, dict(self.vocabulary)
+            return self.version, False, {word: self.vocabulary.get(word, 0) for word in changed}
+
+    def _note_change(self, article_id: int) -> None:
+        if self._changed_during_rebuild is not None:
+            self._changed_during_rebuild.add(article_id)
+
+    def upsert(self, articles: Iterable[KnowledgeBase]) -> None:
+        """Add or re-index articles; inactive ones are removed"""
+        with self._lock:
+            if self._built_at is None and self._changed_during_rebuild is None:
+                return  # Nothing to patch yet; the first search builds it
+            for article in articles:
+                self._note_change(article.id)
+                self._remove(article.id)
+                if article.is_active:
+                    self._add(article)
+            self.version += 1
+
+    def remove(self, article_ids: Iterable[int]) -> None:
+        with self._lock:
+            for article_id in article_ids:
+                self._note_change(article_id)
+                self._remove(article_id)
+            self.version += 1
+
+    def on_kb_upserted(self, articles: List[KnowledgeBase], **_) -> None:
+        self.upsert(articles)
+
+    def on_kb_deleted(self, article_ids: List[int], **_) -> None:
+        self.remove(article_ids)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        db: Session,
+        query_text: str,
+        category: Optional[str] = None,
+        limit: int = 10,
+        term_weights: Optional[Dict[str, float]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return (article_id, score) pairs, best first
+
+        `term_weights` overrides the analyzed query with pre-weighted
+        (already stemmed) terms, e.g. from query expansion.
+        """
+        self.ensure_built(db)
+
+        if term_weights is None:
+            term_weights = {}
+            for term in self.analyze(query_text):
+                term_weights[term] = term_weights.get(term, 0.0) + 1.0
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not term_weights:
+                return []
+
+            scores = np.zeros(self._n_slots)
+            hit = np.zeros(self._n_slots, dtype=bool)
+            for term, query_weight in term_weights.items():
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                slots, weights = arrays
+                factor = query_weight * math.log(1 + (n_docs - len(slots) + 0.5) / (len(slots) + 0.5))
+                np.add.at(scores, slots, weights * factor)
+                hit[slots] = True
+
+            if category is not None:
+                code = self._category_codes.get(category)
+                if code is None:
+                    return []
+                hit &= self._slot_categories[:self._n_slots] == code
+            candidates = np.flatnonzero(hit)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            ids = self._slot_ids[candidates]
+            # Best first; ties go to the older article
+            order = np.lexsort((ids, -scores[candidates]))
+            return [(int(ids[i]), float(scores[candidates[i]])) for i in order]
+
+kb_search_index = KBSearchIndex(refresh_seconds=settings.KB_INDEX_REFRESH_SECONDS)
+
+event_bus.subscribe("kb.upserted", kb_search_index.on_kb_upserted)
+event_bus.subscribe("kb.deleted", kb_search_index.on_kb_deleted)
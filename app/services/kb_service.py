@@ -1,9 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import Optional, List
+from app.core.config import settings
 from app.models.knowledge_base import KnowledgeBase
 from app.schemas.kb import KBCreate, KBUpdate
 from app.schemas.ticket import TicketCategory
+from app.services.events import event_bus
+from app.services.kb_counter_buffer import kb_counter_buffer
+from app.services.kb_deflection import kb_deflection_index
+from app.services.kb_keyword_service import KBKeywordService
+from app.services.kb_search_index import kb_search_index
+from app.services.kb_query_expansion import kb_query_expander
+from app.services.kb_suggest_index import kb_suggest_index
 
 
 class KBService:
@@ -16,34 +23,41 @@ class KBService:
             question=kb_data.question,
             answer=kb_data.answer,
             category=kb_data.category,
-            keywords=kb_data.keywords,
             is_active=kb_data.is_active,
             is_featured=kb_data.is_featured,
             view_count=0,
             helpful_count=0,
             not_helpful_count=0
         )
+        KBKeywordService.assign(db, [(article, kb_data.keywords)])
         
         db.add(article)
         db.commit()
         db.refresh(article)
         
+        event_bus.publish("kb.upserted", articles=[article])
+        
         return article
     
     @staticmethod
     def get_article(db: Session, article_id: int) -> Optional[KnowledgeBase]:
-        """Get article by ID and increment view count"""
+        """Get article by ID and count the view (buffered, see kb_counter_buffer)"""
         article = db.query(KnowledgeBase).filter(
             KnowledgeBase.id == article_id
         ).first()
         
         if article:
-            article.view_count += 1
-            db.commit()
-            db.refresh(article)
+            kb_counter_buffer.record_view(article_id)
+            db.expunge(article)
+            kb_counter_buffer.apply_pending(article)
         
         return article
     
+    @staticmethod
+    def record_view(article_id: int) -> None:
+        """Count a view of an article served without a database read"""
+        kb_counter_buffer.record_view(article_id)
+    
     @staticmethod
     def list_articles(
         db: Session,
@@ -78,26 +92,71 @@ class KBService:
         category: Optional[TicketCategory] = None,
         limit: int = 10
     ) -> List[KnowledgeBase]:
-        """Search knowledge base articles"""
-        search_filter = f"%{query_text}%"
-        
-        query = db.query(KnowledgeBase).filter(
-            KnowledgeBase.is_active == True,
-            or_(
-                KnowledgeBase.title.ilike(search_filter),
-                KnowledgeBase.question.ilike(search_filter),
-                KnowledgeBase.answer.ilike(search_filter),
-                KnowledgeBase.keywords.ilike(search_filter)
-            )
+        """Search knowledge base articles (BM25 ranked, see kb_search_index)"""
+        ranked = kb_search_index.search(
+            db,
+            query_text,
+            category=category.value if category else None,
+            limit=limit,
+            term_weights=kb_query_expander.expand(db, query_text)
         )
+        if not ranked:
+            return []
         
-        if category:
-            query = query.filter(KnowledgeBase.category == category)
+        ids = [article_id for article_id, _ in ranked]
+        articles = db.query(KnowledgeBase).filter(KnowledgeBase.id.in_(ids)).all()
+        by_id = {article.id: article for article in articles}
         
-        return query.order_by(
-            KnowledgeBase.helpful_count.desc(),
-            KnowledgeBase.view_count.desc()
-        ).limit(limit).all()
+        return [by_id[article_id] for article_id in ids if article_id in by_id]
+    
+    @staticmethod
+    def find_by_keywords(
+        db: Session,
+        keywords: str,
+        match_all: bool = True,
+        category: Optional[TicketCategory] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> tuple[List[KnowledgeBase], int]:
+        """Exact keyword lookup through the keyword join table (see kb_keyword_service)"""
+        return KBKeywordService.find_articles(
+            db,
+            keywords,
+            match_all=match_all,
+            category=category,
+            skip=skip,
+            limit=limit
+        )
+    
+    @staticmethod
+    def keyword_stats(db: Session, prefix: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """Most used keywords with article counts and combined feedback"""
+        return KBKeywordService.keyword_stats(db, prefix=prefix, limit=limit)
+    
+    @staticmethod
+    def suggest_articles(
+        db: Session,
+        prefix: str,
+        category: Optional[TicketCategory] = None,
+        limit: int = 8
+    ) -> List[dict]:
+        """Typeahead completions over titles and keywords (see kb_suggest_index)"""
+        return kb_suggest_index.suggest(
+            db,
+            prefix,
+            category=category.value if category else None,
+            limit=limit
+        )
+    
+    @staticmethod
+    def match_ticket(db: Session, title: str, description: str) -> List[dict]:
+        """Articles that may already answer a new ticket (see kb_deflection)"""
+        return kb_deflection_index.match(
+            db,
+            f"{title} {description}",
+            limit=settings.KB_DEFLECTION_TOP_K,
+            min_score=settings.KB_DEFLECTION_MIN_SCORE
+        )
     
     @staticmethod
     def update_article(
@@ -115,17 +174,22 @@ class KBService:
         
         update_data = kb_update.model_dump(exclude_unset=True)
         
+        if "keywords" in update_data:
+            KBKeywordService.assign(db, [(article, update_data.pop("keywords"))])
+        
         for field, value in update_data.items():
             setattr(article, field, value)
         
         db.commit()
         db.refresh(article)
         
+        event_bus.publish("kb.upserted", articles=[article])
+        
         return article
     
     @staticmethod
     def mark_helpful(db: Session, article_id: int, helpful: bool = True) -> Optional[KnowledgeBase]:
-        """Mark article as helpful or not helpful"""
+        """Mark article as helpful or not helpful (buffered, see kb_counter_buffer)"""
         article = db.query(KnowledgeBase).filter(
             KnowledgeBase.id == article_id
         ).first()
@@ -133,15 +197,11 @@ class KBService:
         if not article:
             return None
         
-        if helpful:
-            article.helpful_count += 1
-        else:
-            article.not_helpful_count += 1
+        kb_counter_buffer.record_feedback(article_id, helpful)
+        db.expunge(article)
+        event_bus.publish("kb.counters_changed", article_ids=[article_id])
         
-        db.commit()
-        db.refresh(article)
-        
-        return article
+        return kb_counter_buffer.apply_pending(article)
     
     @staticmethod
     def delete_article(db: Session, article_id: int) -> bool:
@@ -155,4 +215,6 @@ class KBService:
         
         article.is_active = False
         db.commit()
+        
+        event_bus.publish("kb.deleted", article_ids=[article_id])
         return True
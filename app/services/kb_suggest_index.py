@@ -0,0 +1,234 @@
+import heapq
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.knowledge_base import KnowledgeBase
+from app.services.events import event_bus
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import tokenize, enum_value, STOPWORDS
+
+# Prefixes shorter than this match a large slice of the index, so their
+# top-k lists are memoized until an edit touches a key they cover
+MEMO_PREFIX_LENGTH = 3
+
+# Sorts after any character a normalized key can contain
+_HIGH = "\uffff"
+
+
+class _Entry:
+    __slots__ = ("title", "category", "weight", "keys")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return " ".join(tokenize(text, drop_stopwords=False))
+
+
+class KBSuggestIndex:
+    """
+    Sorted-array prefix index for KB typeahead
+
+    Every active article contributes its normalized title, each title
+    suffix starting at a non-stopword ("reset outlook password", "outlook
+    password", "password") and each keyword, as (key, article_id) pairs
+    in one sorted list. A prefix lookup is two bisects; the matching slice
+    is ranked by a popularity weight from view and helpful counts and
+    collapsed to one suggestion per article. Kept in sync from
+    "kb.upserted"/"kb.deleted" events and rebuilt in the background every
+    KB_INDEX_REFRESH_SECONDS to pick up counter changes; lookups keep
+    using the current index while that runs.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._keys: List[Tuple[str, int]] = []
+        self._entries: Dict[int, _Entry] = {}
+        self._memo: Dict[Tuple[str, Optional[str], int], List[Dict]] = {}
+        self._built_at: Optional[float] = None
+        # Articles touched by events while a rebuild loads; None when not rebuilding
+        self._changed_during_rebuild: Optional[Set[int]] = None
+        self._refresher = BackgroundRebuild("kb-suggest-rebuild", self.rebuild)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _entry(article: KnowledgeBase) -> _Entry:
+        entry = _Entry()
+        entry.title = article.title
+        entry.category = enum_value(article.category)
+        helpful = (article.helpful_count or 0) - (article.not_helpful_count or 0)
+        entry.weight = 1.0 + math.log1p(article.view_count or 0) + 2.0 * math.log1p(max(helpful, 0))
+
+        keys = set()
+        words = normalize(article.title).split()
+        for i, word in enumerate(words):
+            if i == 0 or word not in STOPWORDS:
+                keys.add(" ".join(words[i:]))
+        for keyword in (article.keywords or "").split(","):
+            keyword = normalize(keyword)
+            if keyword:
+                keys.add(keyword)
+        entry.keys = tuple(keys)
+        return entry
+
+    def ensure_built(self, db: Session) -> None:
+        if self._built_at is None:
+            self.rebuild(db)
+        elif time.monotonic() - self._built_at > self.refresh_seconds:
+            self._refresher.trigger()
+
+    def rebuild(self, db: Session) -> None:
+        """Re-index every active article, then swap the new index in"""
+        with self._lock:
+            self._changed_during_rebuild = set()
+        try:
+            articles = db.query(KnowledgeBase).filter(
+                KnowledgeBase.is_active == True
+            ).all()
+            entries = {article.id: self._entry(article) for article in articles}
+            keys = sorted(
+                (key, article_id) for article_id, entry in entries.items() for key in entry.keys
+            )
+        except Exception:
+            with self._lock:
+                self._changed_during_rebuild = None
+            raise
+
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+            self._memo = {}
+
+            # Events that arrived while loading may be newer than what was loaded
+            changed, self._changed_during_rebuild = self._changed_during_rebuild, None
+            if changed:
+                for article_id in changed:
+                    self._remove(article_id)
+                for article in db.query(KnowledgeBase).populate_existing().filter(
+                    KnowledgeBase.id.in_(changed),
+                    KnowledgeBase.is_active == True
+                ):
+                    self._insert(article)
+            self._built_at = time.monotonic()
+
+    def _forget(self, keys: Iterable[str]) -> None:
+        """Drop memoized results for short prefixes of the given keys"""
+        prefixes = {key[:n] for key in keys for n in range(1, MEMO_PREFIX_LENGTH)}
+        if prefixes:
+            self._memo = {m: v for m, v in self._memo.items() if m[0] not in prefixes}
+
+    def _remove(self, article_id: int) -> None:
+        entry = self._entries.pop(article_id, None)
+        if entry is None:
+            return
+        self._forget(entry.keys)
+        for key in entry.keys:
+            position = bisect_left(self._keys, (key, article_id))
+            if position < len(self._keys) and self._keys[position] == (key, article_id):
+                del self._keys[position]
+
+    def _insert(self, article: KnowledgeBase) -> None:
+        entry = self._entry(article)
+        self._entries[article.id] = entry
+        self._forget(entry.keys)
+        for key in entry.keys:
+            insort(self._keys, (key, article.id))
+
+    def _note_change(self, article_id: int) -> None:
+        if self._changed_during_rebuild is not None:
+            self._changed_during_rebuild.add(article_id)
+
+    def upsert(self, articles: Iterable[KnowledgeBase]) -> None:
+        """Add or re-index articles; inactive ones are removed"""
+        with self._lock:
+            if self._built_at is None and self._changed_during_rebuild is None:
+                return  # Nothing to patch yet; the first lookup builds it
+            for article in articles:
+                self._note_change(article.id)
+                self._remove(article.id)
+                if article.is_active:
+                    self._insert(article)
+
+    def remove(self, article_ids: Iterable[int]) -> None:
+        with self._lock:
+            for article_id in article_ids:
+                self._note_change(article_id)
+                self._remove(article_id)
+
+    def on_kb_upserted(self, articles: List[KnowledgeBase], **_) -> None:
+        self.upsert(articles)
+
+    def on_kb_deleted(self, article_ids: List[int], **_) -> None:
+        self.remove(article_ids)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def suggest(
+        self,
+        db: Session,
+        prefix: str,
+        category: Optional[str] = None,
+        limit: int = 8
+    ) -> List[Dict]:
+        """
+        Return up to `limit` completions for a typed prefix, most popular first
+
+        Each suggestion is {id, title, category, matched}, where `matched`
+        is the indexed phrase (title suffix or keyword) the prefix hit.
+        """
+        self.ensure_built(db)
+
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        memo_key = (prefix, category, limit)
+        if len(prefix) < MEMO_PREFIX_LENGTH:
+            memoized = self._memo.get(memo_key)
+            if memoized is not None:
+                return memoized
+
+        with self._lock:
+            keys = self._keys
+            start = bisect_left(keys, (prefix,))
+            end = bisect_left(keys, (prefix + _HIGH,), lo=start)
+
+            # Lexicographically first matching key per article
+            matched: Dict[int, str] = {}
+            for key, article_id in keys[start:end]:
+                if article_id not in matched:
+                    matched[article_id] = key
+
+            entries = self._entries
+            candidates: Iterable[int] = matched
+            if category is not None:
+                candidates = [i for i in matched if entries[i].category == category]
+            best = heapq.nlargest(limit, candidates, key=lambda i: entries[i].weight)
+
+            suggestions = [
+                {
+                    "id": article_id,
+                    "title": entries[article_id].title,
+                    "category": entries[article_id].category,
+                    "matched": matched[article_id]
+                }
+                for article_id in best
+            ]
+            if len(prefix) < MEMO_PREFIX_LENGTH:
+                self._memo[memo_key] = suggestions
+            return suggestions
+
+
+kb_suggest_index = KBSuggestIndex(refresh_seconds=settings.KB_INDEX_REFRESH_SECONDS)
+
+event_bus.subscribe("kb.upserted", kb_suggest_index.on_kb_upserted)
+event_bus.subscribe("kb.deleted", kb_suggest_index.on_kb_deleted)
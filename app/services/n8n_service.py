@@ -1,6 +1,7 @@
-import requests
+import httpx
 from typing import Dict, Any, Optional
 from app.core.config import settings
+from app.services.http_transport import http_transport
 from app.schemas.ticket import TicketCategory, TicketPriority
 
 
@@ -26,7 +27,8 @@ class N8nService:
         }
         
         try:
-            response = requests.post(
+            response = http_transport.request_sync(
+                "POST",
                 settings.N8N_WEBHOOK_URL,
                 json=payload,
                 timeout=30
@@ -42,7 +44,7 @@ class N8nService:
                     "success": False,
                     "error": f"HTTP {response.status_code}: {response.text}"
                 }
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             return {
                 "success": False,
                 "error": "Request timeout"
@@ -118,7 +120,8 @@ class N8nService:
         }
         
         try:
-            response = requests.post(
+            response = http_transport.request_sync(
+                "POST",
                 settings.N8N_SOLUTION_WEBHOOK_URL,
                 json=payload,
                 timeout=30
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional, Set
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.services.events import event_bus
+from app.utils.helpers import enum_value
+
+RESYNC_MESSAGE = json.dumps({"type": "resync"})
+
+
+class Subscriber:
+    """One connected dashboard client with its own bounded buffer"""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.lagged = False
+
+    def offer(self, message: str) -> None:
+        """Enqueue without ever blocking; a slow client loses its oldest messages"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.lagged = True
+        self.queue.put_nowait(message)
+
+    async def next_message(self, timeout: float) -> Optional[str]:
+        """Wait for the next message; None on timeout (time for a heartbeat)"""
+        if self.lagged:
+            # Tell the client it missed events and should refetch once
+            self.lagged = False
+            return RESYNC_MESSAGE
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RealtimeBroker:
+    """
+    In-process fan-out of ticket events to SSE/WebSocket clients
+
+    Events are serialized once and handed to each event loop with a single
+    call_soon_threadsafe, so publishing from a sync request thread costs
+    the same for one client or thousands. Every client has a bounded
+    queue; when it overflows, the oldest messages are dropped and the
+    client receives a "resync" event instead of stalling the publisher.
+    """
+
+    def __init__(self, queue_size: int, max_clients: int):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._subscribers: Dict[asyncio.AbstractEventLoop, Set[Subscriber]] = {}
+        self.published = 0
+
+    @property
+    def client_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self) -> Optional[Subscriber]:
+        """Register a client on the running loop; None when at capacity"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.client_count >= self.max_clients:
+                return None
+            subscriber = Subscriber(self.queue_size)
+            self._subscribers.setdefault(loop, set()).add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            for loop, subs in list(self._subscribers.items()):
+                subs.discard(subscriber)
+                if not subs:
+                    del self._subscribers[loop]
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Broadcast an event to every client; safe to call from any thread"""
+        with self._lock:
+            targets = [(loop, list(subs)) for loop, subs in self._subscribers.items()]
+        if not targets:
+            return
+
+        message = json.dumps(event, default=str)
+        self.published += 1
+        for loop, subs in targets:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, subs, message)
+            except RuntimeError:
+                pass  # Loop already closed (shutdown)
+
+    @staticmethod
+    def _fan_out(subscribers, message: str) -> None:
+        for subscriber in subscribers:
+            subscriber.offer(message)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            subscribers = [s for subs in self._subscribers.values() for s in subs]
+        return {
+            "clients": len(subscribers),
+            "published": self.published,
+            "dropped": sum(s.dropped for s in subscribers),
+            "queue_size": self.queue_size,
+            "max_clients": self.max_clients
+        }
+
+    # ------------------------------------------------------------------
+    # Ticket event adapters
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _compact(ticket: Ticket) -> Dict[str, Any]:
+        return {
+            "id": ticket.id,
+            "ticket_number": ticket.ticket_number,
+            "title": ticket.title,
+            "status": enum_value(ticket.status),
+            "priority": enum_value(ticket.priority),
+            "category": enum_value(ticket.category),
+            "assigned_to_id": ticket.assigned_to_id
+        }
+
+    def on_ticket_created(self, ticket: Ticket, **_) -> None:
+        if not self._subscribers:
+            return
+        self.publish({
+            "type": "ticket.created",
+            "ticket": self._compact(ticket),
+            "metrics": {"total": 1, "status": {enum_value(ticket.status): 1}}
+        })
+
+    def on_ticket_updated(self, ticket: Ticket, changes: Dict[str, tuple], **_) -> None:
+        if not self._subscribers:
+            return
+        event = {
+            "type": "ticket.updated",
+            "ticket": self._compact(ticket),
+            "changes": {
+                field: [enum_value(old), enum_value(new)]
+                for field, (old, new) in changes.items()
+            }
+        }
+        if "status" in changes:
+            old, new = (enum_value(v) for v in changes["status"])
+            event["type"] = "ticket.status_changed"
+            event["metrics"] = {"status": {old: -1, new: 1}}
+        self.publish(event)
+
+    def on_ticket_commented(self, ticket_id: int, activity, **_) -> None:
+        if not self._subscribers:
+            return
+        self.publish({
+            "type": "ticket.commented",
+            "ticket_id": ticket_id,
+            "activity_id": activity.id
+        })
+
+
+realtime_broker = RealtimeBroker(
+    queue_size=settings.REALTIME_QUEUE_SIZE,
+    max_clients=settings.REALTIME_MAX_CLIENTS
+)
+
+event_bus.subscribe("ticket.created", realtime_broker.on_ticket_created)
+event_bus.subscribe("ticket.updated", realtime_broker.on_ticket_updated)
+event_bus.subscribe("ticket.commented", realtime_broker.on_ticket_commented)
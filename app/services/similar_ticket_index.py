@@ -0,0 +1,271 @@
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket, TicketStatus
+from app.models.ticket_activity import TicketActivity, ActivityType
+from app.services.events import event_bus
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import tokenize, stem, enum_value
+from app.utils.minhash import MinHasher, LSHIndex, shingles
+
+# Tickets in these states count as solved and are worth pointing agents at
+SOLVED_STATUSES = (TicketStatus.RESOLVED, TicketStatus.CLOSED)
+_SOLVED_VALUES = {status.value for status in SOLVED_STATUSES}
+
+# Hashed term space for the cosine re-rank
+VECTOR_DIM = 1 << 18
+
+# Word pairs: related (not just duplicated) tickets still share enough of them
+SHINGLE_SIZE = 2
+
+
+class _Corpus:
+    """LSH buckets, term vectors and document frequencies of the indexed tickets"""
+
+    __slots__ = ("lsh", "vectors", "df")
+
+    def __init__(self, bands: int, rows: int):
+        self.lsh = LSHIndex(bands=bands, rows=rows)
+        self.vectors: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.df = np.zeros(VECTOR_DIM, dtype=np.int32)
+
+
+class SimilarTicketIndex:
+    """
+    Finds resolved tickets similar to a given ticket
+
+    Each solved ticket's title, description and comments are indexed
+    twice: a MinHash signature of word shingles goes into an LSH index
+    for candidate generation, and a sparse hashed term-frequency vector
+    is kept for re-ranking. A lookup takes the LSH candidates (newest
+    first within oversized buckets, at most SIMILAR_TICKETS_MAX_CANDIDATES)
+    and scores them all at once by TF-IDF cosine with np.add.reduceat.
+    Document frequencies are maintained incrementally, so idf is always
+    current. Tickets are queued from "ticket.updated" and
+    "ticket.commented" events and indexed on the next lookup.
+
+    The index is built at startup. Full rebuilds load into a separate
+    corpus and swap it in, so lookups never wait for one; until the first
+    build finishes, a lookup starts it in the background and finds nothing.
+    """
+
+    def __init__(self, num_perm: int, bands: int, max_candidates: int):
+        self.max_candidates = max_candidates
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._corpus = _Corpus(bands, self.rows)
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+        # One sync at a time reads the database for queued changes
+        self._sync_lock = threading.Lock()
+        # Tickets synced into the old corpus while a rebuild loads; None when not rebuilding
+        self._synced_during_rebuild: Optional[Set[int]] = None
+        self._built = False
+        self._builder = BackgroundRebuild("similar-tickets-rebuild", self.rebuild)
+
+    # ------------------------------------------------------------------
+    # Featurization
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _terms(text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted hashed term ids and their sublinear term frequencies"""
+        tokens = [stem(token) for token in tokenize(text)]
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        counts = Counter(zlib.crc32(feature.encode()) % VECTOR_DIM for feature in features)
+        ids = np.fromiter(sorted(counts), dtype=np.int32, count=len(counts))
+        tf = np.fromiter((counts[i] for i in ids.tolist()), dtype=np.float32, count=len(counts))
+        return ids, 1.0 + np.log(tf)
+
+    @staticmethod
+    def _texts(db: Session, tickets: Iterable[Tuple[int, str, str]]) -> Dict[int, str]:
+        """Concatenate title, description and comments per ticket id"""
+        parts: Dict[int, List[str]] = {
+            ticket_id: [title or "", description or ""] for ticket_id, title, description in tickets
+        }
+        if parts:
+            comments = db.query(TicketActivity.ticket_id, TicketActivity.description).filter(
+                TicketActivity.ticket_id.in_(list(parts)),
+                TicketActivity.activity_type == ActivityType.COMMENT
+            )
+            for ticket_id, comment in comments:
+                if comment:
+                    parts[ticket_id].append(comment)
+        return {ticket_id: " ".join(texts) for ticket_id, texts in parts.items()}
+
+    def _idf(self, term_ids: np.ndarray) -> np.ndarray:
+        corpus = self._corpus
+        n_docs = len(corpus.vectors)
+        return (np.log((1.0 + n_docs) / (1.0 + corpus.df[term_ids])) + 1.0).astype(np.float32)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _add(self, corpus: _Corpus, ticket_id: int, text: str) -> None:
+        self._remove(corpus, ticket_id)
+        term_ids, tf = self._terms(text)
+        if not len(term_ids):
+            return
+        corpus.lsh.add(ticket_id, self._hasher.signature(shingles(text, SHINGLE_SIZE)))
+        corpus.vectors[ticket_id] = (term_ids, tf)
+        corpus.df[term_ids] += 1
+
+    @staticmethod
+    def _remove(corpus: _Corpus, ticket_id: int) -> None:
+        vector = corpus.vectors.pop(ticket_id, None)
+        if vector is None:
+            return
+        corpus.lsh.remove(ticket_id)
+        corpus.df[vector[0]] -= 1
+
+    def rebuild(self, db: Session, batch_size: int = 2000) -> None:
+        """Index every solved ticket into a new corpus, then swap it in"""
+        with self._lock:
+            self._synced_during_rebuild = set()
+        try:
+            rows = db.query(Ticket.id, Ticket.title, Ticket.description).filter(
+                Ticket.status.in_(SOLVED_STATUSES)
+            ).order_by(Ticket.id).yield_per(batch_size)
+
+            corpus = _Corpus(self.bands, self.rows)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    for ticket_id, text in self._texts(db, batch).items():
+                        self._add(corpus, ticket_id, text)
+                    batch = []
+            for ticket_id, text in self._texts(db, batch).items():
+                self._add(corpus, ticket_id, text)
+        except Exception:
+            with self._lock:
+                self._synced_during_rebuild = None
+            raise
+
+        with self._lock:
+            # Changes queued meanwhile stay pending and are re-read by the next
+            # sync; so are those a sync applied to the old corpus during the load
+            self._pending |= self._synced_during_rebuild
+            self._synced_during_rebuild = None
+            self._corpus = corpus
+            self._built = True
+
+    def sync(self, db: Session) -> bool:
+        """
+        Apply queued ticket changes; False while the first build is still running
+
+        The changed tickets are read without holding the index lock. If
+        another request is already syncing, this one doesn't wait for it
+        and looks up against the current corpus.
+        """
+        if not self._built:
+            self._builder.trigger()
+            return False
+        if not self._sync_lock.acquire(blocking=False):
+            return True
+        try:
+            with self._lock:
+                pending, self._pending = self._pending, set()
+            if not pending:
+                return True
+            try:
+                tickets = db.query(Ticket.id, Ticket.title, Ticket.description, Ticket.status).filter(
+                    Ticket.id.in_(pending)
+                ).all()
+                solved = [(t.id, t.title, t.description) for t in tickets if enum_value(t.status) in _SOLVED_VALUES]
+                texts = self._texts(db, solved)
+            except Exception:
+                with self._lock:
+                    self._pending |= pending
+                raise
+            with self._lock:
+                if self._synced_during_rebuild is not None:
+                    self._synced_during_rebuild.update(pending)
+                corpus = self._corpus
+                for ticket_id in pending:
+                    self._remove(corpus, ticket_id)
+                for ticket_id, text in texts.items():
+                    self._add(corpus, ticket_id, text)
+        finally:
+            self._sync_lock.release()
+        return True
+
+    def on_ticket_updated(self, ticket: Ticket, changes: Dict[str, tuple], **_) -> None:
+        status_change = changes.get("status", ())
+        with self._lock:
+            if ticket.id in self._corpus.vectors or any(enum_value(s) in _SOLVED_VALUES for s in status_change):
+                self._pending.add(ticket.id)
+
+    def on_ticket_commented(self, ticket_id: int, **_) -> None:
+        with self._lock:
+            if ticket_id in self._corpus.vectors:
+                self._pending.add(ticket_id)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def similar(
+        self,
+        db: Session,
+        ticket: Ticket,
+        limit: int = 5,
+        min_score: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """Return (ticket_id, cosine score) pairs of solved tickets, best first"""
+        if not self.sync(db):
+            return []
+
+        text = self._texts(db, [(ticket.id, ticket.title, ticket.description)])[ticket.id]
+        query_ids, query_tf = self._terms(text)
+        if not len(query_ids):
+            return []
+        signature = self._hasher.signature(shingles(text, SHINGLE_SIZE))
+
+        with self._lock:
+            corpus = self._corpus
+            found = corpus.lsh.candidates(signature, per_bucket=self.max_candidates)
+            found.pop(ticket.id, None)
+            if not found:
+                return []
+            candidates = [key for key, _ in found.most_common(self.max_candidates)]
+
+            # The query stays sparse: its sorted term ids and their weights
+            query_weights = query_tf * self._idf(query_ids)
+            query_weights /= np.linalg.norm(query_weights)
+
+            vectors = [corpus.vectors[key] for key in candidates]
+            lengths = np.fromiter((len(v[0]) for v in vectors), dtype=np.int64, count=len(vectors))
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            term_ids = np.concatenate([v[0] for v in vectors])
+            weights = np.concatenate([v[1] for v in vectors]) * self._idf(term_ids)
+
+            # Look each candidate term up in the query's sorted ids; misses contribute 0
+            positions = np.minimum(np.searchsorted(query_ids, term_ids), len(query_ids) - 1)
+            shared = np.where(query_ids[positions] == term_ids, query_weights[positions], 0.0)
+
+            norms = np.sqrt(np.add.reduceat(weights * weights, offsets))
+            scores = np.add.reduceat(shared * weights, offsets) / norms
+
+        order = np.argsort(-scores)[:limit]
+        return [
+            (candidates[i], round(float(scores[i]), 3))
+            for i in order
+            if scores[i] >= min_score
+        ]
+
+
+similar_tickets = SimilarTicketIndex(
+    num_perm=settings.SIMILAR_TICKETS_NUM_PERM,
+    bands=settings.SIMILAR_TICKETS_BANDS,
+    max_candidates=settings.SIMILAR_TICKETS_MAX_CANDIDATES
+)
+
+event_bus.subscribe("ticket.updated", similar_tickets.on_ticket_updated)
+event_bus.subscribe("ticket.commented", similar_tickets.on_ticket_commented)
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.utils.logger import logger
+from app.utils.metrics import histogram
+from app.utils.offload import ThreadOffloader
+
+Message = Dict[str, Any]
+
+ERROR_MESSAGE: Message = {
+    "response_type": "ephemeral",
+    "text": "⚠️ Something went wrong while handling your request. Please try again."
+}
+
+
+class SlackDispatcher:
+    """
+    Background executor for Slack commands and events
+
+    Slack gives an app 3 seconds to answer. The Slack routes acknowledge
+    straight away and hand the real work (user lookup, ticket creation,
+    classification, KB matching) to this pool; the finished message is
+    delivered through a reply callable, usually a post to the command's
+    response_url. Each job gets its own database session.
+
+    Latency is recorded per command in two histograms (see /metrics/latency):
+    "slack.ack.<name>" from request arrival to the acknowledgement and
+    "slack.completion.<name>" from request arrival to the delivered reply.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="slack-worker")
+            return self._executor
+
+    @staticmethod
+    def record_ack(name: str, started: float) -> None:
+        histogram(f"slack.ack.{name}").observe(time.perf_counter() - started)
+
+    def submit(
+        self,
+        name: str,
+        work: Callable[[Session], Optional[Message]],
+        reply: Callable[[Message], Any],
+        started: float
+    ) -> Future:
+        """
+        Run work(db) in the background and pass its message to reply
+
+        `started` is the perf_counter() reading taken when the request
+        arrived. A failing job replies with a generic error message; a
+        failing reply is logged. Either way the completion is recorded.
+        """
+        return self._pool().submit(self._run, name, work, reply, started)
+
+    def _run(
+        self,
+        name: str,
+        work: Callable[[Session], Optional[Message]],
+        reply: Callable[[Message], Any],
+        started: float
+    ) -> None:
+        try:
+            db = SessionLocal()
+            try:
+                message = work(db)
+            except Exception:
+                logger.exception(f"Slack {name} failed")
+                db.rollback()
+                message = ERROR_MESSAGE
+            finally:
+                db.close()
+
+            if message:
+                try:
+                    result = reply(message)
+                except Exception:
+                    logger.exception(f"Slack {name} reply failed")
+                    return
+                if isinstance(result, dict) and not result.get("ok", True):
+                    logger.warning(f"Slack {name} reply failed: {result.get('error')}")
+        finally:
+            histogram(f"slack.completion.{name}").observe(time.perf_counter() - started)
+
+    def shutdown(self) -> None:
+        """Finish queued jobs and stop the workers"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+
+slack_dispatcher = SlackDispatcher(max_workers=settings.SLACK_WORKER_THREADS)
+
+# Blocking work (database, lookups) of the async Slack routes themselves
+slack_handler_threads = ThreadOffloader("slack.handlers", size=settings.SLACK_HANDLER_THREADS)
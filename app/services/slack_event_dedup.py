@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.slack_event_receipt import SlackEventReceipt
+from app.utils.logger import logger
+
+# Old receipts are pruned at most this often (per process)
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class SlackEventDeduplicator:
+    """
+    At-most-once acceptance of Slack events by event_id
+
+    Slack redelivers an event (with X-Slack-Retry-Num) when it doesn't get
+    a timely 200, and every delivery carries the same event_id. Accepted
+    IDs are remembered in a bounded in-memory LRU, so a retry reaching the
+    same worker is dropped with a dict lookup. A retry reaching another
+    worker is caught by the slack_event_receipts table: claiming an event
+    is an INSERT on its primary key, which only one worker can win.
+
+    The receipt also records the ticket created for the event, so the
+    create itself is idempotent. A claim is released if processing fails,
+    but events are acked before processing runs, so Slack does not retry
+    such a failure: the release only lets a redelivery that was already
+    on its way (a slow ack) through instead of being dropped.
+    """
+
+    def __init__(self, maxsize: int, retention_hours: int):
+        self.maxsize = maxsize
+        self.retention = timedelta(hours=retention_hours)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned_at: Optional[float] = None
+        self.duplicates = 0
+
+    def _remember(self, event_id: str) -> None:
+        with self._lock:
+            self._seen[event_id] = None
+            self._seen.move_to_end(event_id)
+            while len(self._seen) > self.maxsize:
+                self._seen.popitem(last=False)
+
+    def _forget(self, event_id: str) -> None:
+        with self._lock:
+            self._seen.pop(event_id, None)
+
+    def claim(self, db: Session, event_id: str, event_type: Optional[str] = None) -> bool:
+        """Accept an event for processing; False if it was already accepted"""
+        with self._lock:
+            if event_id in self._seen:
+                self._seen.move_to_end(event_id)
+                self.duplicates += 1
+                return False
+
+        db.add(SlackEventReceipt(event_id=event_id, event_type=event_type))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            self._remember(event_id)
+            with self._lock:
+                self.duplicates += 1
+            return False
+
+        self._remember(event_id)
+        self._maybe_prune(db)
+        return True
+
+    def release(self, db: Session, event_id: str) -> None:
+        """Undo a claim whose processing failed, so a redelivery is accepted"""
+        db.rollback()
+        db.query(SlackEventReceipt).filter(
+            SlackEventReceipt.event_id == event_id,
+            SlackEventReceipt.ticket_id.is_(None)
+        ).delete(synchronize_session=False)
+        db.commit()
+        self._forget(event_id)
+
+    def ticket_for(self, db: Session, event_id: str) -> Optional[int]:
+        """Ticket already created for an event, if any"""
+        return db.query(SlackEventReceipt.ticket_id).filter(
+            SlackEventReceipt.event_id == event_id
+        ).scalar()
+
+    def record_ticket(self, db: Session, event_id: str, ticket_id: int) -> None:
+        db.query(SlackEventReceipt).filter(
+            SlackEventReceipt.event_id == event_id
+        ).update({SlackEventReceipt.ticket_id: ticket_id}, synchronize_session=False)
+        db.commit()
+
+    def _maybe_prune(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._pruned_at is not None and now - self._pruned_at < PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        self.prune(db)
+
+    def prune(self, db: Session) -> int:
+        """Delete receipts older than SLACK_EVENT_RECEIPT_RETENTION_HOURS"""
+        try:
+            deleted = db.query(SlackEventReceipt).filter(
+                SlackEventReceipt.received_at < datetime.now() - self.retention
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Pruning Slack event receipts failed")
+            return 0
+        return deleted
+
+
+slack_event_dedup = SlackEventDeduplicator(
+    maxsize=settings.SLACK_EVENT_DEDUP_SIZE,
+    retention_hours=settings.SLACK_EVENT_RECEIPT_RETENTION_HOURS
+)
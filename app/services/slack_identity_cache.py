@@ -0,0 +1,85 @@
+from typing import Dict, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import User, UserRole
+from app.schemas.user import UserCreate
+from app.services.events import event_bus
+from app.services.user_service import UserService
+from app.utils.cache import TTLCache
+
+
+class SlackIdentity(NamedTuple):
+    user_id: int
+    role: UserRole
+
+
+class SlackIdentityCache:
+    """
+    Slack user ID -> (user id, role) for the Slack handlers
+
+    Every slash command and mention starts by resolving the Slack user,
+    so the mapping is kept in a bounded TTL/LRU cache. It is warmed at
+    startup with the newest Slack-linked users, and the "user.updated"
+    and "user.deleted" events drop entries as soon as a user's Slack ID,
+    role or status changes; the TTL only bounds how stale an entry can
+    get if a user row is changed outside UserService.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._cache = TTLCache("slack_identities", maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    def get(self, db: Session, slack_id: str) -> Optional[SlackIdentity]:
+        """Resolve a Slack user, reading the database only on a cache miss"""
+        identity = self._cache.get(slack_id)
+        if identity is None:
+            user = UserService.get_user_by_slack_id(db, slack_id)
+            if not user:
+                return None
+            identity = SlackIdentity(user.id, user.role)
+            self._cache.set(slack_id, identity)
+        return identity
+
+    def get_or_create(self, db: Session, slack_id: str) -> SlackIdentity:
+        """Resolve a Slack user, creating an account on first contact"""
+        identity = self.get(db, slack_id)
+        if identity is None:
+            # Auto-create user (in production, get details from Slack API)
+            user = UserService.create_user(db, UserCreate(
+                email=f"{slack_id}@slack.local",
+                full_name=f"Slack User {slack_id}",
+                teams_user_id=slack_id
+            ))
+            identity = SlackIdentity(user.id, user.role)
+            self._cache.set(slack_id, identity)
+        return identity
+
+    def warm(self, db: Session) -> int:
+        """Preload the newest active Slack-linked users (up to the cache size)"""
+        rows = db.query(User.teams_user_id, User.id, User.role).filter(
+            User.teams_user_id.isnot(None),
+            User.is_active == True
+        ).order_by(User.id.desc()).limit(self._cache.maxsize).all()
+
+        # Oldest first, so the newest users end up most recently used
+        for slack_id, user_id, role in reversed(rows):
+            self._cache.set(slack_id, SlackIdentity(user_id, role))
+        return len(rows)
+
+    def on_user_updated(self, user: User, changes: Dict[str, Tuple], **_) -> None:
+        old_slack_id = changes.get("teams_user_id", (user.teams_user_id,))[0]
+        for slack_id in {old_slack_id, user.teams_user_id}:
+            if slack_id:
+                self._cache.delete(slack_id)
+
+    def on_user_deleted(self, user: User, **_) -> None:
+        if user.teams_user_id:
+            self._cache.delete(user.teams_user_id)
+
+
+slack_identities = SlackIdentityCache(
+    maxsize=settings.SLACK_IDENTITY_CACHE_SIZE,
+    ttl_seconds=settings.SLACK_IDENTITY_CACHE_TTL_SECONDS
+)
+
+event_bus.subscribe("user.updated", slack_identities.on_user_updated)
+event_bus.subscribe("user.deleted", slack_identities.on_user_deleted)
@@ -0,0 +1,208 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.services.events import event_bus
+from app.services.slack_service import SlackService
+from app.utils.helpers import enum_value
+from app.utils.logger import logger
+
+# A digest lists at most this many tickets (Slack section text is capped at 3000 chars)
+MAX_DIGEST_LINES = 20
+
+
+def _label(status: Any) -> str:
+    return str(enum_value(status)).replace("_", " ").title()
+
+
+class _Pending:
+    """Notifications waiting for one recipient, merged per ticket"""
+
+    __slots__ = ("due_at", "items", "received")
+
+    def __init__(self, due_at: float):
+        self.due_at = due_at
+        # (kind, ticket_number) -> item; kind is "status" or "assigned"
+        self.items: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self.received = 0
+
+
+class SlackNotifier:
+    """
+    Coalesced Slack DMs for ticket status changes and assignments
+
+    Notifications are collected per recipient for up to
+    SLACK_NOTIFY_COALESCE_SECONDS, counted from the first one. Status
+    changes of the same ticket merge into one transition chain
+    ("Open → In Progress → Resolved"); when the window closes the
+    recipient gets a single message: the usual notification if only one
+    thing happened, otherwise a digest. A ticket that moves through four
+    statuses in a few minutes costs one API call instead of four.
+    A window of 0 sends every notification straight away.
+
+    DMs for ticket.updated events are off unless SLACK_STATUS_DMS_ENABLED
+    is set; notify_status/notify_assignment can still be called directly.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.received = 0
+        self.sent = 0
+
+    def _add(self, slack_user_id: str, kind: str, ticket_number: str, **fields) -> None:
+        with self._lock:
+            self.received += 1
+            pending = self._pending.get(slack_user_id)
+            if pending is None:
+                pending = self._pending[slack_user_id] = _Pending(time.monotonic() + self.window_seconds)
+            pending.received += 1
+
+            key = (kind, ticket_number)
+            item = pending.items.get(key)
+            if item is None:
+                pending.items[key] = dict(fields, ticket_number=ticket_number)
+            elif kind == "status":
+                item["statuses"].extend(fields["statuses"][1:])
+                item["message"] = fields.get("message") or item.get("message")
+            else:
+                item.update(fields)
+
+        if self.window_seconds <= 0:
+            self.flush(force=True)
+
+    def notify_status(
+        self,
+        slack_user_id: str,
+        ticket_number: str,
+        old_status: Any,
+        new_status: Any,
+        message: Optional[str] = None
+    ) -> None:
+        self._add(
+            slack_user_id, "status", ticket_number,
+            statuses=[enum_value(old_status), enum_value(new_status)],
+            message=message
+        )
+
+    def notify_assignment(self, slack_user_id: str, ticket_number: str, title: str, assigned_by: str) -> None:
+        self._add(slack_user_id, "assigned", ticket_number, title=title, assigned_by=assigned_by)
+
+    def _send(self, slack_user_id: str, items: List[Dict[str, Any]]) -> None:
+        if len(items) == 1:
+            item = items[0]
+            if "statuses" in item:
+                statuses = item["statuses"]
+                if len(statuses) == 2:
+                    SlackService.send_status_update_notification(
+                        slack_user_id, item["ticket_number"], statuses[0], statuses[1], item.get("message")
+                    )
+                    return
+            else:
+                SlackService.send_assignment_notification(
+                    slack_user_id, item["ticket_number"], item["title"], item["assigned_by"]
+                )
+                return
+
+        lines = []
+        for item in items[:MAX_DIGEST_LINES]:
+            if "statuses" in item:
+                chain = " → ".join(_label(status) for status in item["statuses"])
+                lines.append(f"• *{item['ticket_number']}*: {chain}")
+            else:
+                lines.append(f"• 🎯 *{item['ticket_number']}* assigned to you: {item['title']} (by {item['assigned_by']})")
+        if len(items) > MAX_DIGEST_LINES:
+            lines.append(f"…and {len(items) - MAX_DIGEST_LINES} more")
+        count = len(items)
+        SlackService.send_digest_notification(
+            slack_user_id,
+            f"🔔 *{count} ticket update{'s' if count != 1 else ''}*",
+            lines
+        )
+
+    def flush(self, force: bool = False) -> int:
+        """Send every digest whose window has closed (all of them with force); returns messages sent"""
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                (slack_user_id, list(pending.items.values()))
+                for slack_user_id, pending in self._pending.items()
+                if force or pending.due_at <= now
+            ]
+            for slack_user_id, _ in due:
+                del self._pending[slack_user_id]
+            self.sent += len(due)
+
+        for slack_user_id, items in due:
+            try:
+                self._send(slack_user_id, items)
+            except Exception:
+                logger.exception(f"Sending Slack notifications to {slack_user_id} failed")
+        return len(due)
+
+    # -- event wiring --
+
+    def on_ticket_updated(
+        self,
+        ticket: Ticket,
+        changes: Dict[str, tuple],
+        owner_slack_id: Optional[str] = None,
+        assignee_slack_id: Optional[str] = None,
+        actor_name: Optional[str] = None,
+        **_
+    ) -> None:
+        # Recipients come with the event: nothing here touches the publisher's session
+        if not settings.SLACK_STATUS_DMS_ENABLED or not settings.SLACK_BOT_TOKEN:
+            return
+
+        if "status" in changes and owner_slack_id:
+            old_status, new_status = changes["status"]
+            self.notify_status(owner_slack_id, ticket.ticket_number, old_status, new_status)
+
+        if "assigned_to_id" in changes and assignee_slack_id:
+            self.notify_assignment(assignee_slack_id, ticket.ticket_number, ticket.title, actor_name or "IT Support")
+
+    # -- lifecycle --
+
+    def _run(self) -> None:
+        tick = min(1.0, max(self.window_seconds / 4, 0.05))
+        while not self._stop.wait(tick):
+            self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flusher thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="slack-notify-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and send whatever is still pending"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush(force=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waiting = sum(pending.received for pending in self._pending.values())
+            recipients = len(self._pending)
+        return {
+            "window_seconds": self.window_seconds,
+            "received": self.received,
+            "sent": self.sent,
+            "waiting": waiting,
+            "waiting_recipients": recipients,
+            "coalesced": self.received - self.sent - waiting
+        }
+
+
+slack_notifier = SlackNotifier(window_seconds=settings.SLACK_NOTIFY_COALESCE_SECONDS)
+
+event_bus.subscribe("ticket.updated", slack_notifier.on_ticket_updated)
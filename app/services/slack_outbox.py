@@ -0,0 +1,277 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+import httpx
+from app.core.config import settings
+from app.services.http_transport import http_transport
+from app.utils.logger import logger
+from app.utils.metrics import histogram
+from app.utils.rate_limit import TokenBucket
+
+SLACK_API_URL = "https://slack.com/api/"
+
+# Requests per minute of Slack's Web API rate-limit tiers
+TIER_PER_MINUTE = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Tier of each method we call; unlisted methods are treated as tier 3
+METHOD_TIERS = {
+    "chat.postMessage": 4,
+    "chat.postEphemeral": 4,
+    "chat.update": 3,
+    "conversations.open": 3,
+    "users.info": 4,
+}
+
+# Longest wait between retries of a failed delivery
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class OutboundMessage:
+    __slots__ = ("method", "payload", "channel", "enqueued_at", "attempts")
+
+    def __init__(self, method: str, payload: Dict[str, Any]):
+        self.method = method
+        self.payload = payload
+        self.channel = payload.get("channel")
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+
+class SlackOutbox:
+    """
+    Asynchronous, rate-limited queue for outbound Slack Web API calls
+
+    Callers on any thread enqueue and return at once; a worker task on
+    the application's event loop delivers messages through the shared
+    integration transport (http_transport). Before each call it takes a token from the
+    method's bucket (sized from Slack's rate-limit tier) and from the
+    channel's bucket (Slack allows about one message per second per
+    channel), so a notification storm is spread out instead of throttled.
+    A message that has to wait is parked in a time-ordered heap without
+    holding up messages for other channels.
+
+    HTTP 429 pauses the method for the Retry-After period and requeues
+    the message; network errors and 5xx responses are retried with
+    exponential backoff up to SLACK_OUTBOX_MAX_RETRIES times. Queue
+    depth and counters are in stats(); enqueue-to-delivery latency is the
+    "slack.outbound.delivery" histogram.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        concurrency: int,
+        max_retries: int,
+        channel_rate: float,
+        channel_burst: int
+    ):
+        self.max_size = max_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+
+        # Thread-safe hand-off from callers; everything below is loop-only
+        self._incoming: Deque[OutboundMessage] = deque()
+        self._incoming_lock = threading.Lock()
+        self._scheduled: List[Tuple[float, int, OutboundMessage]] = []
+        self._sequence = itertools.count()
+        self._method_buckets: Dict[str, TokenBucket] = {}
+        self._channel_buckets: Dict[str, TokenBucket] = {}
+        self._in_flight: Set[asyncio.Task] = set()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.retried = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._incoming) + len(self._scheduled) + len(self._in_flight)
+
+    def enqueue(self, method: str, payload: Dict[str, Any]) -> bool:
+        """Queue a Web API call (safe from any thread); False when the queue is full"""
+        with self._incoming_lock:
+            if self.depth >= self.max_size:
+                self.dropped += 1
+                return False
+            self._incoming.append(OutboundMessage(method, payload))
+            self.enqueued += 1
+
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+        return True
+
+    # -- worker (event loop only) --
+
+    def _buckets(self, message: OutboundMessage) -> List[TokenBucket]:
+        buckets = []
+        bucket = self._method_buckets.get(message.method)
+        if bucket is None:
+            per_minute = TIER_PER_MINUTE[METHOD_TIERS.get(message.method, 3)]
+            # Allow a short burst of a tenth of the per-minute budget
+            bucket = self._method_buckets[message.method] = TokenBucket(per_minute / 60, max(1, per_minute // 10))
+        buckets.append(bucket)
+        if message.channel:
+            bucket = self._channel_buckets.get(message.channel)
+            if bucket is None:
+                bucket = self._channel_buckets[message.channel] = TokenBucket(self.channel_rate, self.channel_burst)
+            buckets.append(bucket)
+        return buckets
+
+    def _schedule(self, message: OutboundMessage, ready_at: float) -> None:
+        heapq.heappush(self._scheduled, (ready_at, next(self._sequence), message))
+
+    async def _run(self) -> None:
+        while True:
+            with self._incoming_lock:
+                while self._incoming:
+                    message = self._incoming.popleft()
+                    self._schedule(message, message.enqueued_at)
+
+            now = time.monotonic()
+            if not self._scheduled or self._scheduled[0][0] > now:
+                timeout = self._scheduled[0][0] - now if self._scheduled else None
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, message = heapq.heappop(self._scheduled)
+            buckets = self._buckets(message)
+            wait = max(bucket.wait_time(now) for bucket in buckets)
+            if wait > 0:
+                self._schedule(message, now + wait)
+                continue
+            for bucket in buckets:
+                bucket.consume(now)
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._deliver(message))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    def _retry(self, message: OutboundMessage, error: str) -> None:
+        message.attempts += 1
+        if message.attempts > self.max_retries:
+            self.failed += 1
+            logger.warning(f"Slack {message.method} to {message.channel} failed after {message.attempts} attempts: {error}")
+            return
+        self.retried += 1
+        backoff = min(MAX_BACKOFF_SECONDS, 2 ** (message.attempts - 1))
+        self._schedule(message, time.monotonic() + backoff * random.uniform(1.0, 1.5))
+
+    async def _deliver(self, message: OutboundMessage) -> None:
+        started = time.perf_counter()
+        try:
+            response = await http_transport.request(
+                "POST",
+                SLACK_API_URL + message.method,
+                json=message.payload,
+                headers={"Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}"}
+            )
+        except httpx.HTTPError as e:
+            self._retry(message, f"{e.__class__.__name__}: {e}")
+            return
+        finally:
+            self._slots.release()
+            histogram("slack.outbound.request").observe(time.perf_counter() - started)
+            self._wake.set()
+
+        if response.status_code == 429:
+            self.rate_limited += 1
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            resume_at = time.monotonic() + retry_after
+            self._buckets(message)[0].pause_until(resume_at)
+            self._schedule(message, resume_at)
+            return
+
+        if response.status_code >= 500:
+            self._retry(message, f"HTTP {response.status_code}")
+            return
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"ok": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
+
+        if not body.get("ok"):
+            # Slack API errors (channel_not_found, invalid_auth, ...) won't succeed on retry
+            self.failed += 1
+            logger.warning(f"Slack {message.method} to {message.channel} rejected: {body.get('error')}")
+            return
+
+        self.delivered += 1
+        histogram("slack.outbound.delivery").observe(time.monotonic() - message.enqueued_at)
+
+    # -- lifecycle --
+
+    async def start(self) -> None:
+        """Start the delivery worker on the running event loop (after http_transport)"""
+        if self._worker is not None and not self._worker.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._worker = asyncio.create_task(self._run())
+        # Messages queued before startup are picked up on the first pass
+        self._wake.set()
+
+    async def stop(self, drain_seconds: float = 5.0) -> None:
+        """Give queued messages up to drain_seconds to go out, then stop"""
+        if self._worker is None:
+            return
+        deadline = time.monotonic() + drain_seconds
+        while self.depth and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self.depth:
+            logger.warning(f"Slack outbox stopped with {self.depth} undelivered messages")
+        self._worker = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.depth,
+            "scheduled": len(self._scheduled),
+            "in_flight": len(self._in_flight),
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "dropped": self.dropped
+        }
+
+
+slack_outbox = SlackOutbox(
+    max_size=settings.SLACK_OUTBOX_MAX_SIZE,
+    concurrency=settings.SLACK_OUTBOX_CONCURRENCY,
+    max_retries=settings.SLACK_OUTBOX_MAX_RETRIES,
+    channel_rate=settings.SLACK_CHANNEL_RATE_PER_SECOND,
+    channel_burst=settings.SLACK_CHANNEL_BURST
+)
@@ -1,22 +1,22 @@
-import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from app.core.config import settings
+from app.services.http_transport import http_transport
+from app.services.slack_outbox import slack_outbox
 
 
 class SlackService:
     
     @staticmethod
     def send_message(channel: str, text: str, blocks: Optional[list] = None) -> Dict[str, Any]:
-        """Send a message to Slack channel or user"""
+        """
+        Send a message to Slack channel or user
+        
+        The message is queued on the outbound Slack queue (see slack_outbox)
+        and delivered in the background, so this never blocks on Slack.
+        """
         if not settings.SLACK_BOT_TOKEN:
             return {"ok": False, "error": "Slack token not configured"}
         
-        url = "https://slack.com/api/chat.postMessage"
-        headers = {
-            "Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "channel": channel,
             "text": text
@@ -25,9 +25,22 @@ class SlackService:
         if blocks:
             payload["blocks"] = blocks
         
+        if not slack_outbox.enqueue("chat.postMessage", payload):
+            return {"ok": False, "error": "Outbound Slack queue is full"}
+        return {"ok": True, "queued": True}
+    
+    @staticmethod
+    def post_response(response_url: str, message: Union[Dict[str, Any], bytes]) -> Dict[str, Any]:
+        """Post a deferred reply (a dict or serialized JSON) to a slash command's response_url"""
+        if isinstance(message, bytes):
+            body = {"content": message, "headers": {"Content-Type": "application/json"}}
+        else:
+            body = {"json": message}
         try:
-            response = requests.post(url, json=payload, headers=headers)
-            return response.json()
+            response = http_transport.request_sync("POST", response_url, timeout=10, **body)
+            if response.status_code == 200:
+                return {"ok": True}
+            return {"ok": False, "error": f"HTTP {response.status_code}: {response.text}"}
         except Exception as e:
             return {"ok": False, "error": str(e)}
     
@@ -155,3 +168,17 @@ class SlackService:
             channel=slack_user_id,
             text=text
         )
+    
+    @staticmethod
+    def send_digest_notification(
+        slack_user_id: str,
+        heading: str,
+        lines: List[str]
+    ) -> Dict[str, Any]:
+        """Send several coalesced ticket notifications as one message"""
+        text = heading + "\n\n" + "\n".join(lines)
+        
+        return SlackService.send_message(
+            channel=slack_user_id,
+            text=text
+        )
@@ -0,0 +1,77 @@
+import json
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.services.events import event_bus
+from app.services.ticket_service import TicketService
+from app.utils.cache import TTLCache
+
+# Kinds of card rendered per ticket ("status" for /status, "detail" for the view_ticket button)
+CARD_KINDS = ("status", "detail")
+
+# Lock stripes: fills and invalidations of the same ticket number serialize
+LOCK_STRIPES = 16
+
+
+class SlackTicketCards:
+    """
+    Ready-to-send Slack payloads per ticket number
+
+    /status and the view_ticket button look the same tickets up over and
+    over while an incident is discussed in a busy channel. The rendered
+    payload is cached as serialized JSON, keyed by (kind, ticket_number),
+    so a repeat lookup costs neither a query nor Block Kit rendering.
+
+    "ticket.updated" events (published by TicketService after commit)
+    drop both cards of the ticket. A fill holds the ticket number's lock
+    stripe from query to store and the invalidation takes the same
+    stripe, so a card rendered from pre-update data can't outlive the
+    invalidation. Unknown ticket numbers are not cached.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._cache = TTLCache("slack_ticket_cards", maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _lock(self, ticket_number: str) -> threading.Lock:
+        return self._locks[zlib.crc32(ticket_number.encode()) % LOCK_STRIPES]
+
+    def get(
+        self,
+        db: Session,
+        ticket_number: str,
+        kind: str,
+        render: Callable[[Ticket], Dict[str, Any]]
+    ) -> Optional[bytes]:
+        """Serialized payload for a ticket, rendering it on a miss; None if the ticket doesn't exist"""
+        key = (kind, ticket_number)
+        card = self._cache.get(key)
+        if card is not None:
+            return card
+
+        with self._lock(ticket_number):
+            ticket = TicketService.get_ticket_by_number(db, ticket_number)
+            if not ticket:
+                return None
+            card = json.dumps(render(ticket)).encode()
+            self._cache.set(key, card)
+        return card
+
+    def invalidate(self, ticket_number: str) -> None:
+        with self._lock(ticket_number):
+            for kind in CARD_KINDS:
+                self._cache.delete((kind, ticket_number))
+
+    def on_ticket_updated(self, ticket: Ticket, **_) -> None:
+        self.invalidate(ticket.ticket_number)
+
+
+slack_ticket_cards = SlackTicketCards(
+    maxsize=settings.SLACK_TICKET_CARD_CACHE_SIZE,
+    ttl_seconds=settings.SLACK_TICKET_CARD_CACHE_TTL_SECONDS
+)
+
+event_bus.subscribe("ticket.updated", slack_ticket_cards.on_ticket_updated)
@@ -5,7 +5,14 @@ from typing import Optional, List
 from app.models.ticket import Ticket, TicketStatus, TicketPriority, TicketCategory
 from app.models.ticket_activity import TicketActivity, ActivityType
 from app.models.sla_policy import SLAPolicy
+from app.models.change_log import ChangeLog, record_bulk_changes
+from app.models.ticket_link import TicketLink, TicketLinkType
+from app.models.user import User
 from app.schemas.ticket import TicketCreate, TicketUpdate, TicketStatusUpdate, CommentCreate
+from app.core.config import settings
+from app.services.events import event_bus
+from app.services.similar_ticket_index import similar_tickets
+from app.services.duplicate_detector import duplicate_detector
 
 
 class TicketService:
@@ -82,6 +89,11 @@ class TicketService:
         db.add(activity)
         db.commit()
         
+        # Every new ticket, whichever channel it came from, is checked and indexed
+        ticket.duplicate_of = TicketService.detect_duplicate(db, ticket)
+        
+        event_bus.publish("ticket.created", ticket=ticket)
+        
         return ticket
     
     @staticmethod
@@ -138,6 +150,30 @@ class TicketService:
         
         return tickets, total
     
+    @staticmethod
+    def _people(db: Session, ticket: Ticket, changes: dict, actor_id: Optional[int] = None) -> dict:
+        """
+        Slack IDs and names that ticket.updated subscribers may address
+        
+        Read by the publisher in one query, so subscribers (e.g. the Slack
+        notifier) never lazy-load users through the ticket's session.
+        """
+        if "status" not in changes and "assigned_to_id" not in changes:
+            return {}
+        ids = {ticket.user_id, ticket.assigned_to_id, actor_id} - {None}
+        users = {
+            row.id: row
+            for row in db.query(User.id, User.teams_user_id, User.full_name).filter(User.id.in_(ids))
+        }
+        owner = users.get(ticket.user_id)
+        assignee = users.get(ticket.assigned_to_id)
+        actor = users.get(actor_id)
+        return {
+            "owner_slack_id": owner.teams_user_id if owner else None,
+            "assignee_slack_id": assignee.teams_user_id if assignee else None,
+            "actor_name": actor.full_name if actor else None
+        }
+    
     @staticmethod
     def update_ticket(
         db: Session,
@@ -177,6 +213,14 @@ class TicketService:
                 db.add(activity)
             
             db.commit()
+            
+            changes = {field: (old, new) for field, old, new in changes}
+            event_bus.publish(
+                "ticket.updated",
+                ticket=ticket,
+                changes=changes,
+                **TicketService._people(db, ticket, changes, user_id)
+            )
         
         return ticket
     
@@ -216,6 +260,14 @@ class TicketService:
         db.add(activity)
         db.commit()
         
+        changes = {"status": (old_status, ticket.status)}
+        event_bus.publish(
+            "ticket.updated",
+            ticket=ticket,
+            changes=changes,
+            **TicketService._people(db, ticket, changes, user_id)
+        )
+        
         return ticket
     
     @staticmethod
@@ -231,6 +283,7 @@ class TicketService:
             return None
         
         old_assignee = ticket.assigned_to_id
+        old_status = ticket.status
         ticket.assigned_to_id = assigned_to_id
         
         # Update status to in_progress if it was open
@@ -252,6 +305,16 @@ class TicketService:
         db.add(activity)
         db.commit()
         
+        changes = {"assigned_to_id": (old_assignee, assigned_to_id)}
+        if ticket.status != old_status:
+            changes["status"] = (old_status, ticket.status)
+        event_bus.publish(
+            "ticket.updated",
+            ticket=ticket,
+            changes=changes,
+            **TicketService._people(db, ticket, changes, user_id)
+        )
+        
         return ticket
     
     @staticmethod
@@ -273,6 +336,8 @@ class TicketService:
         db.commit()
         db.refresh(activity)
         
+        event_bus.publish("ticket.commented", ticket_id=ticket_id, activity=activity)
+        
         return activity
     
     @staticmethod
@@ -292,8 +357,18 @@ class TicketService:
         if not ticket:
             return False
         
+        old_status = ticket.status
         ticket.status = TicketStatus.CANCELLED
         db.commit()
+        
+        if old_status != TicketStatus.CANCELLED:
+            changes = {"status": (old_status, TicketStatus.CANCELLED)}
+            event_bus.publish(
+                "ticket.updated",
+                ticket=ticket,
+                changes=changes,
+                **TicketService._people(db, ticket, changes)
+            )
         return True
     
     @staticmethod
@@ -309,6 +384,12 @@ class TicketService:
         if not ticket:
             return None
         
+        changes = {
+            field: (getattr(ticket, field), value)
+            for field, value in (("category", category), ("priority", priority))
+            if getattr(ticket, field) != value
+        }
+        
         ticket.category = category
         ticket.priority = priority
         ticket.ai_classification = f"{category.value}_{priority.value}"
@@ -320,4 +401,225 @@ class TicketService:
         db.commit()
         db.refresh(ticket)
         
+        changes["ai_classification"] = (None, ticket.ai_classification)
+        event_bus.publish("ticket.updated", ticket=ticket, changes=changes)
+        
         return ticket
+    
+    @staticmethod
+    def get_changes(
+        db: Session,
+        since: int = 0,
+        limit: int = 500
+    ) -> dict:
+        """
+        Get tickets and activities changed after a change-log cursor
+        
+        Returns {cursor, has_more, tickets, activities}. Each row appears
+        once with its current state, however often it changed. Keep
+        calling with the returned cursor while has_more is true.
+        """
+        entries = db.query(
+            ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id
+        ).filter(
+            ChangeLog.seq > since
+        ).order_by(ChangeLog.seq).limit(limit + 1).all()
+        
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        cursor = entries[-1].seq if entries else since
+        
+        ticket_ids = {e.entity_id for e in entries if e.entity == "ticket"}
+        activity_ids = {e.entity_id for e in entries if e.entity == "activity"}
+        
+        tickets = db.query(
+            Ticket.id, Ticket.ticket_number, Ticket.title, Ticket.status,
+            Ticket.priority, Ticket.category, Ticket.assigned_to_id, Ticket.updated_at
+        ).filter(Ticket.id.in_(ticket_ids)).order_by(Ticket.id).all() if ticket_ids else []
+        
+        activities = db.query(
+            TicketActivity.id, TicketActivity.ticket_id, TicketActivity.user_id,
+            TicketActivity.activity_type, TicketActivity.description, TicketActivity.created_at
+        ).filter(TicketActivity.id.in_(activity_ids)).order_by(TicketActivity.id).all() if activity_ids else []
+        
+        return {
+            "cursor": cursor,
+            "has_more": has_more,
+            "tickets": [row._asdict() for row in tickets],
+            "activities": [
+                {**row._asdict(), "activity_type": row.activity_type.value}
+                for row in activities
+            ]
+        }
+    
+    @staticmethod
+    def find_similar(
+        db: Session,
+        ticket: Ticket,
+        limit: int = 5
+    ) -> List[tuple]:
+        """Resolved/closed tickets similar to a ticket as (ticket, score), best first"""
+        ranked = similar_tickets.similar(
+            db,
+            ticket,
+            limit=limit,
+            min_score=settings.SIMILAR_TICKETS_MIN_SCORE
+        )
+        if not ranked:
+            return []
+        
+        ids = [ticket_id for ticket_id, _ in ranked]
+        tickets = db.query(Ticket).filter(Ticket.id.in_(ids)).all()
+        by_id = {t.id: t for t in tickets}
+        
+        return [(by_id[ticket_id], score) for ticket_id, score in ranked if ticket_id in by_id]
+    
+    @staticmethod
+    def detect_duplicate(db: Session, ticket: Ticket) -> Optional[dict]:
+        """
+        Check a newly created ticket against recent active tickets
+        
+        Called by create_ticket; the result is kept on ticket.duplicate_of.
+        Returns {id, ticket_number, score, linked} for the likely original,
+        or None. Matches above TICKET_DUPLICATE_LINK_THRESHOLD are linked
+        (ticket_links + activity) right away; weaker ones are only flagged.
+        """
+        match = duplicate_detector.check(db, ticket)
+        if not match:
+            return None
+        
+        original_id, score = match
+        original = db.query(Ticket).filter(Ticket.id == original_id).first()
+        if not original:
+            return None
+        
+        linked = score >= settings.TICKET_DUPLICATE_LINK_THRESHOLD
+        if linked:
+            db.add(TicketLink(
+                ticket_id=ticket.id,
+                linked_ticket_id=original.id,
+                link_type=TicketLinkType.DUPLICATE,
+                score=score
+            ))
+            db.add(TicketActivity(
+                ticket_id=ticket.id,
+                user_id=ticket.user_id,
+                activity_type=ActivityType.UPDATED,
+                description=f"Linked as a likely duplicate of {original.ticket_number}",
+                new_value=original.ticket_number
+            ))
+            db.commit()
+        
+        return {
+            "id": original.id,
+            "ticket_number": original.ticket_number,
+            "score": score,
+            "linked": linked
+        }
+    
+    @staticmethod
+    def merge_tickets(
+        db: Session,
+        ticket_id: int,
+        duplicate_ids: List[int],
+        user_id: int
+    ) -> Optional[dict]:
+        """
+        Merge duplicate tickets into one
+        
+        In a single transaction, all activities of the duplicates move to
+        the target with one UPDATE, the duplicates are closed with another,
+        and merge links and audit activities are inserted in batches.
+        Returns {ticket, merged_ids, moved_activities}, or None when the
+        target does not exist. Raises ValueError for unknown duplicate ids.
+        """
+        target = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        if not target:
+            return None
+        
+        duplicate_ids = sorted(set(duplicate_ids) - {ticket_id})
+        duplicates = db.query(Ticket.id, Ticket.ticket_number, Ticket.status).filter(
+            Ticket.id.in_(duplicate_ids)
+        ).all()
+        missing = set(duplicate_ids) - {row.id for row in duplicates}
+        if missing:
+            raise ValueError(f"Tickets not found: {', '.join(map(str, sorted(missing)))}")
+        if not duplicate_ids:
+            raise ValueError("No tickets to merge")
+        
+        old_statuses = {row.id: row.status for row in duplicates}
+        now = datetime.now()
+        
+        try:
+            moved_ids = [
+                activity_id for (activity_id,) in db.query(TicketActivity.id).filter(
+                    TicketActivity.ticket_id.in_(duplicate_ids)
+                )
+            ]
+            db.query(TicketActivity).filter(
+                TicketActivity.ticket_id.in_(duplicate_ids)
+            ).update({TicketActivity.ticket_id: ticket_id}, synchronize_session=False)
+            
+            db.query(Ticket).filter(Ticket.id.in_(duplicate_ids)).update({
+                Ticket.status: TicketStatus.CLOSED,
+                Ticket.closed_at: now,
+                Ticket.updated_at: now
+            }, synchronize_session=False)
+            
+            db.query(TicketLink).filter(
+                TicketLink.ticket_id.in_(duplicate_ids),
+                TicketLink.linked_ticket_id == ticket_id
+            ).delete(synchronize_session=False)
+            
+            record_bulk_changes(db, "activity", moved_ids)
+            record_bulk_changes(db, "ticket", duplicate_ids)
+            
+            db.add_all([
+                TicketLink(
+                    ticket_id=row.id,
+                    linked_ticket_id=ticket_id,
+                    link_type=TicketLinkType.MERGED,
+                    created_by_id=user_id
+                )
+                for row in duplicates
+            ])
+            db.add_all([
+                TicketActivity(
+                    ticket_id=row.id,
+                    user_id=user_id,
+                    activity_type=ActivityType.CLOSED,
+                    description=f"Merged into {target.ticket_number}",
+                    old_value=row.status.value,
+                    new_value=TicketStatus.CLOSED.value
+                )
+                for row in duplicates
+            ])
+            db.add(TicketActivity(
+                ticket_id=ticket_id,
+                user_id=user_id,
+                activity_type=ActivityType.UPDATED,
+                description="Merged duplicates: " + ", ".join(row.ticket_number for row in duplicates),
+                new_value=",".join(str(row.id) for row in duplicates)[:255]
+            ))
+            target.updated_at = now
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        db.refresh(target)
+        for duplicate in db.query(Ticket).filter(Ticket.id.in_(duplicate_ids)):
+            changes = {"status": (old_statuses[duplicate.id], TicketStatus.CLOSED)}
+            event_bus.publish(
+                "ticket.updated",
+                ticket=duplicate,
+                changes=changes,
+                **TicketService._people(db, duplicate, changes, user_id)
+            )
+        
+        return {
+            "ticket": target,
+            "merged_ids": duplicate_ids,
+            "moved_activities": len(moved_ids)
+        }
@@ -0,0 +1,271 @@
+import hashlib
+import heapq
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.services.events import event_bus
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import to_naive_local, tokenize, ngrams
+
+WINDOWS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount"""
+
+    def __init__(self, width: int, depth: int):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int32)
+        self._rows = np.arange(depth)
+
+    def indexes(self, item: str) -> np.ndarray:
+        """One column per row, derived from a single 128-bit hash (double hashing)"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.asarray([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Increment an item and return its new estimated count"""
+        cols = self.indexes(item)
+        self.table[self._rows, cols] += count
+        return int(self.table[self._rows, cols].min())
+
+    def estimate(self, item: str, table: Optional[np.ndarray] = None) -> int:
+        table = self.table if table is None else table
+        return int(table[self._rows, self.indexes(item)].min())
+
+
+class TopK:
+    """Bounded set of the k items with the highest estimated counts"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.counts: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def offer(self, item: str, count: int) -> None:
+        if item in self.counts or len(self.counts) < self.k:
+            self.counts[item] = count
+            heapq.heappush(self._heap, (count, item))
+            self._compact()
+            return
+
+        # Lazy deletion: drop heap entries whose count is out of date
+        while self._heap and self.counts.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if self._heap and count > self._heap[0][0]:
+            _, evicted = heapq.heappop(self._heap)
+            del self.counts[evicted]
+            self.counts[item] = count
+            heapq.heappush(self._heap, (count, item))
+
+    def _compact(self) -> None:
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+
+class _Bucket:
+    __slots__ = ("start", "sketch", "top")
+
+    def __init__(self, start: datetime, width: int, depth: int, k: int):
+        self.start = start
+        self.sketch = CountMinSketch(width, depth)
+        self.top = TopK(k)
+
+
+class TopIssuesTracker:
+    """
+    Streaming heavy hitters over ticket title/description n-grams
+
+    Each time bucket (TOP_ISSUES_BUCKET_MINUTES wide) holds its own
+    Count-Min sketch plus a top-k candidate heap, so a ticket update costs
+    O(1) per n-gram and memory is bounded by the number of buckets in a
+    day. A window query sums the bucket sketches with NumPy and re-ranks
+    the union of their candidates.
+
+    The sketches are built from the last day of tickets at startup and
+    follow "ticket.created" in between. Events only reach the process
+    that published them, so every `resync_seconds` the last day is
+    rescanned in the background and swapped in; with several worker
+    processes the counts are exact only up to the last rescan. Events
+    that arrive during a scan are replayed onto the new sketches unless
+    the scan already saw their ticket.
+    """
+
+    def __init__(
+        self,
+        bucket_minutes: int,
+        width: int,
+        depth: int,
+        k: int,
+        max_ngram: int,
+        resync_seconds: int = 300
+    ):
+        self.bucket = timedelta(minutes=bucket_minutes)
+        self.width = width
+        self.depth = depth
+        self.k = k
+        self.max_ngram = max_ngram
+        self.resync_seconds = resync_seconds
+        self._buckets: Deque[_Bucket] = deque()
+        self._lock = threading.Lock()
+        self._build_lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        # Events seen while a scan runs: (ticket id, phrases, time); None when not scanning
+        self._backlog: Optional[List[Tuple[int, set, datetime]]] = None
+        self._resyncer = BackgroundRebuild("top-issues-resync", self.rebuild)
+
+    def _bucket_start(self, at: datetime) -> datetime:
+        epoch = datetime(2000, 1, 1)
+        return at - (at - epoch) % self.bucket
+
+    def _phrases(self, title: Optional[str], description: Optional[str]) -> set:
+        # Count each phrase once per ticket, whatever its repetition
+        phrases = set(ngrams(tokenize(title), self.max_ngram))
+        phrases.update(ngrams(tokenize(description), self.max_ngram))
+        return phrases
+
+    def _add(self, buckets: Deque[_Bucket], phrases: Iterable[str], at: datetime) -> None:
+        start = self._bucket_start(at)
+        horizon = self._bucket_start(datetime.now()) - WINDOWS["day"]
+        if start <= horizon:
+            return
+
+        while buckets and buckets[0].start <= horizon:
+            buckets.popleft()
+
+        bucket = next((b for b in reversed(buckets) if b.start == start), None)
+        if bucket is None:
+            bucket = _Bucket(start, self.width, self.depth, self.k)
+            buckets.append(bucket)
+            if len(buckets) > 1 and buckets[-2].start > start:
+                ordered = sorted(buckets, key=lambda b: b.start)
+                buckets.clear()
+                buckets.extend(ordered)
+
+        for phrase in phrases:
+            bucket.top.offer(phrase, bucket.sketch.add(phrase))
+
+    def rebuild(self, db: Session) -> None:
+        """Rescan the last day of tickets into new sketches, then swap them in"""
+        with self._build_lock:
+            with self._lock:
+                self._backlog = []
+            try:
+                since = datetime.now() - WINDOWS["day"]
+                rows = db.query(
+                    Ticket.id, Ticket.title, Ticket.description, Ticket.created_at
+                ).filter(Ticket.created_at >= since).yield_per(1000)
+                buckets: Deque[_Bucket] = deque()
+                scanned: Set[int] = set()
+                for ticket_id, title, description, created_at in rows:
+                    scanned.add(ticket_id)
+                    created_at = to_naive_local(created_at) or datetime.now()
+                    self._add(buckets, self._phrases(title, description), created_at)
+            except Exception:
+                with self._lock:
+                    self._backlog = None
+                raise
+
+            with self._lock:
+                backlog, self._backlog = self._backlog, None
+                for ticket_id, phrases, at in backlog:
+                    if ticket_id not in scanned:
+                        self._add(buckets, phrases, at)
+                self._buckets = buckets
+                self._built_at = time.monotonic()
+
+    def ensure_built(self, db: Session) -> None:
+        """Build the sketches on first use; start a background resync when one is due"""
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:  # Concurrent first queries build it once
+                    self.rebuild(db)
+        elif time.monotonic() - self._built_at > self.resync_seconds:
+            self._resyncer.trigger()
+
+    def on_ticket_created(self, ticket: Ticket, **_) -> None:
+        phrases = self._phrases(ticket.title, ticket.description)
+        now = datetime.now()
+        with self._lock:
+            if self._backlog is not None:
+                self._backlog.append((ticket.id, phrases, now))
+            if self._built_at is not None:
+                self._add(self._buckets, phrases, now)
+
+    def _window_counts(self, window: timedelta) -> Tuple[Optional[np.ndarray], set]:
+        since = datetime.now() - window
+        buckets = [b for b in self._buckets if b.start + self.bucket > since]
+        if not buckets:
+            return None, set()
+        table = np.sum([b.sketch.table for b in buckets], axis=0)
+        candidates = set()
+        for b in buckets:
+            candidates.update(b.top.counts)
+        return table, candidates
+
+    def top(self, db: Session, window: str = "hour", limit: int = 10) -> List[Dict[str, object]]:
+        """
+        Return the most frequent phrases in a sliding window
+
+        Phrases fully explained by a longer phrase (e.g. "password reset"
+        inside "outlook password reset") are folded into it. Each entry
+        carries the day count and a spike ratio against the day's average
+        rate for the same window length.
+        """
+        self.ensure_built(db)
+
+        with self._lock:
+            table, candidates = self._window_counts(WINDOWS[window])
+            day_table, _ = self._window_counts(WINDOWS["day"])
+            if table is None:
+                return []
+            sketch = self._buckets[-1].sketch
+            scored = sorted(
+                ((sketch.estimate(p, table), p) for p in candidates),
+                key=lambda item: (-item[0], -len(item[1]))
+            )
+            day_counts = {p: sketch.estimate(p, day_table) for _, p in scored[:limit * 5]}
+
+        share = WINDOWS[window] / WINDOWS["day"]
+        results: List[Dict[str, object]] = []
+        for count, phrase in scored:
+            if count < settings.TOP_ISSUES_MIN_COUNT:
+                break
+            if any(
+                f" {phrase} " in f" {r['phrase']} " and count <= r["count"] * 1.25
+                for r in results
+            ):
+                continue
+            day_count = day_counts.get(phrase, count)
+            baseline = max(day_count * share, 1.0)
+            results.append({
+                "phrase": phrase,
+                "count": count,
+                "day_count": day_count,
+                "spike_ratio": round(count / baseline, 2)
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+
+top_issues = TopIssuesTracker(
+    bucket_minutes=settings.TOP_ISSUES_BUCKET_MINUTES,
+    width=settings.TOP_ISSUES_SKETCH_WIDTH,
+    depth=settings.TOP_ISSUES_SKETCH_DEPTH,
+    k=settings.TOP_ISSUES_CANDIDATES,
+    max_ngram=3,
+    resync_seconds=settings.TOP_ISSUES_RESYNC_SECONDS
+)
+
+event_bus.subscribe("ticket.created", top_issues.on_ticket_created)
@@ -0,0 +1,297 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket, TicketStatus, TicketPriority, TicketCategory
+from app.services.events import event_bus
+from app.utils.background import BackgroundRebuild
+from app.utils.helpers import to_naive_local, enum_value
+
+GRANULARITIES = ("hour", "day", "week", "month")
+
+# Dimension name -> ordered list of values (column index in the rollup)
+DIMENSIONS: Dict[str, List[str]] = {
+    "status": [s.value for s in TicketStatus],
+    "category": [c.value for c in TicketCategory],
+    "priority": [p.value for p in TicketPriority],
+}
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _floor_bucket(value: datetime, granularity: str) -> datetime:
+    """Truncate a datetime to the start of its bucket"""
+    value = _floor_hour(value)
+    if granularity == "hour":
+        return value
+    value = value.replace(hour=0)
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())  # ISO weeks start on Monday
+    if granularity == "month":
+        return value.replace(day=1)
+    return value
+
+
+def _next_bucket(value: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return value + timedelta(hours=1)
+    if granularity == "day":
+        return value + timedelta(days=1)
+    if granularity == "week":
+        return value + timedelta(weeks=1)
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+class TicketTrendRollup:
+    """
+    Hourly pre-aggregated ticket creation counts
+
+    Keeps one dense (hours x values) count matrix per dimension, built with
+    a single scan of the last TREND_ROLLUP_DAYS and then maintained from
+    ticket events. It is built at startup and rescanned in the background
+    every TREND_ROLLUP_REFRESH_SECONDS, so queries only read the current
+    matrices. Day/week/month series are resampled from the hourly
+    matrix with np.add.reduceat, so every series comes back gap-filled.
+    Counts are bucketed by creation hour; the status/category/priority
+    split reflects each ticket's current values.
+    """
+
+    def __init__(self, horizon_days: int, refresh_seconds: int):
+        self.horizon_days = horizon_days
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._origin: Optional[datetime] = None
+        self._n_hours = 0
+        self._total: Optional[np.ndarray] = None
+        self._counts: Dict[str, np.ndarray] = {}
+        self._built_at = 0.0
+        # Tickets touched by events while a rebuild scans; None when not rebuilding
+        self._changed_during_rebuild: Optional[Set[int]] = None
+        self._refresher = BackgroundRebuild("ticket-trends-rebuild", self.rebuild)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _is_stale(self, now: datetime) -> bool:
+        if time.monotonic() - self._built_at > self.refresh_seconds:
+            return True
+        return self._hour_index(now) >= self._n_hours
+
+    def ensure_fresh(self, db: Session) -> None:
+        """
+        Build the rollup if it was never built; refresh it in the background
+        if it is expired or out of range (the current one keeps serving)
+        """
+        if self._origin is None:
+            self.rebuild(db)
+        elif self._is_stale(datetime.now()):
+            self._refresher.trigger()
+
+    @staticmethod
+    def _scan(query, origin: datetime) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """Ticket ids, creation hour indexes and dimension value codes of a query's rows"""
+        ids, hours, codes = [], [], {name: [] for name in DIMENSIONS}
+        lookups = {name: {v: i for i, v in enumerate(values)} for name, values in DIMENSIONS.items()}
+        for ticket_id, created_at, status, category, priority in query:
+            created_at = to_naive_local(created_at)
+            if created_at is None:
+                continue
+            ids.append(ticket_id)
+            hours.append(int((created_at - origin).total_seconds() // 3600))
+            codes["status"].append(lookups["status"].get(enum_value(status), 0))
+            codes["category"].append(lookups["category"].get(enum_value(category), 0))
+            codes["priority"].append(lookups["priority"].get(enum_value(priority), 0))
+        return (
+            np.asarray(ids, dtype=np.int64),
+            np.asarray(hours, dtype=np.int64),
+            {name: np.asarray(column, dtype=np.int64) for name, column in codes.items()}
+        )
+
+    @staticmethod
+    def _columns(db: Session):
+        return db.query(Ticket.id, Ticket.created_at, Ticket.status, Ticket.category, Ticket.priority)
+
+    @staticmethod
+    def _accumulate(
+        total: np.ndarray,
+        counts: Dict[str, np.ndarray],
+        hours: np.ndarray,
+        codes: Dict[str, np.ndarray],
+        sign: int
+    ) -> None:
+        """Add (sign=1) or subtract (sign=-1) rows to the rollup matrices in place"""
+        in_range = (hours >= 0) & (hours < len(total))
+        hours = hours[in_range]
+        np.add.at(total, hours, sign)
+        for name in DIMENSIONS:
+            np.add.at(counts[name], (hours, codes[name][in_range]), sign)
+
+    def rebuild(self, db: Session) -> None:
+        """
+        Recompute the hourly rollup from the tickets table, then swap it in
+
+        Tickets touched by events while the scan runs are re-read before
+        the swap, replacing whatever version of them the scan saw.
+        """
+        now_hour = _floor_hour(datetime.now())
+        origin = now_hour - timedelta(days=self.horizon_days)
+        # Leave a day of headroom so new tickets land without a rebuild
+        n_hours = self.horizon_days * 24 + 24 + 1
+
+        with self._lock:
+            self._changed_during_rebuild = set()
+        try:
+            ids, hours, codes = self._scan(
+                self._columns(db).filter(Ticket.created_at >= origin).yield_per(5000), origin
+            )
+            total = np.zeros(n_hours, dtype=np.int32)
+            counts = {name: np.zeros((n_hours, len(values)), dtype=np.int32) for name, values in DIMENSIONS.items()}
+            self._accumulate(total, counts, hours, codes, 1)
+        except Exception:
+            with self._lock:
+                self._changed_during_rebuild = None
+            raise
+
+        with self._lock:
+            changed, self._changed_during_rebuild = self._changed_during_rebuild, None
+            if changed:
+                seen = np.isin(ids, list(changed))
+                self._accumulate(total, counts, hours[seen], {name: c[seen] for name, c in codes.items()}, -1)
+                _, fresh_hours, fresh_codes = self._scan(
+                    self._columns(db).filter(Ticket.id.in_(changed), Ticket.created_at >= origin), origin
+                )
+                self._accumulate(total, counts, fresh_hours, fresh_codes, 1)
+
+            self._origin = origin
+            self._n_hours = n_hours
+            self._total = total
+            self._counts = counts
+            self._built_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Schedule a rebuild; the current rollup serves until it lands"""
+        if self._origin is not None:
+            self._refresher.trigger(rerun=True)
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+
+    def _hour_index(self, value: datetime) -> int:
+        return int((value - self._origin).total_seconds() // 3600)
+
+    def _apply(self, ticket: Ticket, deltas: List[Tuple[Optional[str], str, int]]) -> None:
+        created_at = to_naive_local(ticket.created_at)
+        with self._lock:
+            if self._changed_during_rebuild is not None:
+                self._changed_during_rebuild.add(ticket.id)
+            if self._origin is None or created_at is None:
+                return
+            idx = self._hour_index(created_at)
+            if not 0 <= idx < self._n_hours:
+                return
+            for dimension, value, delta in deltas:
+                if dimension is None:
+                    self._total[idx] += delta
+                    continue
+                try:
+                    col = DIMENSIONS[dimension].index(value)
+                except ValueError:
+                    continue
+                self._counts[dimension][idx, col] += delta
+
+    def on_ticket_created(self, ticket: Ticket, **_) -> None:
+        deltas = [(None, "", 1)]
+        for dimension in DIMENSIONS:
+            deltas.append((dimension, enum_value(getattr(ticket, dimension)), 1))
+        self._apply(ticket, deltas)
+
+    def on_ticket_updated(self, ticket: Ticket, changes: Dict[str, tuple], **_) -> None:
+        deltas = []
+        for dimension in DIMENSIONS:
+            if dimension in changes:
+                old, new = changes[dimension]
+                deltas.append((dimension, enum_value(old), -1))
+                deltas.append((dimension, enum_value(new), 1))
+        if deltas:
+            self._apply(ticket, deltas)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def series(
+        self,
+        db: Session,
+        granularity: str,
+        days: int,
+        group_by: Optional[str] = None
+    ) -> Dict[str, object]:
+        """
+        Return a dense, gap-filled series covering the last `days` days
+
+        Result: {granularity, buckets, total, series} where `series` maps
+        each value of `group_by` to a count array aligned with `buckets`.
+        """
+        self.ensure_fresh(db)
+
+        now = datetime.now()
+        period_start = _floor_bucket(now, "day") - timedelta(days=days - 1)
+        start = _floor_bucket(period_start, granularity)
+
+        buckets = []
+        cursor = start
+        while cursor <= now:
+            buckets.append(cursor)
+            cursor = _next_bucket(cursor, granularity)
+        end = cursor
+
+        with self._lock:
+            first = self._hour_index(start)
+            last = self._hour_index(end)
+            total = self._window(self._total[:, None], first, last)
+            grouped = self._window(self._counts[group_by], first, last) if group_by else None
+
+        offsets = np.asarray(
+            [self._hour_index(b) - first for b in buckets], dtype=np.int64
+        )
+        total_series = np.add.reduceat(total, offsets, axis=0)[:, 0]
+
+        result = {
+            "granularity": granularity,
+            "buckets": [b.isoformat() for b in buckets],
+            "total": total_series.tolist(),
+            "series": {},
+        }
+        if grouped is not None:
+            resampled = np.add.reduceat(grouped, offsets, axis=0)
+            result["series"] = {
+                value: resampled[:, i].tolist()
+                for i, value in enumerate(DIMENSIONS[group_by])
+            }
+        return result
+
+    def _window(self, matrix: np.ndarray, first: int, last: int) -> np.ndarray:
+        """Slice hours [first, last) from a rollup matrix, zero-padding outside it"""
+        window = np.zeros((last - first, matrix.shape[1]), dtype=np.int64)
+        lo, hi = max(first, 0), min(last, self._n_hours)
+        if lo < hi:
+            window[lo - first:hi - first] = matrix[lo:hi]
+        return window
+
+
+ticket_trends = TicketTrendRollup(
+    horizon_days=settings.TREND_ROLLUP_DAYS,
+    refresh_seconds=settings.TREND_ROLLUP_REFRESH_SECONDS
+)
+
+event_bus.subscribe("ticket.created", ticket_trends.on_ticket_created)
+event_bus.subscribe("ticket.updated", ticket_trends.on_ticket_updated)
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.events import event_bus
 
 
 class UserService:
@@ -77,12 +78,19 @@ class UserService:
         
         update_data = user_update.model_dump(exclude_unset=True)
         
+        changes = {}
         for field, value in update_data.items():
+            old_value = getattr(user, field)
+            if old_value != value:
+                changes[field] = (old_value, value)
             setattr(user, field, value)
         
         db.commit()
         db.refresh(user)
         
+        if changes:
+            event_bus.publish("user.updated", user=user, changes=changes)
+        
         return user
     
     @staticmethod
@@ -94,6 +102,8 @@ class UserService:
         
         user.is_active = False
         db.commit()
+        
+        event_bus.publish("user.deleted", user=user)
         return True
     
     @staticmethod
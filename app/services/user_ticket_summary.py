@@ -0,0 +1,189 @@
+import threading
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ticket import Ticket, TicketStatus
+from app.services.events import event_bus
+from app.utils.cache import TTLCache
+from app.utils.helpers import enum_value
+
+# Tickets the employee is still waiting on
+OPEN_STATUSES = {
+    TicketStatus.OPEN.value,
+    TicketStatus.IN_PROGRESS.value,
+    TicketStatus.WAITING_ON_USER.value
+}
+WAITING_STATUS = TicketStatus.WAITING_ON_USER.value
+
+# Length of the cached recent-tickets list
+RECENT_LIMIT = 5
+
+# Fields of a ticket kept in the recent list
+RECENT_FIELDS = ("id", "ticket_number", "title", "status", "priority", "created_at")
+
+# Loads of one summary retried because events kept arriving during them
+MAX_LOAD_ATTEMPTS = 3
+
+
+class _Summary:
+    """One user's counters; mutated only under UserTicketSummaries._lock"""
+
+    __slots__ = ("statuses", "open", "waiting", "recent")
+
+    def __init__(self, statuses: Dict[int, str], recent: List[Dict[str, Any]]):
+        self.statuses = statuses
+        self.open = sum(status in OPEN_STATUSES for status in statuses.values())
+        self.waiting = sum(status == WAITING_STATUS for status in statuses.values())
+        self.recent = recent
+
+    def set_status(self, ticket_id: int, status: str) -> None:
+        old = self.statuses.get(ticket_id)
+        if old == status:
+            return
+        self.statuses[ticket_id] = status
+        self.open += (status in OPEN_STATUSES) - (old in OPEN_STATUSES)
+        self.waiting += (status == WAITING_STATUS) - (old == WAITING_STATUS)
+
+
+def _recent_item(ticket: Any) -> Dict[str, Any]:
+    item = {field: getattr(ticket, field) for field in RECENT_FIELDS}
+    item["status"] = enum_value(item["status"])
+    item["priority"] = enum_value(item["priority"])
+    return item
+
+
+class UserTicketSummaries:
+    """
+    Per-user ticket counters (total, open, waiting) and recent tickets
+
+    /mytickets and user profile views read a user's summary from a
+    bounded TTL/LRU cache instead of counting their tickets. On a miss
+    the user's ticket ids and statuses plus the RECENT_LIMIT newest
+    tickets are loaded once; from then on "ticket.created" and
+    "ticket.updated" events adjust the counters and the recent list in
+    place. Counters are kept per ticket id, so an event that arrives
+    after a concurrent reload already saw the change is a no-op rather
+    than a double count. An event for a user whose summary is still
+    being loaded can't be applied (nothing is cached yet), so it marks
+    that load stale and the snapshot, which may predate the event, is
+    loaded again instead of being cached. The TTL bounds drift from writes that bypass
+    TicketService or happen in another worker process.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._cache = TTLCache("user_ticket_summaries", maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        # Users whose summary is being loaded (number of loads in flight),
+        # and how many of their ticket events arrived during those loads
+        self._loading: Dict[int, int] = {}
+        self._generations: Dict[int, int] = {}
+
+    def _load(self, db: Session, user_id: int) -> _Summary:
+        statuses = {
+            ticket_id: enum_value(status)
+            for ticket_id, status in db.query(Ticket.id, Ticket.status).filter(Ticket.user_id == user_id)
+        }
+        recent = db.query(
+            *(getattr(Ticket, field) for field in RECENT_FIELDS)
+        ).filter(
+            Ticket.user_id == user_id
+        ).order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(RECENT_LIMIT).all()
+        return _Summary(statuses, [_recent_item(row) for row in recent])
+
+    def get(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """
+        Ticket summary of a user: {user_id, total, open, waiting, recent}
+
+        `recent` lists the newest tickets (newest first) as dicts of
+        RECENT_FIELDS.
+        """
+        summary = self._cache.get(user_id)
+        attempts = 0
+        while summary is None:
+            with self._lock:
+                generation = self._generations.get(user_id, 0)
+                self._loading[user_id] = self._loading.get(user_id, 0) + 1
+            loaded = None
+            try:
+                loaded = self._load(db, user_id)
+            finally:
+                with self._lock:
+                    if loaded is not None and self._generations.get(user_id, 0) == generation:
+                        # No event for this user arrived during the load
+                        summary = self._cache.get(user_id)
+                        if summary is None:
+                            summary = loaded
+                            self._cache.set(user_id, summary)
+                    self._loading[user_id] -= 1
+                    if not self._loading[user_id]:
+                        del self._loading[user_id]
+                        self._generations.pop(user_id, None)
+            attempts += 1
+            if summary is None:
+                # The snapshot may predate an event that the handlers could
+                # not apply (nothing was cached yet); load again
+                if attempts >= MAX_LOAD_ATTEMPTS:
+                    # Tickets keep changing under the load; answer without caching
+                    summary = loaded
+                else:
+                    summary = self._cache.get(user_id)
+
+        with self._lock:
+            return {
+                "user_id": user_id,
+                "total": len(summary.statuses),
+                "open": summary.open,
+                "waiting": summary.waiting,
+                "recent": [dict(item) for item in summary.recent]
+            }
+
+    def _touch(self, user_id: int) -> None:
+        """Record an event for a user whose summary is being loaded (under self._lock)"""
+        if user_id in self._loading:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._touch(user_id)
+            self._cache.delete(user_id)
+
+    # -- event wiring --
+
+    def on_ticket_created(self, ticket: Ticket, **_) -> None:
+        with self._lock:
+            self._touch(ticket.user_id)
+            summary = self._cache.get(ticket.user_id)
+            if summary is None:
+                return
+            summary.set_status(ticket.id, enum_value(ticket.status))
+            if all(item["id"] != ticket.id for item in summary.recent):
+                summary.recent.insert(0, _recent_item(ticket))
+                summary.recent.sort(key=lambda item: item["id"], reverse=True)
+                del summary.recent[RECENT_LIMIT:]
+
+    def on_ticket_updated(self, ticket: Ticket, changes: Dict[str, Tuple], **_) -> None:
+        if "user_id" in changes:
+            for user_id in changes["user_id"]:
+                self.invalidate(user_id)
+            return
+
+        with self._lock:
+            self._touch(ticket.user_id)
+            summary = self._cache.get(ticket.user_id)
+            if summary is None:
+                return
+            if "status" in changes:
+                summary.set_status(ticket.id, enum_value(ticket.status))
+            for index, item in enumerate(summary.recent):
+                if item["id"] == ticket.id:
+                    summary.recent[index] = _recent_item(ticket)
+                    break
+
+
+user_ticket_summaries = UserTicketSummaries(
+    maxsize=settings.USER_TICKET_SUMMARY_CACHE_SIZE,
+    ttl_seconds=settings.USER_TICKET_SUMMARY_TTL_SECONDS
+)
+
+event_bus.subscribe("ticket.created", user_ticket_summaries.on_ticket_created)
+event_bus.subscribe("ticket.updated", user_ticket_summaries.on_ticket_updated)
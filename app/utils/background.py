@@ -0,0 +1,61 @@
+import threading
+from typing import Callable, Optional
+from app.database.session import SessionLocal
+from app.utils.logger import logger
+
+
+class BackgroundRebuild:
+    """
+    Single-flight background rebuild of an in-memory index
+
+    `trigger()` starts `build(db)` on a daemon thread with its own
+    session, unless a build is already running, and returns at once.
+    The index keeps serving its current contents until the build swaps
+    the new ones in, so no request thread ever waits for a rebuild.
+    `trigger(rerun=True)` during a build queues one more build after it,
+    for changes the running build may have loaded too early to see.
+    """
+
+    def __init__(self, name: str, build: Callable):
+        self.name = name
+        self._build = build
+        self._lock = threading.Lock()
+        self._busy = False
+        self._rerun = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._busy
+
+    def trigger(self, rerun: bool = False) -> bool:
+        """Start a rebuild unless one is in flight; returns whether one was started"""
+        with self._lock:
+            if self._busy:
+                self._rerun = self._rerun or rerun
+                return False
+            self._busy = True
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                self._rerun = False
+            db = SessionLocal()
+            try:
+                self._build(db)
+            except Exception:
+                logger.exception(f"Background rebuild {self.name} failed")
+            finally:
+                db.close()
+            with self._lock:
+                if not self._rerun:
+                    self._busy = False
+                    return
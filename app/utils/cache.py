@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Every cache registers itself here so /metrics/caches can report on all of them
+CACHE_REGISTRY: Dict[str, "TTLCache"] = {}
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe, bounded LRU cache with per-entry time-to-live
+
+    Keeps hit/miss/eviction counters for monitoring. Values are stored
+    as-is; callers that hand out mutable objects should cache immutable
+    payloads (e.g. serialized JSON bytes).
+
+    A fill that reads `generation` before loading and passes it to
+    `set` is dropped if any entry was invalidated in between, so a value
+    loaded before a write committed can't be cached after the write's
+    invalidation ran.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_fills = 0
+        # Bumped by every delete/clear
+        self._generation = 0
+        CACHE_REGISTRY[name] = self
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        generation: Optional[int] = None
+    ) -> bool:
+        """Store a value; False if `generation` is given and an invalidation happened since"""
+        expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stale_fills += 1
+                return False
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every registered cache, keyed by cache name"""
+    return {name: cache.stats() for name, cache in CACHE_REGISTRY.items()}
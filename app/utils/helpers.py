@@ -0,0 +1,79 @@
+import re
+from datetime import datetime
+from typing import Any, Iterator, List, Optional
+
+
+def to_naive_local(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a datetime to naive local time
+
+    Timestamp columns come back timezone-aware from PostgreSQL and naive
+    from SQLite, while the services compare against naive datetime.now().
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def enum_value(value: Any) -> Any:
+    """Return the raw value of an enum member (or the value itself)"""
+    return getattr(value, "value", value)
+
+
+STOPWORDS = frozenset("""
+a about after again all am an and any are as at be been before being but by can
+cannot could did do does doing don't down during each few for from further had has
+have having he her here hers him his how i i'm if in into is it it's its just me
+more most my no nor not now of off on once only or other our out over own please
+same she should so some such than that the their them then there these they this
+those through to too under until up very was we were what when where which while
+who whom why will with would you your yours hi hello thanks thank help hey asap
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tokenize(text: Optional[str], drop_stopwords: bool = True) -> List[str]:
+    """Lowercase text and split it into word tokens"""
+    if not text:
+        return []
+    tokens = _TOKEN_RE.findall(text.lower())
+    if drop_stopwords:
+        tokens = [t for t in tokens if t not in STOPWORDS]
+    return tokens
+
+
+def ngrams(tokens: List[str], max_n: int = 3) -> Iterator[str]:
+    """Yield all 1..max_n word n-grams of a token list, space-joined"""
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            yield " ".join(tokens[i:i + n])
+
+
+_DOUBLE_CONSONANT_KEEP = set("lsz")
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer (plurals, -ing, -ed, -ly)
+
+    Not a full Porter stemmer: "printing" and "printed" become "print"
+    and "printers" becomes "printer" (-er is kept, so "user" and
+    "server" survive). It must be applied the same way to documents and
+    queries.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "ches", "shes", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ing", "ed", "ly"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in _DOUBLE_CONSONANT_KEEP:
+                word = word[:-1]
+            break
+    return word
@@ -0,0 +1,91 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Sequence
+
+# Every histogram registers itself here so /metrics/latency can report on all of them
+HISTOGRAM_REGISTRY: Dict[str, "LatencyHistogram"] = {}
+_registry_lock = threading.Lock()
+
+# Bucket upper bounds in milliseconds; anything slower lands in the overflow bucket
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """
+    Thread-safe fixed-bucket latency histogram
+
+    Observations are counted into cumulative-style millisecond buckets, so
+    memory is constant however many requests are timed. Percentiles are
+    reported as the upper bound of the bucket that contains them, i.e. they
+    never understate the real latency.
+    """
+
+    def __init__(self, name: str, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        index = bisect.bisect_left(self.buckets_ms, ms)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of a with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def _percentile(self, counts: list, count: int, q: float) -> float:
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return float(self.buckets_ms[index]) if index < len(self.buckets_ms) else round(self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            count, total_ms, max_ms = self.count, self.total_ms, self.max_ms
+
+        buckets = {f"le_{bound}ms": n for bound, n in zip(self.buckets_ms, counts)}
+        buckets["overflow"] = counts[-1]
+        return {
+            "count": count,
+            "mean_ms": round(total_ms / count, 3) if count else 0.0,
+            "p50_ms": self._percentile(counts, count, 0.5) if count else 0.0,
+            "p90_ms": self._percentile(counts, count, 0.9) if count else 0.0,
+            "p99_ms": self._percentile(counts, count, 0.99) if count else 0.0,
+            "max_ms": round(max_ms, 3),
+            "buckets": buckets
+        }
+
+
+def histogram(name: str) -> LatencyHistogram:
+    """Get the histogram registered under name, creating it on first use"""
+    existing = HISTOGRAM_REGISTRY.get(name)
+    if existing is not None:
+        return existing
+    with _registry_lock:
+        return HISTOGRAM_REGISTRY.setdefault(name, LatencyHistogram(name))
+
+
+def latency_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every registered histogram, keyed by name"""
+    return {name: hist.stats() for name, hist in sorted(HISTOGRAM_REGISTRY.items())}
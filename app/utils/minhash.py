@@ -0,0 +1,133 @@
+import zlib
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Union
+import numpy as np
+from app.utils.helpers import tokenize, stem
+
+EMPTY_HASH = np.uint64(0xFFFFFFFF)
+
+_MISSING = object()
+
+
+def shingles(text: Optional[str], size: int = 3) -> np.ndarray:
+    """
+    crc32 hashes of the word shingles of a text
+
+    Words are stemmed with stopwords dropped, so "printers are offline" and
+    "printer offline" share shingles. Texts shorter than `size` words
+    fall back to single words.
+    """
+    words = [stem(token) for token in tokenize(text)]
+    if len(words) < size:
+        grams = words
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.fromiter(
+        {zlib.crc32(gram.encode()) for gram in grams}, dtype=np.uint64
+    )
+
+
+class MinHasher:
+    """
+    MinHash signatures with num_perm multiply-shift hash functions
+
+    Two signatures agree in each position with probability equal to the
+    Jaccard similarity of the underlying shingle sets. Seeded, so
+    signatures are comparable across processes and restarts.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        if not len(hashes):
+            return np.full(self.num_perm, EMPTY_HASH, dtype=np.uint64)
+        # uint64 arithmetic wraps, which is exactly multiply-shift hashing
+        permuted = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing over MinHash signatures
+
+    A signature is cut into `bands` bands of `rows` values; two items
+    become candidates when any band matches exactly. With b bands of r
+    rows, pairs above a Jaccard of roughly (1/b)^(1/r) are very likely
+    to collide. Most buckets hold a single key, so a bucket is stored as
+    the bare key until a second one arrives and as a list (oldest first)
+    after that; band hashes per key are kept as one int64 array.
+    """
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[int, Union[Hashable, List[Hashable]]]] = [{} for _ in range(bands)]
+        self._keys: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def _band_hashes(self, signature: np.ndarray) -> np.ndarray:
+        rows = self.rows
+        return np.fromiter(
+            (hash(signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)),
+            dtype=np.int64,
+            count=self.bands
+        )
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        self.remove(key)
+        band_hashes = self._band_hashes(signature)
+        for buckets, band_hash in zip(self._buckets, band_hashes.tolist()):
+            bucket = buckets.get(band_hash, _MISSING)
+            if bucket is _MISSING:
+                buckets[band_hash] = key
+            elif type(bucket) is list:
+                bucket.append(key)
+            else:
+                buckets[band_hash] = [bucket, key]
+        self._keys[key] = band_hashes
+
+    def remove(self, key: Hashable) -> None:
+        band_hashes = self._keys.pop(key, None)
+        if band_hashes is None:
+            return
+        for buckets, band_hash in zip(self._buckets, band_hashes.tolist()):
+            bucket = buckets.get(band_hash, _MISSING)
+            if type(bucket) is list:
+                if key in bucket:
+                    bucket.remove(key)
+                if len(bucket) == 1:
+                    buckets[band_hash] = bucket[0]
+            elif bucket == key:
+                del buckets[band_hash]
+
+    def candidates(self, signature: np.ndarray, per_bucket: Optional[int] = None) -> Counter:
+        """
+        Keys sharing at least one band with the signature
+
+        Returns {key: number of matching bands}. `per_bucket` caps how many
+        (most recently added) members are taken from any one bucket.
+        """
+        found: Counter = Counter()
+        for buckets, band_hash in zip(self._buckets, self._band_hashes(signature).tolist()):
+            bucket = buckets.get(band_hash, _MISSING)
+            if bucket is _MISSING:
+                continue
+            if type(bucket) is list:
+                found.update(bucket[-per_bucket:] if per_bucket else bucket)
+            else:
+                found[bucket] += 1
+        return found
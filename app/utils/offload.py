@@ -0,0 +1,63 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+import anyio
+from anyio import to_thread
+from app.utils.metrics import histogram
+
+T = TypeVar("T")
+
+
+class ThreadOffloader:
+    """
+    Runs blocking calls from async handlers on a bounded set of threads
+
+    Async routes that touch a synchronous SQLAlchemy Session (or any
+    other blocking API) must not do it on the event loop: each round trip
+    would stall every other request in the worker. `await run(func, ...)`
+    executes func in anyio's worker threads, but at most `size` calls at
+    a time from this offloader, so a burst of one kind of traffic can't
+    take every thread (or database connection) from the rest of the app.
+
+    Time spent waiting for a slot is the "<name>.wait" histogram and the
+    time in the thread is "<name>.run" (see /metrics/latency).
+    """
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_limiter(self) -> anyio.CapacityLimiter:
+        # A limiter belongs to one event loop; a new loop (e.g. in tests) gets a new one
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._loop is not loop:
+            self._limiter = anyio.CapacityLimiter(self.size)
+            self._loop = loop
+        return self._limiter
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call func(*args, **kwargs) in a worker thread and return its result"""
+        queued = time.perf_counter()
+
+        def timed() -> T:
+            started = time.perf_counter()
+            histogram(f"{self.name}.wait").observe(started - queued)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram(f"{self.name}.run").observe(time.perf_counter() - started)
+
+        return await to_thread.run_sync(timed, limiter=self._get_limiter())
+
+    def stats(self) -> Dict[str, Any]:
+        limiter = self._limiter
+        if limiter is None:
+            return {"size": self.size, "busy": 0, "waiting": 0}
+        statistics = limiter.statistics()
+        return {
+            "size": self.size,
+            "busy": statistics.borrowed_tokens,
+            "waiting": statistics.tasks_waiting
+        }
@@ -0,0 +1,46 @@
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter (not thread-safe; use from a single loop/thread)
+
+    Holds up to `capacity` tokens refilled at `rate` tokens per second.
+    `wait_time` tells how long until a token is available without taking
+    one, so a caller can check several buckets before consuming from all
+    of them. `pause_until` empties the bucket until a given time, e.g.
+    when the server answers with Retry-After.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """Seconds until a token can be taken (0 when one is available)"""
+        now = time.monotonic() if now is None else now
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause_until(self, until: float) -> None:
+        self._paused_until = max(self._paused_until, until)
+        self.tokens = 0
+        self._updated = until
@@ -0,0 +1,154 @@
+"""
+Benchmark KB query expansion: recall gain and added latency
+
+Builds a synthetic knowledge base in a throwaway SQLite database, then
+issues queries made from article titles with typos and abbreviations
+(the way users actually type them) and checks whether the intended
+article is in the top 5, with and without expansion.
+
+Usage:
+    python benchmarks/kb_query_expansion.py --articles 2000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "kb_bench.db")
+
+from app.database.base import Base  # noqa: E402 - registers all models
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.models.knowledge_base import KnowledgeBase, KBCategory  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.kb_search_index import kb_search_index  # noqa: E402
+from app.services.kb_query_expansion import kb_query_expander  # noqa: E402
+
+PRODUCTS = [
+    "outlook", "teams", "excel", "sharepoint", "onedrive", "vpn", "printer", "laptop",
+    "monitor", "keyboard", "wireless", "password", "authenticator", "browser", "zoom",
+    "jira", "confluence", "salesforce", "docking", "headset", "scanner", "projector",
+    "firewall", "antivirus", "calendar", "mailbox", "network", "citrix", "webcam", "computer",
+]
+PROBLEMS = [
+    "reset", "crashing", "offline", "freezing", "missing", "locked", "syncing", "slow",
+    "install", "update", "license", "permission", "connection", "configuration", "upgrade",
+    "recovery", "migration", "activation", "certificate", "timeout",
+]
+CONTEXTS = ["office", "remote", "mobile", "desktop", "shared", "guest", "contractor", "manager"]
+
+
+def build_corpus(db, n_articles: int, rng: random.Random):
+    db.query(KnowledgeBase).delete()
+    categories = list(KBCategory)
+    titles = []
+    for i in range(n_articles):
+        product, problem = rng.choice(PRODUCTS), rng.choice(PROBLEMS)
+        context, other = rng.choice(CONTEXTS), rng.choice(PRODUCTS)
+        title = f"{product.title()} {problem} for {context} users #{i}"
+        titles.append((product, problem, context))
+        db.add(KnowledgeBase(
+            title=title,
+            question=f"What do I do when {product} shows {problem} on a {context} {other}?",
+            answer=f"Check the {product} {problem} guide, restart the {other} and contact IT if it persists.",
+            category=rng.choice(categories),
+            keywords=f"{product}, {problem}"
+        ))
+    db.commit()
+    return [(article.id, titles[n]) for n, article in enumerate(db.query(KnowledgeBase).order_by(KnowledgeBase.id))]
+
+
+def typo(word: str, rng: random.Random) -> str:
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(("delete", "transpose", "substitute", "insert"))
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    if edit == "transpose":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if edit == "substitute":
+        return word[:i] + letter + word[i + 1:]
+    return word[:i] + letter + word[i:]
+
+
+def make_queries(corpus, n_queries: int, rng: random.Random):
+    abbreviations = {}
+    for short, expansions in settings.KB_SYNONYMS.items():
+        for expansion in expansions:
+            if " " not in expansion:
+                abbreviations.setdefault(expansion, []).append(short)
+
+    queries = []
+    for _ in range(n_queries):
+        article_id, (product, problem, context) = rng.choice(corpus)
+        words = [product, problem, context]
+        mode = rng.random()
+        if mode < 0.5 or product not in abbreviations:
+            words = [typo(word, rng) if rng.random() < 0.6 else word for word in words]
+        elif mode < 0.75:
+            words[0] = rng.choice(abbreviations[product])
+        else:
+            words[0] = rng.choice(abbreviations[product])
+            words[1] = typo(words[1], rng)
+        queries.append((article_id, " ".join(words)))
+    return queries
+
+
+def run(db, queries, expand: bool):
+    hits, latencies, expand_latencies = 0, [], []
+    for article_id, query in queries:
+        start = time.perf_counter()
+        term_weights = None
+        if expand:
+            term_weights = kb_query_expander.expand(db, query)
+            expand_latencies.append(time.perf_counter() - start)
+        ranked = kb_search_index.search(db, query, limit=5, term_weights=term_weights)
+        latencies.append(time.perf_counter() - start)
+        hits += any(ranked_id == article_id for ranked_id, _ in ranked)
+    return hits / len(queries), latencies, expand_latencies
+
+
+def percentile(values, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KB query expansion benchmark")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        corpus = build_corpus(db, args.articles, rng)
+        queries = make_queries(corpus, args.queries, rng)
+
+        start = time.perf_counter()
+        kb_query_expander.expand(db, "warm up")
+        print(f"index + spelling dictionary build: {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({len(kb_search_index.vocabulary)} words)")
+
+        recall_plain, plain, _ = run(db, queries, expand=False)
+        recall_expanded, expanded, expand_only = run(db, queries, expand=True)
+
+        print(f"{'':>10} {'recall@5':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        print(f"{'plain':>10} {recall_plain:>9.3f} {percentile(plain, 0.5):>8.3f} {percentile(plain, 0.99):>8.3f}")
+        print(f"{'expanded':>10} {recall_expanded:>9.3f} {percentile(expanded, 0.5):>8.3f} {percentile(expanded, 0.99):>8.3f}")
+        print(f"expansion alone: p50 {percentile(expand_only, 0.5):.3f} ms, "
+              f"p99 {percentile(expand_only, 0.99):.3f} ms, mean {statistics.mean(expand_only) * 1000:.3f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
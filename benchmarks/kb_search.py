@@ -0,0 +1,109 @@
+"""
+Benchmark KB search: BM25 query latency over the in-memory index
+
+Builds a synthetic knowledge base in a throwaway SQLite database, indexes
+it, then times searches of 1-4 terms drawn from the corpus vocabulary
+(common product and problem words, so posting lists are long), with and
+without a category filter.
+
+Usage:
+    python benchmarks/kb_search.py --articles 100000 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "kb_search_bench.db")
+
+from app.database.base import Base  # noqa: E402 - registers all models
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.models.knowledge_base import KnowledgeBase, KBCategory  # noqa: E402
+from app.services.kb_search_index import kb_search_index  # noqa: E402
+
+PRODUCTS = [
+    "outlook", "teams", "excel", "sharepoint", "onedrive", "vpn", "printer", "laptop",
+    "monitor", "keyboard", "wireless", "password", "authenticator", "browser", "zoom",
+    "jira", "confluence", "salesforce", "docking", "headset", "scanner", "projector",
+    "firewall", "antivirus", "calendar", "mailbox", "network", "citrix", "webcam", "computer",
+]
+PROBLEMS = [
+    "reset", "crashing", "offline", "freezing", "missing", "locked", "syncing", "slow",
+    "install", "update", "license", "permission", "connection", "configuration", "upgrade",
+    "recovery", "migration", "activation", "certificate", "timeout",
+]
+CONTEXTS = ["office", "remote", "mobile", "desktop", "shared", "guest", "contractor", "manager"]
+
+
+def build_corpus(db, n_articles: int, rng: random.Random) -> None:
+    db.query(KnowledgeBase).delete()
+    categories = list(KBCategory)
+    for i in range(n_articles):
+        product, problem = rng.choice(PRODUCTS), rng.choice(PROBLEMS)
+        context, other = rng.choice(CONTEXTS), rng.choice(PRODUCTS)
+        db.add(KnowledgeBase(
+            title=f"{product.title()} {problem} for {context} users #{i}",
+            question=f"What do I do when {product} shows {problem} on a {context} {other}?",
+            answer=f"Check the {product} {problem} guide, restart the {other} and contact IT if it persists.",
+            category=rng.choice(categories),
+            keywords=f"{product}, {problem}",
+            view_count=rng.randrange(1000),
+            helpful_count=rng.randrange(50)
+        ))
+        if i % 10000 == 9999:
+            db.commit()
+    db.commit()
+
+
+def make_queries(n_queries: int, rng: random.Random):
+    words = PRODUCTS + PROBLEMS + CONTEXTS
+    return [" ".join(rng.sample(words, rng.randint(1, 4))) for _ in range(n_queries)]
+
+
+def run(db, queries, category=None):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        kb_search_index.search(db, query, category=category, limit=10)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def percentile(values, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KB search benchmark")
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        build_corpus(db, args.articles, rng)
+        queries = make_queries(args.queries, rng)
+
+        start = time.perf_counter()
+        kb_search_index.rebuild(db)
+        print(f"index build: {(time.perf_counter() - start) * 1000:.0f} ms ({args.articles} articles)")
+
+        run(db, queries[:50])  # Warm up
+        print(f"{'':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for label, category in (("all", None), ("category", KBCategory.NETWORK.value)):
+            latencies = run(db, queries, category)
+            print(f"{label:>10} {percentile(latencies, 0.5):>8.3f} {percentile(latencies, 0.99):>8.3f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
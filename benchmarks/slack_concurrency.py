@@ -0,0 +1,168 @@
+"""
+Benchmark Slack route throughput under concurrent traffic
+
+Seeds a throwaway SQLite database with users and tickets, then fires a
+mix of Slack traffic at the app in-process (event callbacks, which claim
+their event_id with an INSERT, plus inline /status and /mytickets
+commands) at increasing concurrency. Every SQL statement is delayed by
+--db-latency-ms to stand in for the network round trip to a real
+database server.
+
+Each level runs twice: "on-loop" calls the synchronous Session straight
+from the async handlers (the old behaviour), "offloaded" goes through
+slack_handler_threads. On the loop, throughput stays flat however many
+requests are in flight; offloaded, it grows with concurrency up to
+SLACK_HANDLER_THREADS (or until the process runs out of CPU). On-loop
+levels above the connection pool's capacity are skipped: with more
+requests in flight than connections, the handler blocking the loop
+waits for a connection that only a session teardown (which needs the
+loop) can return, and the worker deadlocks until the pool times out.
+
+Usage:
+    python benchmarks/slack_concurrency.py --requests 400 --concurrency 1,4,16,64
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "slack_bench.db")
+os.environ.pop("SLACK_SIGNING_SECRET", None)
+os.environ.pop("SLACK_BOT_TOKEN", None)
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app.database.base import Base  # noqa: E402 - registers all models
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.ticket import Ticket, TicketCategory, TicketStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.slack_dispatcher import slack_handler_threads  # noqa: E402
+from app.services.slack_ticket_cards import slack_ticket_cards  # noqa: E402
+from app.services.user_ticket_summary import user_ticket_summaries  # noqa: E402
+
+STATUSES = [TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING_ON_USER, TicketStatus.RESOLVED]
+
+
+def seed(db, n_users: int, n_tickets: int, rng: random.Random):
+    db.add_all([
+        User(email=f"user{i}@example.com", full_name=f"User {i}", teams_user_id=f"U{i:05d}", is_active=True)
+        for i in range(n_users)
+    ])
+    db.flush()
+    user_ids = [user_id for (user_id,) in db.query(User.id)]
+    categories = list(TicketCategory)
+    db.add_all([
+        Ticket(
+            ticket_number=f"TKT-2026-{i:05d}",
+            user_id=rng.choice(user_ids),
+            title=f"Benchmark ticket {i}",
+            description="Synthetic ticket for the Slack concurrency benchmark",
+            category=rng.choice(categories),
+            status=rng.choice(STATUSES)
+        )
+        for i in range(n_tickets)
+    ])
+    db.commit()
+
+
+def make_requests(n_requests: int, n_users: int, n_tickets: int, rng: random.Random, run: str):
+    requests = []
+    for i in range(n_requests):
+        slack_user = f"U{rng.randrange(n_users):05d}"
+        kind = rng.random()
+        if kind < 0.4:
+            requests.append(("/slack/events", {"json": {
+                "event_id": f"Ev{run}-{i}",
+                "event": {"type": "message", "user": slack_user, "text": "hello"}
+            }}))
+        elif kind < 0.8:
+            requests.append(("/slack/commands", {"data": {
+                "command": "/status", "text": f"TKT-2026-{rng.randrange(n_tickets):05d}", "user_id": slack_user
+            }}))
+        else:
+            requests.append(("/slack/commands", {"data": {
+                "command": "/mytickets", "text": "", "user_id": slack_user
+            }}))
+    return requests
+
+
+async def drive(requests, concurrency: int):
+    latencies = []
+    pending = iter(requests)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1") as client:
+        async def worker():
+            for path, kwargs in pending:
+                start = time.perf_counter()
+                response = await client.post(path, **kwargs)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path} -> {response.status_code}: {response.text[:200]}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, latencies
+
+
+async def on_loop(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+def percentile(values, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slack route concurrency benchmark")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed(db, args.users, args.tickets, rng)
+    finally:
+        db.close()
+
+    delay = args.db_latency_ms / 1000
+    event.listen(engine, "before_cursor_execute", lambda *_: time.sleep(delay))
+
+    offloaded = slack_handler_threads.run
+    print(f"{args.requests} requests per run, {args.db_latency_ms:g} ms per statement, "
+          f"{slack_handler_threads.size} handler threads")
+    print(f"{'concurrency':>11} {'mode':>10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    pool_capacity = engine.pool.size() + getattr(engine.pool, "_max_overflow", 0)
+    for concurrency in [int(level) for level in args.concurrency.split(",")]:
+        for mode, runner in (("on-loop", on_loop), ("offloaded", offloaded)):
+            if mode == "on-loop" and concurrency > pool_capacity:
+                print(f"{concurrency:>11} {mode:>10} {'deadlock':>8} (more requests than the {pool_capacity} pooled connections)")
+                continue
+            slack_handler_threads.run = runner
+            # Same traffic for both modes, starting from cold result caches
+            requests = make_requests(
+                args.requests, args.users, args.tickets, random.Random(concurrency), f"{mode}-{concurrency}"
+            )
+            slack_ticket_cards._cache.clear()
+            user_ticket_summaries._cache.clear()
+            throughput, latencies = asyncio.run(drive(requests, concurrency))
+            print(f"{concurrency:>11} {mode:>10} {throughput:>8.1f} "
+                  f"{percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.99):>8.2f}")
+    del slack_handler_threads.run
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Export tickets, activities, users or KB articles for BI tools
+
+Streams straight from the database with a server-side cursor, so even
+multi-million row tables export with constant memory.
+
+Usage:
+    python export_data.py tickets --format csv --output tickets.csv
+    python export_data.py activities --format ndjson --since 2026-01-01T00:00:00
+    python export_data.py tickets --format parquet --after-id 250000 --output part2.parquet
+
+The checkpoint printed at the end can be passed as --since next time to
+export only rows created or updated since this run.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from app.database.base import Base  # noqa: F401 - registers all models
+from app.schemas.export import ExportEntity, ExportFormat
+from app.services.export_service import ExportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixora bulk data export")
+    parser.add_argument("entity", choices=[e.value for e in ExportEntity])
+    parser.add_argument("--format", default="ndjson", choices=[f.value for f in ExportFormat])
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only rows changed at/after this ISO timestamp")
+    parser.add_argument("--after-id", type=int, help="Resume after this id")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    export_format = ExportFormat(args.format)
+    if export_format == ExportFormat.PARQUET and not ExportService.parquet_available():
+        parser.error("Parquet export requires the pyarrow package")
+    if export_format == ExportFormat.PARQUET and not args.output:
+        parser.error("Parquet export needs --output")
+
+    checkpoint = datetime.now().isoformat()
+    chunks = ExportService.stream_export(
+        ExportEntity(args.entity),
+        export_format,
+        since=args.since,
+        after_id=args.after_id,
+        batch_size=args.batch_size
+    )
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"✅ Exported {args.entity} ({written:,} bytes)", file=sys.stderr)
+    print(f"Next checkpoint: --since {checkpoint}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Throwaway SQLite database; integrations stay unconfigured so nothing leaves the process
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+for name in ("SLACK_BOT_TOKEN", "SLACK_SIGNING_SECRET", "N8N_WEBHOOK_URL", "N8N_SOLUTION_WEBHOOK_URL"):
+    os.environ[name] = ""
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.database.base import Base  # noqa: E402 - registers all models
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.utils.cache import CACHE_REGISTRY  # noqa: E402
+
+API = "/api/v1"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Every test starts with empty tables and empty caches"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    for cache in CACHE_REGISTRY.values():
+        cache.clear()
+
+
+@pytest.fixture
+def users(db):
+    """An employee (U0) and an IT agent (U1)"""
+    employee = User(email="employee@example.com", full_name="Employee", teams_user_id="U0", role=UserRole.EMPLOYEE, is_active=True)
+    agent = User(email="agent@example.com", full_name="Agent", teams_user_id="U1", role=UserRole.IT_SUPPORT, is_active=True)
+    db.add_all([employee, agent])
+    db.commit()
+    return employee, agent
+
+
+@pytest.fixture
+def kb_article(db):
+    """Factory for KB articles, created through KBService so every index sees them"""
+    from app.schemas.kb import KBCreate
+    from app.services.kb_service import KBService
+
+    def create(title, answer, keywords=None, category="email", question=None):
+        data = KBCreate(
+            title=title,
+            question=question or f"How do I fix this: {title}?",
+            answer=answer,
+            category=category,
+            keywords=keywords
+        )
+        return KBService.create_article(db, data)
+    return create
+
+
+@pytest.fixture
+def new_ticket(db, users):
+    """Factory for tickets, created through TicketService so every event subscriber sees them"""
+    from app.schemas.ticket import TicketCreate
+    from app.services.ticket_service import TicketService
+
+    def create(title="VPN keeps disconnecting", description=None, category="network", user=None):
+        data = TicketCreate(title=title, description=description or f"{title} since this morning", category=category)
+        return TicketService.create_ticket(db, data, (user or users[0]).id)
+    return create
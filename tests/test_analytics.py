@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from app.models.ticket import TicketStatus
+from app.schemas.ticket import TicketCreate, TicketStatusUpdate
+from app.services.analytics_service import ticket_analytics
+from app.services.ticket_service import TicketService
+from conftest import API
+
+
+def seed(db, users):
+    employee, agent = users
+    for title, category in (("VPN drops", "network"), ("Wi-Fi is slow", "network"), ("Outlook crash", "email")):
+        data = TicketCreate(title=title, description=f"{title} since this morning", category=category)
+        TicketService.create_ticket(db, data, employee.id)
+    data = TicketCreate(title="Printer jam", description="Printer jams on every job", category="hardware")
+    ticket = TicketService.create_ticket(db, data, employee.id)
+    TicketService.assign_ticket(db, ticket.id, agent.id, agent.id)
+    TicketService.change_status(db, ticket.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), agent.id)
+    ticket_analytics.rebuild(db)
+
+
+def test_group_by_and_filter(client, db, users):
+    seed(db, users)
+
+    rows = client.post(API + "/metrics/query", json={"group_by": ["category"]}).json()["rows"]
+    assert {row["category"]: row["count"] for row in rows} == {"network": 2, "email": 1, "hardware": 1}
+
+    result = client.post(API + "/metrics/query", json={"filters": {"agent": [users[1].id]}}).json()
+    assert result["matched"] == 1
+    assert result["rows"][0]["resolved"] == 1
+
+    unassigned = client.post(API + "/metrics/query", json={"filters": {"agent": [None]}}).json()
+    assert unassigned["matched"] == 3
+
+
+@pytest.mark.parametrize("filters", [
+    {"agent": ["abc"]},
+    {"user": [None]},
+    {"hour_of_day": [1.5]},
+    {"agent": None},
+    {"category": [3]},
+    {"shoe_size": [42]},
+])
+def test_invalid_filters_are_rejected(client, db, users, filters):
+    response = client.post(API + "/metrics/query", json={"filters": filters})
+    assert response.status_code == 422, response.text
+
+
+def test_queries_are_served_while_a_refresh_loads(client, db, users, monkeypatch):
+    seed(db, users)
+    data = TicketCreate(title="Laptop fan noise", description="Laptop fan is loud all day", category="hardware")
+    TicketService.create_ticket(db, data, users[0].id)
+
+    load = ticket_analytics._load
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_load(*args, **kwargs):
+        loading.set()
+        release.wait(5)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(ticket_analytics, "_load", slow_load)
+    monkeypatch.setattr(ticket_analytics, "refresh_seconds", 0)
+    assert client.post(API + "/metrics/query", json={}).json()["matched"] == 4  # stale: refresh started
+    assert loading.wait(5)
+    assert client.post(API + "/metrics/query", json={}).json()["matched"] == 4  # not blocked by the load
+    release.set()
+    ticket_analytics._refresher.join(5)
+    monkeypatch.undo()
+
+    assert client.post(API + "/metrics/query", json={}).json()["matched"] == 5
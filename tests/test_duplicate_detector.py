@@ -0,0 +1,55 @@
+from app.models.ticket_link import TicketLink
+from app.services.duplicate_detector import duplicate_detector
+from conftest import API
+
+OUTAGE = "Outlook keeps asking for my password after the update this morning"
+
+
+def create(client, title, description, user_id):
+    response = client.post(API + "/tickets/", json={
+        "title": title, "description": description, "category": "email", "user_id": user_id
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_near_duplicate_is_linked_to_the_original(client, db, users):
+    duplicate_detector.rebuild(db)
+    original = create(client, "Outlook password prompt", OUTAGE, users[0].id)
+    copy = create(client, "Outlook password prompt", OUTAGE + " again", users[1].id)
+
+    assert original["duplicate_of"] is None
+    assert copy["duplicate_of"]["id"] == original["id"]
+    assert copy["duplicate_of"]["linked"] is True
+    assert db.query(TicketLink).filter(TicketLink.ticket_id == copy["id"]).count() == 1
+
+
+def test_unrelated_tickets_are_not_flagged(client, db, users):
+    duplicate_detector.rebuild(db)
+    create(client, "Outlook password prompt", OUTAGE, users[0].id)
+    other = create(client, "Printer jammed", "The third floor printer jams on every duplex print job", users[0].id)
+
+    assert other["duplicate_of"] is None
+
+
+def test_stopword_only_tickets_are_never_matched(client, db, users):
+    duplicate_detector.rebuild(db)
+    create(client, "the and of to", "the and of to it is", users[0].id)
+    second = create(client, "the and of to a", "the and of to it is a", users[0].id)
+
+    assert second["duplicate_of"] is None
+    assert db.query(TicketLink).count() == 0
+
+
+def test_tickets_from_slack_mentions_are_checked_and_indexed(client, db, users):
+    from app.api.v1.slack_routes import _mention_ticket_message
+
+    duplicate_detector.rebuild(db)
+    first = _mention_ticket_message(db, "U0", OUTAGE)
+    assert "looks like" not in first["text"]
+
+    # The mention's ticket was indexed: a web ticket is matched against it, and vice versa
+    copy = create(client, OUTAGE, OUTAGE + " again", users[1].id)
+    assert copy["duplicate_of"] is not None
+    second = _mention_ticket_message(db, "U1", OUTAGE)
+    assert "looks like" in second["text"]
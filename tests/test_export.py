@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.services.export_service import ExportService
+from conftest import API
+
+
+def test_ndjson_streams_every_row_in_id_order(client, new_ticket):
+    tickets = [new_ticket(f"Ticket number {i}") for i in range(5)]
+
+    response = client.get(API + "/export/tickets", params={"batch_size": 100})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-disposition"] == 'attachment; filename="tickets.ndjson"'
+    assert [row["id"] for row in rows] == [t.id for t in tickets]
+    assert rows[0]["status"] == "open"
+
+
+def test_csv_has_one_header_and_resumes_after_id(client, new_ticket):
+    tickets = [new_ticket(f"Ticket number {i}") for i in range(3)]
+
+    response = client.get(API + "/export/tickets", params={"format": "csv", "after_id": tickets[0].id})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [t.id for t in tickets[1:]]
+    assert response.text.count("ticket_number") == 1
+
+
+def test_rows_come_in_batches_of_the_requested_size(new_ticket):
+    for i in range(5):
+        new_ticket(f"Ticket number {i}")
+    batches = list(ExportService.iter_rows("tickets", batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_parquet_without_pyarrow_is_a_clear_error(client, monkeypatch):
+    monkeypatch.setattr(ExportService, "parquet_available", staticmethod(lambda: False))
+    response = client.get(API + "/export/users", params={"format": "parquet"})
+    assert response.status_code == 400
+
+
+@pytest.mark.skipif(not ExportService.parquet_available(), reason="pyarrow not installed")
+def test_parquet_round_trips(client, new_ticket):
+    import pyarrow.parquet as pq
+
+    new_ticket()
+    response = client.get(API + "/export/tickets", params={"format": "parquet"})
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 1
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_transport import HTTPTransport
+
+
+def transport(per_host_limit=2) -> HTTPTransport:
+    return HTTPTransport(
+        max_connections=10,
+        max_keepalive_connections=5,
+        keepalive_expiry=30.0,
+        per_host_limit=per_host_limit,
+        connect_timeout=1.0,
+        timeout=5.0
+    )
+
+
+async def started(shared: HTTPTransport, handler) -> None:
+    """Start the transport, then route its shared client through a mock handler"""
+    await shared.start()
+    await shared._client.aclose()
+    shared._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_requests_need_a_started_transport():
+    with pytest.raises(RuntimeError):
+        asyncio.run(transport().request("GET", "https://slack.test/api"))
+
+
+def test_concurrency_is_capped_per_host():
+    shared = transport(per_host_limit=2)
+    active = {"slack.test": 0, "n8n.test": 0}
+    peak = dict(active)
+
+    async def handler(request):
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    async def main():
+        await started(shared, handler)
+        await asyncio.gather(
+            *(shared.request("POST", "https://slack.test/api/chat.postMessage") for _ in range(6)),
+            *(shared.request("POST", "https://n8n.test/webhook") for _ in range(2))
+        )
+        await shared.stop()
+
+    asyncio.run(main())
+    assert peak == {"slack.test": 2, "n8n.test": 2}
+    assert shared.stats()["hosts"]["slack.test"]["requests"] == 6
+
+
+def test_sync_callers_run_on_the_transport_loop():
+    shared = transport()
+
+    async def handler(request):
+        if request.url.path == "/down":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def main():
+        await started(shared, handler)
+        response = await asyncio.to_thread(shared.request_sync, "GET", "https://slack.test/up")
+        with pytest.raises(httpx.ConnectError):
+            await asyncio.to_thread(shared.request_sync, "GET", "https://slack.test/down")
+        with pytest.raises(RuntimeError):
+            shared.request_sync("GET", "https://slack.test/up")
+        await shared.stop()
+        return response
+
+    assert asyncio.run(main()).json() == {"path": "/up"}
+    assert shared.stats()["hosts"]["slack.test"]["errors"] == 1
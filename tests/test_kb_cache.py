@@ -0,0 +1,62 @@
+from app.services.kb_cache import kb_article_cache, kb_collection_cache
+from conftest import API
+
+ANSWER = "Update the VPN client, then reconnect to the office network."
+
+
+def test_article_edits_invalidate_the_cached_response(client, kb_article):
+    article = kb_article("VPN disconnects on Wi-Fi", ANSWER)
+    assert client.get(API + f"/kb/{article.id}").json()["title"] == "VPN disconnects on Wi-Fi"
+    assert kb_article_cache.get(article.id) is not None
+
+    client.patch(API + f"/kb/{article.id}", json={"title": "VPN drops on home Wi-Fi"})
+    assert kb_article_cache.get(article.id) is None
+    assert client.get(API + f"/kb/{article.id}").json()["title"] == "VPN drops on home Wi-Fi"
+
+
+def test_lists_are_rebuilt_after_any_kb_write(client, kb_article):
+    kb_article("VPN disconnects on Wi-Fi", ANSWER)
+    hits = kb_collection_cache.hits
+    assert client.get(API + "/kb/").json()["total"] == 1
+    assert client.get(API + "/kb/").json()["total"] == 1
+    assert kb_collection_cache.hits == hits + 1
+
+    added = kb_article("Outlook password prompt", "Remove cached credentials and sign in again.")
+    assert client.get(API + "/kb/").json()["total"] == 2
+
+    client.delete(API + f"/kb/{added.id}")
+    assert client.get(API + "/kb/").json()["total"] == 1
+    assert kb_article_cache.get(added.id) is None
+
+
+def test_a_fill_loaded_before_an_edit_is_not_cached(client, db, kb_article, monkeypatch):
+    from app.services.kb_service import KBService
+
+    article = kb_article("VPN disconnects on Wi-Fi", ANSWER)
+    get_article = KBService.get_article
+
+    def load_then_edit(session, article_id):
+        loaded = get_article(session, article_id)
+        # The edit commits and invalidates after the GET read the old row
+        client.patch(API + f"/kb/{article_id}", json={"title": "VPN drops on home Wi-Fi"})
+        return loaded
+
+    monkeypatch.setattr(KBService, "get_article", staticmethod(load_then_edit))
+    assert client.get(API + f"/kb/{article.id}").json()["title"] == "VPN disconnects on Wi-Fi"
+    monkeypatch.undo()
+
+    assert kb_article_cache.get(article.id) is None
+    assert client.get(API + f"/kb/{article.id}").json()["title"] == "VPN drops on home Wi-Fi"
+
+
+def test_votes_and_counter_flushes_refresh_the_cached_article(client, kb_article):
+    from app.services.kb_counter_buffer import kb_counter_buffer
+
+    article = kb_article("VPN disconnects on Wi-Fi", ANSWER)
+    client.get(API + f"/kb/{article.id}")
+    client.post(API + f"/kb/{article.id}/helpful", params={"helpful": True})
+    assert kb_article_cache.get(article.id) is None
+    assert client.get(API + f"/kb/{article.id}").json()["helpful_count"] == 1
+
+    kb_counter_buffer.flush()
+    assert kb_article_cache.get(article.id) is None
@@ -0,0 +1,64 @@
+import pytest
+
+from app.models.knowledge_base import KnowledgeBase
+from app.services.kb_counter_buffer import KBCounterBuffer, kb_counter_buffer
+from conftest import API
+
+ANSWER = "Update the VPN client, then reconnect to the office network."
+
+
+def counts(db, article_id):
+    db.expire_all()
+    article = db.get(KnowledgeBase, article_id)
+    return article.view_count, article.helpful_count, article.not_helpful_count
+
+
+@pytest.fixture
+def paused_flusher(client):
+    """Stop the periodic flush thread so only the test decides when deltas are written"""
+    kb_counter_buffer.stop()
+    yield
+    kb_counter_buffer.start()
+
+
+def test_views_and_votes_are_buffered_then_flushed_in_one_batch(client, db, kb_article, paused_flusher):
+    article = kb_article("VPN disconnects on Wi-Fi", ANSWER)
+    kb_counter_buffer.flush()
+    for _ in range(3):
+        client.get(API + f"/kb/{article.id}")
+    voted = client.post(API + f"/kb/{article.id}/helpful", params={"helpful": True}).json()
+    client.post(API + f"/kb/{article.id}/helpful", params={"helpful": False})
+
+    assert counts(db, article.id) == (0, 0, 0)  # nothing written yet
+    assert (voted["view_count"], voted["helpful_count"]) == (3, 1)  # but shown with pending deltas
+
+    assert kb_counter_buffer.flush() == 1
+    assert counts(db, article.id) == (3, 1, 1)
+    assert kb_counter_buffer.pending(article.id) == [0, 0, 0]
+
+
+class BrokenSession:
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("database is down")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_failed_flush_keeps_the_deltas(db, kb_article, monkeypatch):
+    article = kb_article("VPN disconnects on Wi-Fi", ANSWER)
+    buffer = KBCounterBuffer(flush_seconds=60)
+    buffer.record_view(article.id)
+    buffer.record_feedback(article.id, helpful=True)
+
+    monkeypatch.setattr("app.services.kb_counter_buffer.SessionLocal", BrokenSession)
+    assert buffer.flush() == 0
+    buffer.record_view(article.id)
+    assert buffer.pending(article.id) == [2, 1, 0]
+
+    monkeypatch.undo()
+    assert buffer.flush() == 1
+    assert counts(db, article.id) == (2, 1, 0)
@@ -0,0 +1,44 @@
+import threading
+
+from app.services.kb_deflection import KBDeflectionIndex, kb_deflection_index
+from conftest import API
+
+VPN_ANSWER = "Update the VPN client, then reconnect. Disconnects on home Wi-Fi stop after the update."
+
+
+def test_new_tickets_get_matching_articles(client, db, users, kb_article):
+    kb_deflection_index.rebuild(db)
+    vpn = kb_article("VPN disconnects on home Wi-Fi", VPN_ANSWER)
+    kb_article("Printer offline", "Power cycle the printer and clear the queue on the print server.")
+    kb_deflection_index._refresher.join(5)
+
+    response = client.post(API + "/tickets/", json={
+        "title": "VPN keeps disconnecting",
+        "description": "My VPN disconnects on Wi-Fi at home every few minutes",
+        "category": "network",
+        "user_id": users[0].id
+    }).json()
+    assert [match["id"] for match in response["kb_suggestions"]] == [vpn.id]
+
+
+def test_kb_changes_rebuild_in_the_background(db, kb_article):
+    index = KBDeflectionIndex(dim=4096, refresh_seconds=300)
+    vpn = kb_article("VPN disconnects on home Wi-Fi", VPN_ANSWER)
+    index.rebuild(db)
+
+    release = threading.Event()
+    rebuild = index._refresher._build
+    index._refresher._build = lambda session: release.wait(5) and rebuild(session)
+
+    outlook = kb_article("Outlook asks for password", "Remove cached Outlook credentials and sign in again.")
+    index.invalidate()
+    index.invalidate()  # coalesced into one queued rerun
+
+    # Lookups keep the previous matrix while the rebuild is blocked
+    assert index.match(db, "outlook password prompt", limit=3, min_score=0.1) == []
+    assert [m["id"] for m in index.match(db, "vpn disconnects", limit=3, min_score=0.1)] == [vpn.id]
+
+    release.set()
+    index._refresher.join(5)
+    assert not index._refresher.running
+    assert [m["id"] for m in index.match(db, "outlook password prompt", limit=3, min_score=0.1)] == [outlook.id]
@@ -0,0 +1,57 @@
+import json
+
+from app.core.config import settings
+from app.models.knowledge_base import KnowledgeBase
+from conftest import API
+
+ANSWER = "Update the VPN client, then reconnect to the office network."
+
+
+def article(title, **fields):
+    return {"title": title, "question": f"How do I fix this: {title}?", "answer": ANSWER, "category": "network", **fields}
+
+
+def upload(client, name, content):
+    response = client.post(API + "/kb/import", files={"file": (name, content)})
+    assert response.status_code == 202, response.text
+    # TestClient runs background tasks before returning, so the job has finished
+    job = client.get(API + f"/kb/import/{response.json()['job_id']}").json()
+    assert job["status"] == "completed"
+    return job
+
+
+def test_bad_rows_are_reported_without_failing_the_batch(client, db):
+    lines = [
+        json.dumps(article("VPN disconnects on Wi-Fi")),
+        "{not json",
+        json.dumps(article("Short", answer="too short")),
+        json.dumps(article("Mystery category", category="other")),
+        json.dumps(article("Outlook password prompt", keywords=["outlook", "password"])),
+    ]
+    job = upload(client, "articles.jsonl", "\n".join(lines))
+
+    assert (job["total_rows"], job["processed_rows"], job["created"], job["failed"]) == (5, 5, 2, 3)
+    assert [error["row"] for error in sorted(job["errors"], key=lambda e: e["row"])] == [2, 3, 4]
+    assert db.query(KnowledgeBase).count() == 2
+
+
+def test_rows_are_upserted_by_title_across_batches(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "KB_IMPORT_BATCH_SIZE", 2)
+    upload(client, "articles.jsonl", json.dumps(article("VPN disconnects on Wi-Fi")))
+    existing = db.query(KnowledgeBase).one()
+    existing.view_count = 12
+    db.commit()
+
+    content = "title,question,answer,category,keywords\n" + "\n".join([
+        f"VPN disconnects on Wi-Fi,How do I keep the VPN up?,{ANSWER.replace(',', '')},network,vpn",
+        "Printer offline,Why is the printer offline?,Power cycle the printer and re-add it.,printer,",
+        "Printer offline,Why is the printer offline again?,Re-add the printer from the print server.,printer,",
+    ])
+    job = upload(client, "articles.csv", content)
+
+    assert (job["created"], job["updated"], job["failed"]) == (1, 2, 0)
+    db.expire_all()
+    vpn = db.query(KnowledgeBase).filter(KnowledgeBase.title == "VPN disconnects on Wi-Fi").one()
+    assert (vpn.question, vpn.view_count) == ("How do I keep the VPN up?", 12)
+    printer = db.query(KnowledgeBase).filter(KnowledgeBase.title == "Printer offline").one()
+    assert printer.question == "Why is the printer offline again?"
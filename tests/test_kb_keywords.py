@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import event
+
+from app.database.session import engine
+from app.models.kb_keyword import KBKeyword
+from app.services import kb_keyword_service
+from app.services.kb_keyword_service import normalize_keywords
+from conftest import API
+
+ANSWER = "Reinstall the client and reconnect; contact IT if it keeps failing."
+
+
+def test_normalize_keywords():
+    assert normalize_keywords("VPN,  Remote Access, vpn") == ["vpn", "remote access"]
+    assert normalize_keywords(["Wi-Fi", ""]) == ["wi fi"]
+    assert normalize_keywords(None) == []
+
+
+def test_find_articles_by_all_or_any_keyword(client, kb_article):
+    both = kb_article("VPN over Wi-Fi", ANSWER, keywords="vpn, wifi")
+    vpn_only = kb_article("VPN client crashes", ANSWER, keywords="VPN")
+
+    def ids(keywords, match):
+        response = client.get(API + "/kb/keywords/articles", params={"keywords": keywords, "match": match})
+        return sorted(article["id"] for article in response.json()["articles"])
+
+    assert ids("vpn,wifi", "all") == [both.id]
+    assert ids("vpn,wifi", "any") == sorted([both.id, vpn_only.id])
+    assert ids("vpn,printer", "all") == []
+
+
+@pytest.fixture(params=["on_conflict", "savepoint"])
+def insert_mode(request, monkeypatch):
+    if request.param == "savepoint":
+        monkeypatch.setattr(kb_keyword_service, "_UPSERT_INSERTS", {})
+    return request.param
+
+
+def test_keyword_created_concurrently_is_reused(db, kb_article, insert_mode):
+    """Another writer adds the keyword between our SELECT and INSERT"""
+    raced = []
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if not raced and statement.lstrip().startswith("SELECT") and "kb_keywords" in statement:
+            raced.append(statement)
+            with engine.begin() as other:
+                other.execute(KBKeyword.__table__.insert().values(keyword="remote access"))
+
+    event.listen(engine, "after_cursor_execute", race)
+    try:
+        article = kb_article("Remote access setup", ANSWER, keywords="Remote Access, vpn")
+    finally:
+        event.remove(engine, "after_cursor_execute", race)
+
+    assert raced
+
+    assert article.keywords == "remote access, vpn"
+    assert db.query(KBKeyword).filter(KBKeyword.keyword == "remote access").count() == 1
+    assert sorted(k.keyword for k in article.keyword_entries) == ["remote access", "vpn"]
@@ -0,0 +1,60 @@
+from collections import defaultdict
+
+from app.services.kb_query_expansion import PREFIX_LENGTH, KBQueryExpander, _deletes
+from app.services.kb_search_index import KBSearchIndex
+from conftest import API
+
+ANSWER = "Open settings and choose a new password, then sign in again on every device."
+
+
+def expander_for(db):
+    index = KBSearchIndex(refresh_seconds=300)
+    index.rebuild(db)
+    return index, KBQueryExpander(index, max_distance=2, synonyms={"pwd": ["password"]})
+
+
+def test_typos_and_synonyms_are_expanded(db, kb_article):
+    kb_article("Reset your password", ANSWER)
+    index, expander = expander_for(db)
+
+    weights = expander.expand(db, "pasword")
+    assert weights[index.analyze("password")[0]] == 0.7
+    assert index.analyze("password")[0] in expander.expand(db, "pwd")
+
+
+def test_search_finds_articles_despite_typos(client, db, kb_article):
+    from app.services.kb_search_index import kb_search_index
+
+    kb_search_index.rebuild(db)
+    article = kb_article("Reset your password", ANSWER)
+    results = client.get(API + "/kb/search", params={"q": "pasword reset"}).json()["results"]
+    assert [result["id"] for result in results] == [article.id]
+
+
+def test_dictionary_is_patched_incrementally(db, kb_article):
+    first = kb_article("Reset your password", ANSWER)
+    index, expander = expander_for(db)
+    expander.expand(db, "anything")
+
+    second = kb_article("Docking station not detected", "Reseat the thunderbolt cable and update the dock firmware.")
+    index.upsert([second])
+    assert expander.correct("thunderbolr") is None  # not applied until the next query
+    expander.expand(db, "anything")
+    assert expander.correct("thunderbolr") == ("thunderbolt", 1)
+
+    index.remove([first.id])
+    expander.expand(db, "anything")
+    assert expander.correct("pasword") is None
+
+    # Same dictionary as one built from scratch for the current vocabulary
+    expected = defaultdict(set)
+    for word in index.vocabulary:
+        for variant in _deletes(word[:PREFIX_LENGTH], expander._distance_for(word)):
+            expected[variant].add(word)
+    assert dict(expander._deletes) == dict(expected)
+    assert expander._vocabulary == dict(index.vocabulary)
+
+    # A full index rebuild is diffed against what the expander already knows
+    index.rebuild(db)
+    expander.expand(db, "anything")
+    assert expander.correct("pasword") == ("password", 1)
@@ -0,0 +1,76 @@
+from app.models.knowledge_base import KnowledgeBase
+from app.services.kb_search_index import KBSearchIndex, kb_search_index
+from app.utils.helpers import stem
+from conftest import API
+
+
+def test_stem_merges_inflections():
+    assert stem("printing") == stem("printed") == "print"
+    assert stem("printers") == "printer"
+    assert stem("passwords") == "password"
+
+
+def test_search_ranks_title_matches_first(client, db, kb_article):
+    kb_search_index.rebuild(db)
+    answer_match = kb_article("Mailbox is full", "Archive old mail; the VPN client is not involved at all here.")
+    title_match = kb_article("VPN disconnects on Wi-Fi", "Update the client and reconnect to the office network.")
+    kb_article("Printer offline", "Power cycle the printer and check the queue on the print server.")
+
+    results = client.get(API + "/kb/search", params={"q": "vpn"}).json()["results"]
+    assert [article["id"] for article in results] == [title_match.id, answer_match.id]
+
+
+def test_deleted_articles_leave_the_index(client, db, kb_article):
+    kb_search_index.rebuild(db)
+    article = kb_article("VPN disconnects on Wi-Fi", "Update the client and reconnect to the office network.")
+    assert client.delete(API + f"/kb/{article.id}").status_code == 204
+
+    assert kb_search_index.search(db, "vpn") == []
+
+
+def test_refresh_runs_in_the_background_and_keeps_concurrent_edits(db, kb_article):
+    index = KBSearchIndex(refresh_seconds=0)
+    first = kb_article("VPN disconnects on Wi-Fi", "Update the client and reconnect to the office network.")
+    index.rebuild(db)
+    second = kb_article("Outlook password prompt", "Remove the cached credentials and sign in again.")
+
+    # An edit published while the refresh is loading must survive the swap
+    analyze = KBSearchIndex._analyze_article
+    edited = []
+
+    def analyze_and_edit(article):
+        if not edited:
+            row = db.get(KnowledgeBase, first.id)
+            row.title = "Laptop docking station not detected"
+            row.question = "Why is my docking station not detected?"
+            db.commit()
+            edited.append(row.id)
+            index.upsert([row])
+        return analyze(article)
+
+    index._analyze_article = analyze_and_edit
+    index.ensure_built(db)  # stale: starts the refresh and returns
+    index._refresher.join(5)
+
+    assert edited == [first.id]
+    assert [article_id for article_id, _ in index.search(db, "outlook")] == [second.id]
+    assert [article_id for article_id, _ in index.search(db, "docking")] == [first.id]
+    assert index.search(db, "vpn") == []
+
+
+def test_freed_slots_are_reused_and_results_follow_limit_and_category(db, kb_article):
+    index = KBSearchIndex(refresh_seconds=3600)
+    articles = [kb_article(f"VPN drops on floor {i}", "Reconnect the VPN client.", category="network") for i in range(3)]
+    printer = kb_article("Printer offline", "Check the VPN printer queue.", category="printer")
+    index.rebuild(db)
+
+    index.remove([articles[0].id])
+    replacement = kb_article("VPN VPN certificate expired", "Renew the VPN certificate.", category="network")
+    index.upsert([replacement])
+    assert index._n_slots == 4
+
+    ranked = [article_id for article_id, _ in index.search(db, "vpn")]
+    assert ranked[0] == replacement.id and set(ranked) == {articles[1].id, articles[2].id, printer.id, replacement.id}
+    assert [article_id for article_id, _ in index.search(db, "vpn", limit=1)] == [replacement.id]
+    assert [article_id for article_id, _ in index.search(db, "vpn", category="printer")] == [printer.id]
+    assert index.search(db, "vpn", category="account") == []
@@ -0,0 +1,79 @@
+from app.models.knowledge_base import KnowledgeBase
+from app.services.kb_suggest_index import KBSuggestIndex, kb_suggest_index
+from conftest import API
+
+ANSWER = "Follow the steps in the self-service portal and sign in again."
+
+
+def suggest(client, prefix, **params):
+    response = client.get(API + "/kb/suggest", params={"prefix": prefix, **params})
+    assert response.status_code == 200, response.text
+    return response.json()["suggestions"]
+
+
+def test_prefix_matches_title_suffixes_and_keywords(client, db, kb_article):
+    kb_suggest_index.rebuild(db)
+    article = kb_article("Reset Outlook password", ANSWER, keywords="mailbox, login")
+
+    for prefix, matched in (("res", "reset outlook password"), ("Outl", "outlook password"),
+                            ("pass", "password"), ("mailb", "mailbox")):
+        suggestions = suggest(client, prefix)
+        assert [s["id"] for s in suggestions] == [article.id]
+        assert suggestions[0]["matched"] == matched
+
+    assert suggest(client, "word") == []
+
+
+def test_one_suggestion_per_article_most_popular_first(client, db, kb_article):
+    kb_suggest_index.rebuild(db)
+    quiet = kb_article("Printer offline", ANSWER, keywords="printer queue", category="hardware")
+    popular = kb_article("Printer jams on duplex", ANSWER, category="hardware")
+    popular.view_count = 500
+    db.commit()
+    kb_suggest_index.rebuild(db)
+
+    assert [s["id"] for s in suggest(client, "printer")] == [popular.id, quiet.id]
+    assert [s["id"] for s in suggest(client, "printer", limit=1)] == [popular.id]
+    assert suggest(client, "printer", category="email") == []
+
+
+def test_memoized_short_prefixes_follow_edits(client, db, kb_article):
+    kb_suggest_index.rebuild(db)
+    article = kb_article("VPN disconnects on Wi-Fi", ANSWER, category="network")
+    assert [s["id"] for s in suggest(client, "v")] == [article.id]
+
+    client.patch(API + f"/kb/{article.id}", json={"title": "Wi-Fi drops the VPN"})
+    assert suggest(client, "v")[0]["matched"] == "vpn"
+
+    client.delete(API + f"/kb/{article.id}")
+    assert suggest(client, "v") == []
+    assert suggest(client, "wi") == []
+
+
+def test_refresh_runs_in_the_background_and_keeps_concurrent_edits(db, kb_article):
+    index = KBSuggestIndex(refresh_seconds=0)
+    first = kb_article("VPN disconnects on Wi-Fi", ANSWER, category="network")
+    index.rebuild(db)
+    second = kb_article("Outlook password prompt", ANSWER)
+
+    # An edit published while the refresh is loading must survive the swap
+    entry = KBSuggestIndex._entry
+    edited = []
+
+    def entry_and_edit(article):
+        if not edited:
+            row = db.get(KnowledgeBase, first.id)
+            row.title = "Docking station not detected"
+            db.commit()
+            edited.append(row.id)
+            index.upsert([row])
+        return entry(article)
+
+    index._entry = entry_and_edit
+    index.ensure_built(db)  # stale: starts the refresh and returns
+    index._refresher.join(5)
+
+    assert edited == [first.id]
+    assert [s["id"] for s in index.suggest(db, "outl")] == [second.id]
+    assert [s["id"] for s in index.suggest(db, "dock")] == [first.id]
+    assert index.suggest(db, "vpn") == []
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+from app.utils.offload import ThreadOffloader
+
+
+def test_calls_run_off_the_loop_with_bounded_concurrency():
+    offloader = ThreadOffloader("test.offload", size=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def blocking(value):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return value, threading.get_ident()
+
+    async def main():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(*(offloader.run(blocking, i) for i in range(6)))
+        beat.cancel()
+        return results, ticks, threading.get_ident()
+
+    results, ticks, loop_thread = asyncio.run(main())
+    assert [value for value, _ in results] == list(range(6))
+    assert all(thread != loop_thread for _, thread in results)
+    assert peak == 2
+    # Three rounds of 50 ms: the loop kept running meanwhile
+    assert ticks >= 10
+
+
+def test_each_event_loop_gets_its_own_limiter():
+    offloader = ThreadOffloader("test.offload", size=1)
+    assert asyncio.run(offloader.run(sum, [1, 2])) == 3
+    assert asyncio.run(offloader.run(sum, [3, 4])) == 7
+    assert offloader.stats() == {"size": 1, "busy": 0, "waiting": 0}
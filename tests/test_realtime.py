@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+from app.models.ticket import TicketStatus
+from app.schemas.ticket import TicketStatusUpdate
+from app.services.realtime_service import RealtimeBroker
+from app.services.ticket_service import TicketService
+from conftest import API
+
+
+def test_websocket_receives_ticket_events(client, db, users, new_ticket):
+    with client.websocket_connect(API + "/realtime/ws") as websocket:
+        ticket = new_ticket()
+        created = json.loads(websocket.receive_text())
+        TicketService.change_status(db, ticket.id, TicketStatusUpdate(status=TicketStatus.IN_PROGRESS), users[1].id)
+        changed = json.loads(websocket.receive_text())
+
+    assert created["type"] == "ticket.created"
+    assert created["ticket"]["id"] == ticket.id
+    assert changed["type"] == "ticket.status_changed"
+    assert changed["metrics"] == {"status": {"open": -1, "in_progress": 1}}
+
+
+def test_slow_client_drops_oldest_and_is_told_to_resync():
+    async def scenario():
+        broker = RealtimeBroker(queue_size=2, max_clients=10)
+        subscriber = broker.subscribe()
+        for n in range(5):
+            broker.publish({"n": n})
+        await asyncio.sleep(0)  # let the loop run the fan-out callbacks
+        return [await subscriber.next_message(0.1) for _ in range(4)], subscriber.dropped
+
+    messages, dropped = asyncio.run(scenario())
+    assert json.loads(messages[0]) == {"type": "resync"}
+    assert [json.loads(m)["n"] for m in messages[1:3]] == [3, 4]
+    assert messages[3] is None  # heartbeat timeout
+    assert dropped == 3
+
+
+def test_clients_beyond_capacity_are_refused():
+    async def scenario():
+        broker = RealtimeBroker(queue_size=2, max_clients=1)
+        first = broker.subscribe()
+        refused = broker.subscribe()
+        broker.unsubscribe(first)
+        return refused, broker.subscribe()
+
+    refused, after_leave = asyncio.run(scenario())
+    assert refused is None
+    assert after_leave is not None
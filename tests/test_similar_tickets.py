@@ -0,0 +1,112 @@
+import threading
+
+import numpy as np
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.ticket import TicketStatus
+from app.schemas.ticket import CommentCreate, TicketCreate, TicketStatusUpdate
+from app.services.similar_ticket_index import SimilarTicketIndex, similar_tickets
+from app.services.ticket_service import TicketService
+from conftest import API
+
+VPN = "VPN disconnects every few minutes when working from home over Wi-Fi"
+
+
+def ticket(db, users, title, description, resolve=False):
+    created = TicketService.create_ticket(db, TicketCreate(title=title, description=description, category="network"), users[0].id)
+    if resolve:
+        TicketService.change_status(db, created.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), users[1].id)
+    return created
+
+
+def test_similar_returns_resolved_tickets_best_first(client, db, users):
+    similar_tickets.rebuild(db)
+    exact = ticket(db, users, "VPN keeps disconnecting", VPN, resolve=True)
+    partial = ticket(db, users, "VPN slow", "VPN is slow from home in the evening", resolve=True)
+    ticket(db, users, "VPN keeps disconnecting", VPN)  # open: never suggested
+    ticket(db, users, "Printer jam", "Printer on the third floor jams on every duplex job", resolve=True)
+    query = ticket(db, users, "VPN disconnecting again", VPN + " since yesterday")
+
+    similar = client.get(API + f"/tickets/{query.id}/similar").json()["similar"]
+    ids = [match["id"] for match in similar]
+    assert ids[0] == exact.id
+    assert set(ids) <= {exact.id, partial.id}
+
+
+def test_sparse_scores_match_dense_cosine(db, users):
+    index = SimilarTicketIndex(num_perm=64, bands=32, max_candidates=100)
+    solved = ticket(db, users, "VPN keeps disconnecting", VPN, resolve=True)
+    TicketService.add_comment(db, solved.id, CommentCreate(comment="Fixed by updating the VPN client"), users[1].id)
+    index.rebuild(db)
+    query = ticket(db, users, "VPN disconnecting", VPN + " after the client update")
+
+    [(match_id, score)] = index.similar(db, query)
+
+    texts = index._texts(db, [(t.id, t.title, t.description) for t in (solved, query)])
+    dense = []
+    for text in (texts[solved.id], texts[query.id]):
+        ids, tf = index._terms(text)
+        vector = np.zeros(1 << 18, dtype=np.float64)
+        vector[ids] = tf * index._idf(ids)
+        dense.append(vector / np.linalg.norm(vector))
+    assert match_id == solved.id
+    assert abs(score - float(dense[0] @ dense[1])) < 1e-3
+
+
+def test_first_lookup_builds_in_the_background(db, users):
+    index = SimilarTicketIndex(
+        num_perm=settings.SIMILAR_TICKETS_NUM_PERM,
+        bands=settings.SIMILAR_TICKETS_BANDS,
+        max_candidates=settings.SIMILAR_TICKETS_MAX_CANDIDATES
+    )
+    solved = ticket(db, users, "VPN keeps disconnecting", VPN, resolve=True)
+    query = ticket(db, users, "VPN disconnecting", VPN + " again")
+
+    assert index.similar(db, query) == []  # not built yet: starts the build, doesn't wait
+    index._builder.join(5)
+    assert [match_id for match_id, _ in index.similar(db, query)] == [solved.id]
+
+
+def test_newly_resolved_tickets_are_picked_up(db, users):
+    similar_tickets.rebuild(db)
+    later = ticket(db, users, "VPN keeps disconnecting", VPN)
+    query = ticket(db, users, "VPN disconnecting", VPN + " again")
+    assert similar_tickets.similar(db, query) == []
+
+    TicketService.change_status(db, later.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), users[1].id)
+    assert [match_id for match_id, _ in similar_tickets.similar(db, query)] == [later.id]
+
+
+def test_lookups_and_events_do_not_wait_for_a_sync(db, users, monkeypatch):
+    similar_tickets.rebuild(db)
+    first = ticket(db, users, "VPN keeps disconnecting", VPN)
+    second = ticket(db, users, "VPN drops on Wi-Fi", VPN + " at home")
+    query = ticket(db, users, "VPN disconnecting", VPN + " again")
+    TicketService.change_status(db, first.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), users[1].id)
+
+    texts = SimilarTicketIndex._texts
+    reading, release = threading.Event(), threading.Event()
+
+    def slow_texts(session, tickets):
+        tickets = list(tickets)
+        if any(ticket_id == first.id for ticket_id, _, _ in tickets):
+            reading.set()
+            release.wait(5)
+        return texts(session, tickets)
+
+    monkeypatch.setattr(similar_tickets, "_texts", slow_texts)
+    session = SessionLocal()
+    syncing = threading.Thread(target=similar_tickets.sync, args=(session,))
+    syncing.start()
+    assert reading.wait(5)
+
+    # Neither the lookup nor the event handler waits for the sync's queries
+    assert similar_tickets.similar(db, query) == []
+    TicketService.change_status(db, second.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), users[1].id)
+    release.set()
+    syncing.join(5)
+    session.close()
+    monkeypatch.undo()
+
+    assert {match_id for match_id, _ in similar_tickets.similar(db, query)} == {first.id, second.id}
@@ -0,0 +1,63 @@
+import queue
+import time
+
+from app.services.slack_dispatcher import ERROR_MESSAGE, slack_dispatcher
+from app.services.slack_service import SlackService
+from app.utils.metrics import histogram
+from conftest import API
+
+
+def capture_responses(monkeypatch) -> "queue.Queue":
+    posted = queue.Queue()
+    monkeypatch.setattr(SlackService, "post_response", staticmethod(lambda url, message: posted.put((url, message))))
+    return posted
+
+
+def command(client, name, text="", user_id="U0", **extra):
+    response = client.post(API + "/slack/commands", data={"command": name, "text": text, "user_id": user_id, **extra})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_commands_are_acknowledged_and_answered_via_response_url(client, users, monkeypatch):
+    posted = capture_responses(monkeypatch)
+    url = "https://hooks.slack.test/commands/1"
+
+    ack = command(client, "/ticket", "My laptop will not boot after the update", response_url=url)
+    assert ack == {"response_type": "ephemeral", "text": "⏳ Creating your ticket..."}
+
+    reply_url, reply = posted.get(timeout=10)
+    assert reply_url == url
+    assert reply["text"].startswith("Ticket TKT-")
+
+    command(client, "/mytickets", response_url=url)
+    assert "Total: 1" in posted.get(timeout=10)[1]["blocks"][0]["text"]["text"]
+
+
+def test_commands_without_response_url_reply_inline(client, users, new_ticket):
+    ticket = new_ticket()
+    reply = command(client, "/status", ticket.ticket_number)
+    assert ticket.ticket_number in reply["blocks"][0]["text"]["text"]
+
+    assert command(client, "/status")["text"].startswith("Please provide a ticket number")
+
+
+def test_failed_jobs_reply_with_an_error():
+    replies = queue.Queue()
+
+    def work(db):
+        raise RuntimeError("boom")
+
+    slack_dispatcher.submit("test", work, replies.put, time.perf_counter()).result(timeout=10)
+    assert replies.get_nowait() == ERROR_MESSAGE
+
+
+def test_failed_replies_are_logged_and_timed(caplog):
+    def reply(message):
+        raise RuntimeError("transport is shutting down")
+
+    completions = histogram("slack.completion.reply-test").count
+    slack_dispatcher.submit("reply-test", lambda db: {"text": "done"}, reply, time.perf_counter()).result(timeout=10)
+
+    assert "Slack reply-test reply failed" in caplog.text
+    assert histogram("slack.completion.reply-test").count == completions + 1
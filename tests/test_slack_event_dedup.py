@@ -0,0 +1,51 @@
+import queue
+
+from app.core.config import settings
+from app.models.slack_event_receipt import SlackEventReceipt
+from app.models.ticket import Ticket
+from app.services.slack_event_dedup import SlackEventDeduplicator, slack_event_dedup
+from app.services.slack_service import SlackService
+from conftest import API
+
+
+def mention(event_id, text="<@UBOT> my VPN keeps disconnecting every hour"):
+    return {
+        "event_id": event_id,
+        "event": {"type": "app_mention", "user": "U0", "channel": "C1", "text": text}
+    }
+
+
+def test_retried_events_create_one_ticket(client, db, users, monkeypatch):
+    sent = queue.Queue()
+    monkeypatch.setattr(SlackService, "send_message", staticmethod(lambda channel, text, blocks=None: sent.put(text)))
+
+    assert client.post(API + "/slack/events", json=mention("Ev1")).json() == {"status": "accepted"}
+    assert "created" in sent.get(timeout=10)
+    assert client.post(API + "/slack/events", json=mention("Ev1")).json() == {"status": "duplicate"}
+
+    assert db.query(Ticket).count() == 1
+    assert db.query(SlackEventReceipt).one().ticket_id == db.query(Ticket.id).scalar()
+
+
+def test_a_second_worker_loses_the_claim(db):
+    other_worker = SlackEventDeduplicator(
+        maxsize=settings.SLACK_EVENT_DEDUP_SIZE,
+        retention_hours=settings.SLACK_EVENT_RECEIPT_RETENTION_HOURS
+    )
+    assert slack_event_dedup.claim(db, "Ev2", "app_mention") is True
+    assert other_worker.claim(db, "Ev2", "app_mention") is False
+    assert other_worker.duplicates == 1
+
+
+def test_released_claims_accept_the_retry(db):
+    assert slack_event_dedup.claim(db, "Ev3") is True
+    slack_event_dedup.release(db, "Ev3")
+    assert slack_event_dedup.claim(db, "Ev3") is True
+
+
+def test_events_that_create_no_work_are_not_claimed(client, db):
+    message = {"event_id": "Ev4", "event": {"type": "message", "user": "U0", "channel": "C1", "text": "hello"}}
+    assert client.post(API + "/slack/events", json=message).json() == {"status": "ok"}
+    assert client.post(API + "/slack/events", json=mention("Ev5", text="<@UBOT>  ")).json() == {"status": "ok"}
+
+    assert db.query(SlackEventReceipt).count() == 0
@@ -0,0 +1,30 @@
+from app.models.user import UserRole
+from app.services.slack_identity_cache import slack_identities
+from conftest import API
+
+
+def test_lookups_are_served_from_the_cache(db, users):
+    misses = slack_identities._cache.misses
+    assert slack_identities.get(db, "U1") == (users[1].id, UserRole.IT_SUPPORT)
+    assert slack_identities.get(db, "U1") == (users[1].id, UserRole.IT_SUPPORT)
+    assert slack_identities._cache.misses == misses + 1
+
+
+def test_role_and_slack_id_changes_drop_cached_identities(client, db, users):
+    employee = users[0]
+    assert slack_identities.get(db, "U0").role == UserRole.EMPLOYEE
+
+    client.patch(API + f"/users/{employee.id}", json={"role": "it_support"})
+    db.expire_all()
+    assert slack_identities.get(db, "U0").role == UserRole.IT_SUPPORT
+
+    client.patch(API + f"/users/{employee.id}", json={"teams_user_id": "U9"})
+    db.expire_all()
+    assert slack_identities.get(db, "U0") is None
+    assert slack_identities.get(db, "U9").user_id == employee.id
+
+
+def test_deactivated_users_are_dropped(client, db, users):
+    assert slack_identities.get(db, "U1") is not None
+    client.delete(API + f"/users/{users[1].id}")
+    assert slack_identities._cache.get("U1") is None
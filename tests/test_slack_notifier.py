@@ -0,0 +1,58 @@
+from app.core.config import settings
+from app.models.ticket import TicketStatus
+from app.schemas.ticket import TicketCreate, TicketStatusUpdate
+from app.services.slack_notifier import SlackNotifier, slack_notifier
+from app.services.slack_service import SlackService
+from app.services.ticket_service import TicketService
+
+
+def capture(monkeypatch):
+    sent = []
+    for name in ("send_status_update_notification", "send_assignment_notification", "send_digest_notification"):
+        monkeypatch.setattr(SlackService, name, staticmethod(lambda *args, _name=name: sent.append((_name, args))))
+    return sent
+
+
+def test_status_changes_of_one_ticket_merge_into_one_message(monkeypatch):
+    sent = capture(monkeypatch)
+    notifier = SlackNotifier(window_seconds=60)
+    notifier.notify_status("U0", "TKT-1", TicketStatus.OPEN, TicketStatus.IN_PROGRESS)
+    notifier.notify_status("U0", "TKT-1", TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED)
+    notifier.notify_assignment("U0", "TKT-2", "Printer offline", "Agent")
+
+    assert notifier.flush() == 0  # window still open
+    assert notifier.flush(force=True) == 1
+    (name, (user, header, lines)), = sent
+    assert (name, user) == ("send_digest_notification", "U0")
+    assert "2 ticket updates" in header
+    assert lines[0] == "• *TKT-1*: Open → In Progress → Resolved"
+
+
+def test_single_notification_is_sent_as_is(monkeypatch):
+    sent = capture(monkeypatch)
+    notifier = SlackNotifier(window_seconds=0)
+    notifier.notify_status("U0", "TKT-1", TicketStatus.OPEN, TicketStatus.RESOLVED)
+
+    assert sent == [("send_status_update_notification", ("U0", "TKT-1", "open", "resolved", None))]
+
+
+def test_ticket_events_only_notify_when_enabled(monkeypatch, db, users):
+    sent = capture(monkeypatch)
+    monkeypatch.setattr(settings, "SLACK_BOT_TOKEN", "xoxb-test")
+    ticket = TicketService.create_ticket(
+        db, TicketCreate(title="VPN drops", description="Every few minutes", category="network"), users[0].id
+    )
+
+    TicketService.change_status(db, ticket.id, TicketStatusUpdate(status=TicketStatus.IN_PROGRESS), users[1].id)
+    slack_notifier.flush(force=True)
+    assert sent == []
+
+    monkeypatch.setattr(settings, "SLACK_STATUS_DMS_ENABLED", True)
+    TicketService.change_status(db, ticket.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), users[1].id)
+    TicketService.assign_ticket(db, ticket.id, users[1].id, users[1].id)
+    slack_notifier.flush(force=True)
+
+    assert sorted(sent) == [
+        ("send_assignment_notification", ("U1", ticket.ticket_number, "VPN drops", "Agent")),
+        ("send_status_update_notification", ("U0", ticket.ticket_number, "in_progress", "resolved", None)),
+    ]
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services.http_transport import http_transport
+from app.services.slack_outbox import SlackOutbox
+
+
+def outbox(**overrides) -> SlackOutbox:
+    options = dict(max_size=10, concurrency=4, max_retries=0, channel_rate=50.0, channel_burst=1)
+    options.update(overrides)
+    return SlackOutbox(**options)
+
+
+def fake_slack(monkeypatch, responses):
+    """Answer Web API calls with the given responses in order; returns the call times"""
+    calls = []
+
+    async def request(method, url, **kwargs):
+        calls.append((time.monotonic(), kwargs["json"]))
+        status, headers, body = responses.pop(0) if responses else (200, {}, {"ok": True})
+        return httpx.Response(status, headers=headers, json=body)
+
+    monkeypatch.setattr(http_transport, "request", request)
+    return calls
+
+
+async def drain(box: SlackOutbox, messages, timeout=5.0):
+    await box.start()
+    for channel, text in messages:
+        assert box.enqueue("chat.postMessage", {"channel": channel, "text": text})
+    deadline = time.monotonic() + timeout
+    while box.depth and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    await box.stop(drain_seconds=0)
+
+
+def test_rate_limited_messages_wait_for_retry_after(monkeypatch):
+    calls = fake_slack(monkeypatch, [(429, {"Retry-After": "0.3"}, {"ok": False, "error": "ratelimited"})])
+    box = outbox()
+    asyncio.run(drain(box, [("C1", "hello")]))
+
+    assert (box.rate_limited, box.delivered, box.failed) == (1, 1, 0)
+    assert len(calls) == 2
+    assert calls[1][0] - calls[0][0] >= 0.3
+
+
+def test_messages_to_one_channel_are_spread_out(monkeypatch):
+    calls = fake_slack(monkeypatch, [])
+    box = outbox(channel_rate=10.0)
+    asyncio.run(drain(box, [("C1", "a"), ("C2", "b"), ("C1", "c")]))
+
+    assert box.delivered == 3
+    sent = {payload["text"]: at for at, payload in calls}
+    assert sent["c"] - sent["a"] >= 0.09
+    assert sent["b"] - sent["a"] < 0.09
+
+
+def test_server_errors_and_a_full_queue_are_counted(monkeypatch):
+    fake_slack(monkeypatch, [(503, {}, {"ok": False})])
+    box = outbox(max_size=1)
+    assert box.enqueue("chat.postMessage", {"channel": "C1", "text": "a"})
+    assert not box.enqueue("chat.postMessage", {"channel": "C1", "text": "b"})
+    asyncio.run(drain(box, []))
+
+    assert (box.dropped, box.failed, box.delivered) == (1, 1, 0)
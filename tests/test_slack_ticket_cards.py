@@ -0,0 +1,57 @@
+import json
+import threading
+
+from app.models.ticket import TicketStatus
+from app.schemas.ticket import TicketStatusUpdate
+from app.services.slack_ticket_cards import slack_ticket_cards
+from app.services.ticket_service import TicketService
+from conftest import API
+
+
+def status_text(client, ticket_number):
+    response = client.post(API + "/slack/commands", data={"command": "/status", "text": ticket_number, "user_id": "U0"})
+    return response.json()["blocks"][0]["text"]["text"]
+
+
+def test_cards_are_cached_until_the_ticket_changes(client, db, users, new_ticket):
+    ticket = new_ticket()
+    hits = slack_ticket_cards._cache.hits
+    assert "*Status:* Open" in status_text(client, ticket.ticket_number)
+    assert "*Status:* Open" in status_text(client, ticket.ticket_number)
+    assert slack_ticket_cards._cache.hits == hits + 1
+
+    TicketService.change_status(db, ticket.id, TicketStatusUpdate(status=TicketStatus.IN_PROGRESS), users[1].id)
+    assert "*Status:* In Progress" in status_text(client, ticket.ticket_number)
+
+    payload = json.dumps({"type": "block_actions", "actions": [{"action_id": "view_ticket", "value": ticket.ticket_number}]})
+    detail = client.post(API + "/slack/interactions", data={"payload": payload}).json()
+    assert "*Status:* in_progress" in detail["text"]
+
+
+def test_unknown_tickets_are_not_cached(client, db, users):
+    response = client.post(API + "/slack/commands", data={"command": "/status", "text": "TKT-1999-0001", "user_id": "U0"})
+    assert response.json()["text"] == "Ticket TKT-1999-0001 not found"
+    assert slack_ticket_cards._cache.get(("status", "TKT-1999-0001")) is None
+
+
+def test_an_update_during_a_fill_does_not_leave_a_stale_card(db, users, new_ticket):
+    ticket = new_ticket()
+    rendering, release = threading.Event(), threading.Event()
+
+    def slow_render(loaded):
+        rendering.set()
+        release.wait(5)
+        return {"status": loaded.status.value}
+
+    fill = threading.Thread(target=slack_ticket_cards.get, args=(db, ticket.ticket_number, "status", slow_render))
+    fill.start()
+    rendering.wait(5)
+    invalidation = threading.Thread(target=slack_ticket_cards.invalidate, args=(ticket.ticket_number,))
+    invalidation.start()
+    invalidation.join(0.2)
+    assert invalidation.is_alive()  # Waits for the fill instead of running under it
+    release.set()
+    fill.join(5)
+    invalidation.join(5)
+
+    assert slack_ticket_cards._cache.get(("status", ticket.ticket_number)) is None
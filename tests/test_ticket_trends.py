@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.models.ticket import Ticket, TicketStatus
+from app.schemas.ticket import TicketStatusUpdate
+from app.services.ticket_service import TicketService
+from app.services.trend_service import ticket_trends
+from conftest import API
+
+
+def test_daily_trend_is_gap_filled(client, db, new_ticket):
+    two_days_ago = new_ticket("Old VPN issue")
+    new_ticket("Printer offline", category="hardware")
+    new_ticket("Outlook crash", category="email")
+    db.query(Ticket).filter(Ticket.id == two_days_ago.id).update(
+        {Ticket.created_at: datetime.now() - timedelta(days=2)}, synchronize_session=False
+    )
+    db.commit()
+    ticket_trends.rebuild(db)
+
+    trend = client.get(API + "/metrics/ticket-trends", params={"days": 5}).json()
+    assert [day["count"] for day in trend] == [0, 0, 1, 0, 2]
+    assert trend[-1]["date"] == datetime.now().date().isoformat()
+
+
+def test_events_keep_the_rollup_equal_to_a_rebuild(db, users, new_ticket):
+    ticket_trends.rebuild(db)
+    first = new_ticket()
+    new_ticket("Printer offline", category="hardware")
+    TicketService.change_status(db, first.id, TicketStatusUpdate(status=TicketStatus.RESOLVED), users[1].id)
+
+    maintained = ticket_trends.series(db, granularity="hour", days=2, group_by="status")
+    ticket_trends.rebuild(db)
+    rebuilt = ticket_trends.series(db, granularity="hour", days=2, group_by="status")
+
+    assert maintained == rebuilt
+    assert sum(maintained["total"]) == 2
+    assert sum(maintained["series"]["resolved"]) == 1
+
+
+def test_weekly_buckets_start_on_monday(client, db):
+    ticket_trends.rebuild(db)
+    series = client.get(API + "/metrics/ticket-trends/series", params={"granularity": "week", "days": 30}).json()
+    assert all(datetime.fromisoformat(bucket).weekday() == 0 for bucket in series["buckets"])
+    assert len(series["total"]) == len(series["buckets"])
+
+
+def test_background_refresh_keeps_tickets_created_during_the_scan(db, users, new_ticket, monkeypatch):
+    ticket_trends.rebuild(db)
+    new_ticket()
+    scan = ticket_trends._scan
+    created = []
+
+    def scan_then_create(query, origin):
+        rows = scan(query, origin)
+        if not created:
+            # Committed after the scan read the table, before the swap
+            created.append(new_ticket("Printer offline", category="hardware"))
+        return rows
+
+    monkeypatch.setattr(ticket_trends, "_scan", scan_then_create)
+    monkeypatch.setattr(ticket_trends, "refresh_seconds", 0)
+    ticket_trends.series(db, granularity="day", days=1)  # stale: starts the refresh and returns
+    ticket_trends._refresher.join(5)
+    monkeypatch.undo()
+
+    assert created
+    series = ticket_trends.series(db, granularity="day", days=1, group_by="category")
+    assert series["total"] == [2]
+    assert series["series"]["hardware"] == [1]
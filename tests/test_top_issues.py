@@ -0,0 +1,72 @@
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+from app.services.top_issues_service import CountMinSketch, TopIssuesTracker, TopK
+
+
+def test_count_min_never_undercounts():
+    rng = random.Random(3)
+    sketch = CountMinSketch(width=64, depth=4)
+    truth = Counter(f"phrase {rng.randrange(500)}" for _ in range(5000))
+    for item, count in truth.items():
+        sketch.add(item, count)
+    assert all(sketch.estimate(item) >= count for item, count in truth.items())
+
+
+def test_top_k_keeps_the_heaviest_items():
+    top = TopK(k=3)
+    for item, count in [("a", 1), ("b", 5), ("c", 2), ("d", 9), ("a", 7), ("e", 3)]:
+        top.offer(item, count)
+    assert top.counts == {"b": 5, "d": 9, "a": 7}
+
+
+def test_recurring_phrase_ranks_first_and_absorbs_its_parts(db, new_ticket):
+    for detail in ("since the update", "on my new laptop", "every morning"):
+        new_ticket("Outlook password prompt", f"It keeps coming back {detail}")
+    new_ticket("Printer jam", "Printer on the third floor jams")
+    tracker = TopIssuesTracker(bucket_minutes=5, width=2048, depth=4, k=64, max_ngram=3)
+
+    results = tracker.top(db, window="hour", limit=3)
+    assert results[0]["phrase"] == "outlook password prompt"
+    assert results[0]["count"] == 3
+    assert not {"outlook password", "password prompt"} & {r["phrase"] for r in results}
+
+    # New tickets are counted from events once the tracker is warm
+    tracker.on_ticket_created(new_ticket("Printer jam again", "Printer jams on duplex"))
+    assert {r["phrase"]: r["count"] for r in tracker.top(db, window="day")}["printer jam"] == 2
+
+
+def test_events_during_the_scan_are_replayed_once(db, new_ticket):
+    seen = new_ticket("Printer jam", "Printer on the third floor jams")
+    tracker = TopIssuesTracker(bucket_minutes=5, width=2048, depth=4, k=64, max_ngram=3)
+    phrases = tracker._phrases
+    replayed = []
+
+    def phrases_and_publish(title, description):
+        if not replayed:
+            # One ticket the scan already read and one it can no longer see
+            replayed.append(True)
+            tracker.on_ticket_created(seen)
+            tracker.on_ticket_created(SimpleNamespace(id=-1, title="Printer jam", description="Jams again"))
+        return phrases(title, description)
+
+    tracker._phrases = phrases_and_publish
+    tracker.rebuild(db)
+    tracker._phrases = phrases
+
+    assert {r["phrase"]: r["count"] for r in tracker.top(db, window="hour")}["printer jam"] == 2
+
+
+def test_periodic_resync_picks_up_tickets_from_other_processes(db, new_ticket):
+    tracker = TopIssuesTracker(bucket_minutes=5, width=2048, depth=4, k=64, max_ngram=3, resync_seconds=0)
+    new_ticket("Printer jam", "Printer on the third floor jams")
+    tracker.rebuild(db)
+    assert tracker.top(db, window="hour") == []  # stale: resync started
+    tracker._resyncer.join(5)
+
+    # Created without an event reaching this tracker, as by another worker
+    new_ticket("Printer jam again", "Printer jams on duplex")
+    tracker.top(db, window="hour")
+    tracker._resyncer.join(5)
+    assert {r["phrase"]: r["count"] for r in tracker.top(db, window="hour")}["printer jam"] == 2
@@ -0,0 +1,64 @@
+from app.database.session import SessionLocal
+from app.models.ticket import TicketStatus
+from app.schemas.ticket import TicketStatusUpdate
+from app.services.ticket_service import TicketService
+from app.services.user_ticket_summary import RECENT_LIMIT, user_ticket_summaries
+
+
+def fresh(db, user_id):
+    user_ticket_summaries.invalidate(user_id)
+    return user_ticket_summaries.get(db, user_id)
+
+
+def test_cached_summary_follows_ticket_events(db, users, new_ticket):
+    employee, agent = users
+    first = new_ticket("VPN keeps disconnecting")
+    assert user_ticket_summaries.get(db, employee.id)["total"] == 1
+
+    tickets = [first] + [new_ticket(f"Laptop issue number {i}") for i in range(RECENT_LIMIT)]
+    TicketService.change_status(db, tickets[1].id, TicketStatusUpdate(status=TicketStatus.WAITING_ON_USER), agent.id)
+    TicketService.change_status(db, tickets[2].id, TicketStatusUpdate(status=TicketStatus.RESOLVED), agent.id)
+
+    summary = user_ticket_summaries.get(db, employee.id)
+    assert (summary["total"], summary["open"], summary["waiting"]) == (6, 5, 1)
+    assert [item["id"] for item in summary["recent"]] == [t.id for t in reversed(tickets)][:RECENT_LIMIT]
+    assert summary == fresh(db, employee.id)
+
+
+def test_replayed_events_are_not_double_counted(db, users, new_ticket):
+    employee, agent = users
+    ticket = new_ticket()
+    user_ticket_summaries.get(db, employee.id)
+
+    user_ticket_summaries.on_ticket_created(ticket)
+    TicketService.change_status(db, ticket.id, TicketStatusUpdate(status=TicketStatus.WAITING_ON_USER), agent.id)
+    user_ticket_summaries.on_ticket_updated(ticket, {"status": (TicketStatus.OPEN, TicketStatus.WAITING_ON_USER)})
+
+    summary = user_ticket_summaries.get(db, employee.id)
+    assert (summary["total"], summary["open"], summary["waiting"]) == (1, 1, 1)
+    assert summary == fresh(db, employee.id)
+
+
+def test_a_ticket_created_during_the_load_is_not_lost(db, users, new_ticket, monkeypatch):
+    employee = users[0]
+    load = user_ticket_summaries._load
+    created = []
+
+    def load_then_create(session, user_id):
+        summary = load(session, user_id)
+        if not created:
+            # Committed (and published) after the snapshot, before it is cached
+            created.append(new_ticket())
+        return summary
+
+    monkeypatch.setattr(user_ticket_summaries, "_load", load_then_create)
+    reader = SessionLocal()
+    try:
+        assert user_ticket_summaries.get(reader, employee.id)["total"] == 1
+    finally:
+        reader.close()
+    monkeypatch.undo()
+
+    assert user_ticket_summaries._cache.get(employee.id) is not None
+    assert user_ticket_summaries.get(db, employee.id)["total"] == 1
+    assert user_ticket_summaries._loading == {} and user_ticket_summaries._generations == {}